@@ -1,12 +1,24 @@
 import openai
+import atexit
 import json
 import os
 import random
+import re
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-from config import ASSISTANT_NAME, CONVERSATION_HISTORY_FILE
+from typing import List, Dict, Iterator, Optional, Tuple
+from config import (
+    ASSISTANT_NAME, CONVERSATION_HISTORY_FILE, CONVERSATION_LOG_FILE, CONVERSATION_SUMMARY_FILE,
+    CONTEXT_TOKEN_BUDGET, SUMMARY_KEEP_MESSAGES, SUMMARY_BATCH_MESSAGES,
+    CONVERSATION_FSYNC_BATCH, CONVERSATION_FSYNC_INTERVAL, CONVERSATION_COMPACT_BYTES
+)
 from audio_utils import HUMAN_TRAITS
+from openai_client import get_client
+from context_builder import ContextBuilder
+from conversation_summary import ConversationSummarizer
+from conversation_store import ConversationStore
+from utils.log_writer import log_writer
 
 class AIResponseError(Exception):
     """Custom exception for AI response errors."""
@@ -121,10 +133,18 @@ def humanize_text(text: str, emotion: str = 'neutral') -> str:
     return text
 
 class ConversationManager:
-    def __init__(self, max_history: int = 20):
-        """Initialize conversation manager with optional history limit."""
+    def __init__(self, max_history: int = 20, store: Optional[ConversationStore] = None,
+                 summary_file: Optional[str] = None):
+        """Initialize conversation manager with optional history limit and persistence."""
         self.max_history = max_history
+        self.store = store
+        self.summary_file = summary_file
+        self.lock = threading.RLock()  # Guards history against the background summarizer
+        self.running_summary = ""
+        self.summarized_until = ""  # Timestamp of the newest message folded into the summary
+        self._load_summary()
         self.conversation_history = self._initialize_conversation()
+        self.evicted_messages: List[Dict] = []  # Trimmed messages not yet summarized
         self.last_interaction_time = datetime.now()
         self.user_name = "User"  # Will be updated from user input
         self.conversation_topics = set()
@@ -149,14 +169,17 @@ class ConversationManager:
             )
         }
         
-        # Load previous conversation if it exists
+        # Load the tail of the previous conversation if it exists
         history = [system_message]
-        if os.path.exists(CONVERSATION_HISTORY_FILE):
+        if self.store:
             try:
-                with open(CONVERSATION_HISTORY_FILE, 'r') as f:
-                    saved_history = json.load(f)
-                    # Keep only the most recent messages to respect max_history
-                    history.extend(saved_history[-(self.max_history*2):])  # *2 for user/assistant pairs
+                # Keep only the most recent messages to respect max_history
+                saved_history = self.store.load_tail(self.max_history*2)  # *2 for user/assistant pairs
+                # Skip messages already folded into the running summary
+                history.extend(
+                    m for m in saved_history
+                    if not self.summarized_until or m.get('timestamp', '') > self.summarized_until
+                )
             except Exception as e:
                 print(f"Warning: Could not load conversation history: {e}")
                 
@@ -197,12 +220,68 @@ class ConversationManager:
             "emotion": emotion or self.conversation_mood
         }
         
-        self.conversation_history.append(message)
-        self._update_conversation_meta(content, role)
-        
-        # Keep conversation history within limits
-        if len(self.conversation_history) > self.max_history * 2 + 1:  # +1 for system message
-            self.conversation_history = [self.conversation_history[0]] + self.conversation_history[-(self.max_history*2):]
+        with self.lock:
+            self.conversation_history.append(message)
+            self._update_conversation_meta(content, role)
+            if self.store:
+                try:
+                    self.store.append(message)
+                except Exception as e:
+                    print(f"Warning: Could not save conversation message: {e}")
+            
+            # Keep conversation history within limits
+            if len(self.conversation_history) > self.max_history * 2 + 1:  # +1 for system message
+                evicted = self.conversation_history[1:-(self.max_history*2)]
+                self.conversation_history = [self.conversation_history[0]] + self.conversation_history[-(self.max_history*2):]
+                # Hold trimmed messages for the summarizer (bounded if it cannot keep up)
+                self.evicted_messages.extend(evicted)
+                del self.evicted_messages[:-(self.max_history*2)]
+    
+    def messages_to_summarize(self, keep_recent: int) -> List[Dict]:
+        """Return evicted messages plus any history older than the last keep_recent messages."""
+        with self.lock:
+            older = self.conversation_history[1:-keep_recent] if keep_recent else self.conversation_history[1:]
+            return self.evicted_messages + older
+    
+    def apply_summary(self, summary: str, folded: List[Dict]) -> None:
+        """Replace folded messages with an updated running summary and persist it."""
+        folded_ids = {id(message) for message in folded}
+        with self.lock:
+            self.running_summary = summary
+            self.summarized_until = max(
+                [self.summarized_until] + [m.get('timestamp', '') for m in folded]
+            )
+            self.evicted_messages = [m for m in self.evicted_messages if id(m) not in folded_ids]
+            self.conversation_history = [self.conversation_history[0]] + [
+                m for m in self.conversation_history[1:] if id(m) not in folded_ids
+            ]
+        self.save_summary()
+    
+    def _load_summary(self) -> None:
+        """Load the running summary saved with the conversation history."""
+        if not self.summary_file or not os.path.exists(self.summary_file):
+            return
+        try:
+            with open(self.summary_file, 'r') as f:
+                saved = json.load(f)
+            self.running_summary = saved.get('summary', '')
+            self.summarized_until = saved.get('summarized_until', '')
+        except Exception as e:
+            print(f"Warning: Could not load conversation summary: {e}")
+    
+    def save_summary(self) -> None:
+        """Save the running summary next to the conversation history."""
+        if not self.summary_file:
+            return
+        try:
+            with open(self.summary_file, 'w') as f:
+                json.dump({
+                    'summary': self.running_summary,
+                    'summarized_until': self.summarized_until,
+                    'updated': datetime.now().isoformat()
+                }, f, indent=2)
+        except Exception as e:
+            print(f"Warning: Could not save conversation summary: {e}")
     
     def get_conversation_summary(self) -> str:
         """Generate a summary of the conversation so far."""
@@ -212,17 +291,37 @@ class ConversationManager:
         ])
     
     def save_conversation(self) -> None:
-        """Save the conversation history to a file."""
+        """Make sure every message is on disk (messages are appended as they are added)."""
+        if not self.store:
+            return
         try:
-            # Don't save the system message in the persistent history
-            conversation_to_save = self.conversation_history[1:]
-            with open(CONVERSATION_HISTORY_FILE, 'w') as f:
-                json.dump(conversation_to_save, f, indent=2)
+            self.store.flush()
         except Exception as e:
             print(f"Warning: Could not save conversation history: {e}")
 
-# Initialize conversation manager
-conversation = ConversationManager(max_history=15)
+# Initialize conversation manager; messages are appended to the store as they are added
+conversation = ConversationManager(
+    max_history=15,
+    store=ConversationStore(
+        CONVERSATION_LOG_FILE,
+        legacy_path=CONVERSATION_HISTORY_FILE,
+        fsync_batch=CONVERSATION_FSYNC_BATCH,
+        fsync_interval=CONVERSATION_FSYNC_INTERVAL,
+        compact_bytes=CONVERSATION_COMPACT_BYTES
+    ),
+    summary_file=CONVERSATION_SUMMARY_FILE
+)
+atexit.register(conversation.store.close)
+
+# Folds older turns into a running summary off the critical path
+summarizer = ConversationSummarizer(
+    conversation,
+    keep_recent=SUMMARY_KEEP_MESSAGES,
+    batch_size=SUMMARY_BATCH_MESSAGES
+)
+
+# Fits each request into the prompt token budget
+context_builder = ContextBuilder(budget=CONTEXT_TOKEN_BUDGET)
 
 def _analyze_sentiment(text: str) -> str:
     """Simple sentiment analysis to determine conversation mood."""
@@ -239,6 +338,121 @@ def _analyze_sentiment(text: str) -> str:
         return 'concerned'
     return 'neutral'
 
+# Completion parameters shared by the blocking and streaming paths
+CHAT_MODEL = "gpt-3.5-turbo"
+CHAT_PARAMS = {
+    "max_tokens": 200,
+    "temperature": 0.8,  # Slightly higher for more varied responses
+    "top_p": 0.95,
+    "frequency_penalty": 0.5,  # Slightly reduce repetition
+    "presence_penalty": 0.6,   # Encourage talking about new topics
+}
+
+# Sentence boundary: terminal punctuation (optionally closed by a quote or
+# parenthesis) followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'[.!?]["\')]*\s+')
+
+def _prepare_turn(user_text: str) -> Tuple[str, List[Dict]]:
+    """Record the user's message and build the messages for the model.
+    
+    Returns:
+        tuple: (sentiment of the user's message, messages to send)
+    """
+    # Update conversation mood based on user input
+    sentiment = _analyze_sentiment(user_text)
+    conversation.conversation_mood = sentiment
+    
+    # Add user message to conversation
+    conversation.add_message("user", user_text)
+    
+    # Add context to the prompt
+    context_prompt = {"role": "system", "content": f"""
+    [CONTEXT]
+    Current time: {datetime.now().strftime('%A, %B %d, %I:%M %p')}
+    User's name: {conversation.user_name}
+    Conversation mood: {conversation.conversation_mood}
+    Previous topics: {', '.join(conversation.conversation_topics)[:100]}
+    
+    [PERSONALITY INSTRUCTIONS]
+    - Speak in a calm, confident, and professional manner
+    - Use simple, clear English with a neutral Ghanaian/African English accent
+    - Be helpful, respectful, and patient
+    - Explain technical concepts step-by-step
+    - If unsure, say you don't know rather than guessing
+    - Keep responses concise but complete
+    - Use examples when helpful
+    - Maintain a friendly but professional tone
+    """}
+    if conversation.running_summary:
+        context_prompt["content"] += f"\n    [CONVERSATION SUMMARY]\n    {conversation.running_summary}\n"
+    
+    # Add as many conversation examples and history messages as the budget allows
+    messages = context_builder.build(context_prompt, CONVERSATION_EXAMPLES, conversation.conversation_history)
+    return sentiment, messages
+
+# Diagnostic logs, written as JSON lines by the background log writer
+THOUGHTS_LOG_FILE = 'ai_thoughts.log'
+ERROR_LOG_FILE = 'error_log.txt'
+
+def _log_thoughts(thoughts: str) -> None:
+    """Log the model's internal thoughts for debugging (never shown to the user)."""
+    if thoughts:
+        log_writer.write(THOUGHTS_LOG_FILE, {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'thoughts': thoughts
+        })
+
+def _commit_response(ai_response: str, sentiment: str) -> None:
+    """Add the final assistant response to the conversation."""
+    # Update conversation topics
+    if len(conversation.conversation_history) > 3:  # Don't add initial messages
+        conversation.conversation_topics.add(ai_response[:30].strip())
+    
+    # Add to conversation with appropriate emotion
+    conversation.add_message("assistant", ai_response, emotion=sentiment)
+
+def _error_response(e: Exception) -> str:
+    """Log an error from a conversational turn and return a spoken fallback."""
+    if isinstance(e, openai.APIError):
+        # Handle API-specific errors
+        error_type = "API Error"
+        error_msg = f"I'm having trouble connecting to the AI service. {get_random_emotion('sad')} Let's try again in a moment."
+        emotion = 'concerned'
+        print(f"{error_type}: {str(e)}")
+    elif isinstance(e, json.JSONDecodeError):
+        # Handle JSON parsing errors
+        error_type = "JSON Decode Error"
+        error_msg = f"I had trouble understanding the response. {get_random_emotion('confused')} Could you rephrase that?"
+        emotion = 'confused'
+        print(f"{error_type}: {str(e)}")
+    elif isinstance(e, ValueError):
+        # Handle invalid input/response format
+        error_type = "Value Error"
+        error_msg = f"I received an unexpected response format. {get_random_emotion('confused')} Let me try that again."
+        emotion = 'confused'
+        print(f"{error_type}: {str(e)}")
+    else:
+        # Handle all other errors
+        error_type = type(e).__name__
+        error_msg = f"Hmm, something unexpected happened ({error_type}). {get_random_emotion('thinking')} Let's try that again."
+        emotion = 'thinking'
+        print(f"Unexpected {error_type}: {str(e)}")
+    
+    # Log the error with context (written in the background)
+    error_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    error_context = {
+        'timestamp': error_timestamp,
+        'error_type': error_type,
+        'error_message': str(e),
+        'last_user_message': conversation.conversation_history[-1]['content'] if conversation.conversation_history else 'No conversation history',
+        'conversation_length': len(conversation.conversation_history)
+    }
+    
+    if not log_writer.write(ERROR_LOG_FILE, error_context):
+        print("Error log queue full; error record dropped")
+    
+    return humanize_text(error_msg, emotion)
+
 def get_response(user_text: str) -> str:
     """
     Get a response from Anglo (Edward Asimeng's personal assistant) based on user input.
@@ -250,45 +464,14 @@ def get_response(user_text: str) -> str:
         str: Anglo's helpful and professional response
     """
     try:
-        # Update conversation mood based on user input
-        sentiment = _analyze_sentiment(user_text)
-        conversation.conversation_mood = sentiment
-        
-        # Add user message to conversation
-        conversation.add_message("user", user_text)
-        
-        # Add context to the prompt
-        context_prompt = {"role": "system", "content": f"""
-        [CONTEXT]
-        Current time: {datetime.now().strftime('%A, %B %d, %I:%M %p')}
-        User's name: {conversation.user_name}
-        Conversation mood: {conversation.conversation_mood}
-        Previous topics: {', '.join(conversation.conversation_topics)[:100]}
-        
-        [PERSONALITY INSTRUCTIONS]
-        - Speak in a calm, confident, and professional manner
-        - Use simple, clear English with a neutral Ghanaian/African English accent
-        - Be helpful, respectful, and patient
-        - Explain technical concepts step-by-step
-        - If unsure, say you don't know rather than guessing
-        - Keep responses concise but complete
-        - Use examples when helpful
-        - Maintain a friendly but professional tone
-        """}
-        
-        # Add conversation examples to the context
-        messages = [context_prompt] + CONVERSATION_EXAMPLES + conversation.conversation_history[-10:]
+        sentiment, messages = _prepare_turn(user_text)
         
         # Get response from OpenAI with more human-like parameters
-        client = openai.OpenAI()
+        client = get_client()
         response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
+            model=CHAT_MODEL,
             messages=messages,
-            max_tokens=200,
-            temperature=0.8,  # Slightly higher for more varied responses
-            top_p=0.95,
-            frequency_penalty=0.5,  # Slightly reduce repetition
-            presence_penalty=0.6,   # Encourage talking about new topics
+            **CHAT_PARAMS
         )
         
         # Extract and process the response
@@ -313,10 +496,7 @@ def get_response(user_text: str) -> str:
                         ai_response = ai_response[:-1].strip()
                 
                 # Log the thoughts for debugging (but don't show to user)
-                if thoughts:
-                    with open('ai_thoughts.log', 'a') as f:
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        f.write(f"[{timestamp}] Thoughts: {thoughts}\n")
+                _log_thoughts(thoughts)
                         
             except IndexError as e:
                 print(f"Warning: Malformed THOUGHTS/RESPONSE format. Error: {str(e)}")
@@ -325,116 +505,182 @@ def get_response(user_text: str) -> str:
                 print(f"Error processing AI response: {str(e)}")
                 # Continue with the original response if any other error occurs
         
-        # Update conversation topics
-        if len(conversation.conversation_history) > 3:  # Don't add initial messages
-            conversation.conversation_topics.add(ai_response[:30].strip())
-        
-        # Add to conversation with appropriate emotion
-        conversation.add_message("assistant", ai_response, emotion=sentiment)
+        _commit_response(ai_response, sentiment)
         
         return ai_response
         
-    except openai.APIError as e:
-        # Handle API-specific errors
-        error_type = "API Error"
-        error_msg = f"I'm having trouble connecting to the AI service. {get_random_emotion('sad')} Let's try again in a moment."
-        print(f"{error_type}: {str(e)}")
-        
-        # Log the error with context
-        error_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        error_context = {
-            'timestamp': error_timestamp,
-            'error_type': error_type,
-            'error_message': str(e),
-            'last_user_message': conversation.conversation_history[-1]['content'] if conversation.conversation_history else 'No conversation history',
-            'conversation_length': len(conversation.conversation_history)
-        }
-        
-        try:
-            with open('error_log.txt', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(error_context, indent=2) + '\n\n')
-        except Exception as log_error:
-            print(f"Failed to write to error log: {str(log_error)}")
-        
-        return humanize_text(error_msg, 'concerned')
-        
-    except json.JSONDecodeError as e:
-        # Handle JSON parsing errors
-        error_type = "JSON Decode Error"
-        error_msg = f"I had trouble understanding the response. {get_random_emotion('confused')} Could you rephrase that?"
-        print(f"{error_type}: {str(e)}")
-        
-        # Log the error with context
-        error_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        error_context = {
-            'timestamp': error_timestamp,
-            'error_type': error_type,
-            'error_message': str(e),
-            'last_user_message': conversation.conversation_history[-1]['content'] if conversation.conversation_history else 'No conversation history',
-            'conversation_length': len(conversation.conversation_history)
-        }
-        
-        try:
-            with open('error_log.txt', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(error_context, indent=2) + '\n\n')
-        except Exception as log_error:
-            print(f"Failed to write to error log: {str(log_error)}")
-        
-        return humanize_text(error_msg, 'confused')
+    except Exception as e:
+        return _error_response(e)
+
+class ResponseStreamParser:
+    """
+    Incrementally strips the [THOUGHTS:]/[RESPONSE:] envelope from streamed
+    model output and splits the spoken part into complete sentences.
+    """
+    
+    THOUGHTS_TAG = '[THOUGHTS:'
+    RESPONSE_TAG = '[RESPONSE:'
+    
+    def __init__(self, min_sentence_chars: int = 12):
+        """
+        Initialize the parser.
+        
+        Args:
+            min_sentence_chars: Sentences shorter than this are merged into the
+                next one so TTS is not fed tiny fragments
+        """
+        self.min_sentence_chars = min_sentence_chars
+        self.raw = ''         # Everything received so far
+        self.thoughts = ''    # Extracted internal monologue
+        self.response = ''    # Spoken text received so far (envelope removed)
+        self._mode = 'detect'  # detect -> thoughts -> response, or plain
+        self._pending = ''    # Spoken text not yet emitted as a sentence
+    
+    def feed(self, delta: str) -> List[str]:
+        """
+        Add a piece of streamed output.
+        
+        Returns:
+            list: Sentences that became complete with this delta
+        """
+        self.raw += delta
+        
+        if self._mode == 'detect':
+            head = self.raw.lstrip()
+            if head.startswith(self.THOUGHTS_TAG):
+                self._mode = 'thoughts'
+            elif head.startswith(self.RESPONSE_TAG):
+                self._mode = 'thoughts'  # Envelope without thoughts
+            elif self.THOUGHTS_TAG.startswith(head) or self.RESPONSE_TAG.startswith(head):
+                return []  # Could still be the start of a tag
+            else:
+                self._mode = 'plain'
+                return self._add_text(self.raw)
+        
+        if self._mode == 'thoughts':
+            if self.RESPONSE_TAG not in self.raw:
+                return []
+            head, text = self.raw.split(self.RESPONSE_TAG, 1)
+            if self.THOUGHTS_TAG in head:
+                self.thoughts = head.split(self.THOUGHTS_TAG, 1)[1].split(']', 1)[0].strip()
+            self._mode = 'response'
+            return self._add_text(text.lstrip())
+        
+        return self._add_text(delta)
+    
+    def finish(self) -> List[str]:
+        """
+        Flush whatever is left once the stream has ended.
+        
+        Returns:
+            list: The remaining sentences (at most one)
+        """
+        if self._mode in ('detect', 'thoughts'):
+            # No usable envelope: speak the raw output, as get_response does
+            self._mode = 'plain'
+            self.response = self._pending = self.raw
+        
+        if self._mode == 'response':
+            # Remove the closing bracket of the [RESPONSE: ...] block
+            self.response = self.response.rstrip()
+            if self.response.endswith(']'):
+                self.response = self.response[:-1]
+            self._pending = self._pending.rstrip()
+            if self._pending.endswith(']'):
+                self._pending = self._pending[:-1]
+        
+        self.response = self.response.strip()
+        tail = self._pending.strip()
+        self._pending = ''
+        return [tail] if tail else []
+    
+    def _add_text(self, text: str) -> List[str]:
+        """Append spoken text and return the sentences it completes."""
+        self.response += text
+        self._pending += text
+        
+        sentences = []
+        start = 0
+        for match in SENTENCE_BOUNDARY.finditer(self._pending):
+            sentence = self._pending[start:match.end()].strip()
+            if len(sentence) >= self.min_sentence_chars:
+                sentences.append(sentence)
+                start = match.end()
+        self._pending = self._pending[start:]
+        return sentences
+
+def stream_response(user_text: str) -> Iterator[str]:
+    """
+    Stream Anglo's response sentence by sentence while the model is still generating.
+    
+    Sentences are yielded as soon as they are complete so speech synthesis can
+    start before the full completion arrives. Once the stream ends the full
+    response is committed to the conversation, exactly as get_response does.
+    
+    Args:
+        user_text: The user's input text
         
-    except ValueError as e:
-        # Handle invalid input/response format
-        error_type = "Value Error"
-        error_msg = f"I received an unexpected response format. {get_random_emotion('confused')} Let me try that again."
-        print(f"{error_type}: {str(e)}")
+    Yields:
+        str: Complete sentences of the response (or a single fallback message on error)
+    """
+    parser = ResponseStreamParser()
+    yielded = False
+    try:
+        sentiment, messages = _prepare_turn(user_text)
         
-        # Log the error with context
-        error_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        error_context = {
-            'timestamp': error_timestamp,
-            'error_type': error_type,
-            'error_message': str(e),
-            'last_user_message': conversation.conversation_history[-1]['content'] if conversation.conversation_history else 'No conversation history',
-            'conversation_length': len(conversation.conversation_history)
-        }
+        client = get_client()
+        stream = client.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=messages,
+            stream=True,
+            **CHAT_PARAMS
+        )
         
-        try:
-            with open('error_log.txt', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(error_context, indent=2) + '\n\n')
-        except Exception as log_error:
-            print(f"Failed to write to error log: {str(log_error)}")
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            for sentence in parser.feed(delta):
+                yielded = True
+                yield sentence
+        
+        for sentence in parser.finish():
+            yielded = True
+            yield sentence
+        
+        if not parser.response:
+            raise ValueError("Empty or invalid AI response received")
         
-        return humanize_text(error_msg, 'confused')
+        _log_thoughts(parser.thoughts)
+        _commit_response(parser.response, sentiment)
         
     except Exception as e:
-        # Handle all other errors
-        error_type = type(e).__name__
-        error_msg = f"Hmm, something unexpected happened ({error_type}). {get_random_emotion('thinking')} Let's try that again."
-        print(f"Unexpected {error_type}: {str(e)}")
-        
-        # Log the error with context
-        error_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        error_context = {
-            'timestamp': error_timestamp,
-            'error_type': error_type,
-            'error_message': str(e),
-            'last_user_message': conversation.conversation_history[-1]['content'] if conversation.conversation_history else 'No conversation history',
-            'conversation_length': len(conversation.conversation_history)
-        }
-        
-        try:
-            with open('error_log.txt', 'a', encoding='utf-8') as f:
-                f.write(json.dumps(error_context, indent=2) + '\n\n')
-        except Exception as log_error:
-            print(f"Failed to write to error log: {str(log_error)}")
-        
-        return humanize_text(error_msg, 'thinking')
+        if not yielded:
+            yield _error_response(e)
+            return
+        # Part of the answer was already spoken: keep it in the history
+        print(f"Response stream interrupted: {str(e)}")
+        parser.finish()
+        if parser.response:
+            _commit_response(parser.response, conversation.conversation_mood)
+
+def schedule_summary() -> None:
+    """Summarize older turns in the background; call once the response has been spoken."""
+    summarizer.schedule()
 
 def clear_conversation() -> None:
     """Reset the conversation to just the system message."""
-    conversation.conversation_history = conversation.conversation_history[:1]  # Keep only system message
-    if os.path.exists(CONVERSATION_HISTORY_FILE):
-        try:
-            os.remove(CONVERSATION_HISTORY_FILE)
-        except Exception as e:
-            print(f"Warning: Could not delete conversation file: {e}")
+    with conversation.lock:
+        conversation.conversation_history = conversation.conversation_history[:1]  # Keep only system message
+        conversation.evicted_messages = []
+        conversation.running_summary = ""
+        conversation.summarized_until = ""
+        conversation.store.clear()
+    for path in (CONVERSATION_HISTORY_FILE, CONVERSATION_SUMMARY_FILE):
+        if os.path.exists(path):
+            try:
+                os.remove(path)
+            except Exception as e:
+                print(f"Warning: Could not delete conversation file: {e}")
@@ -0,0 +1,197 @@
+"""
+Persistent audio output for Edward Voice AI.
+One output stream stays open for the life of the application; clips are
+queued as PCM buffers and written back to back by a worker thread, so there
+is no device open/close per utterance and no gap between consecutive clips.
+"""
+import logging
+import queue
+import threading
+from typing import Callable, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tells the worker to close the stream and exit
+_STOP = object()
+
+class Playback(threading.Event):
+    """
+    Outcome of a submitted clip: set once the clip has been written to the
+    device, dropped by stop(), or failed. After wait(), `error` holds the
+    device error if writing failed and `dropped` tells whether stop() cut
+    the clip short.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.error: Optional[Exception] = None
+        self.dropped = False
+
+    @property
+    def failed(self) -> bool:
+        """True if the device raised while the clip was written."""
+        return self.error is not None
+
+class AudioOutputEngine:
+    """
+    Long-lived output stream fed through a queue.
+
+    submit() returns a Playback event that is set once the clip has been
+    written to the device (or dropped by stop(), or failed), so callers wait
+    on it instead of polling the stream. Clips with the same format share one open stream;
+    a clip in a different format reopens it.
+    """
+
+    def __init__(self, get_pyaudio: Callable[[], object], block_frames: int = 1024):
+        """
+        Initialize the engine. The worker thread and stream start on first use.
+
+        Args:
+            get_pyaudio: Returns the PyAudio instance to open the stream on
+                (the engine does not terminate it)
+            block_frames: Frames written to the device per call; also how
+                quickly stop() takes effect
+        """
+        self.get_pyaudio = get_pyaudio
+        self.block_frames = block_frames
+        self.stream = None
+        self.clips_played = 0
+        self.streams_opened = 0
+
+        self._format: Optional[Tuple[int, int, int]] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._generation = 0
+        self._busy = False
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a clip is being written or waiting in the queue."""
+        return self._busy or not self._queue.empty()
+
+    def submit(self, frames: bytes, sample_width: int, channels: int, rate: int) -> Playback:
+        """
+        Queue PCM frames for playback right after the clips already queued.
+
+        Args:
+            frames: Interleaved PCM frames
+            sample_width: Bytes per sample
+            channels: Number of channels
+            rate: Sample rate in Hz
+
+        Returns:
+            Playback: Set when the clip has been played, dropped or has failed
+        """
+        done = Playback()
+        self._ensure_started()
+        with self._lock:
+            self._queue.put((self._generation, frames, (sample_width, channels, rate), done))
+        return done
+
+    def play(self, frames: bytes, sample_width: int, channels: int, rate: int,
+             timeout: Optional[float] = None) -> bool:
+        """
+        Play PCM frames and wait until they have been written.
+
+        Returns:
+            bool: False if the wait timed out or the device failed
+        """
+        done = self.submit(frames, sample_width, channels, rate)
+        return done.wait(timeout) and not done.failed
+
+    def stop(self) -> None:
+        """Drop the clip being played and everything queued after it."""
+        with self._lock:
+            self._generation += 1
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.put(_STOP)
+                    break
+                item[3].dropped = True
+                item[3].set()
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop playback, close the stream and stop the worker."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self.stop()
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="audio-output", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    return
+                generation, frames, fmt, done = item
+                self._busy = True
+                try:
+                    done.dropped = not self._write_clip(generation, frames, fmt)
+                except Exception as e:
+                    logger.error("Audio output failed: %s", e)
+                    done.error = e
+                    self._close_stream()
+                finally:
+                    self._busy = False
+                    done.set()
+        finally:
+            self._close_stream()
+
+    def _write_clip(self, generation: int, frames: bytes, fmt: Tuple[int, int, int]) -> bool:
+        """Write a clip to the device; False if stop() dropped it first."""
+        if generation != self._generation:
+            return False
+        stream = self._stream_for(fmt)
+        sample_width, channels, _ = fmt
+        view = memoryview(frames)
+        step = self.block_frames * sample_width * channels
+        for offset in range(0, len(view), step):
+            if generation != self._generation:
+                return False
+            stream.write(view[offset:offset + step].tobytes())
+        self.clips_played += 1
+        return True
+
+    def _stream_for(self, fmt: Tuple[int, int, int]):
+        if self.stream is not None and fmt == self._format:
+            return self.stream
+        self._close_stream()
+        sample_width, channels, rate = fmt
+        pa = self.get_pyaudio()
+        self.stream = pa.open(
+            format=pa.get_format_from_width(sample_width),
+            channels=channels,
+            rate=rate,
+            output=True,
+            frames_per_buffer=self.block_frames
+        )
+        self._format = fmt
+        self.streams_opened += 1
+        return self.stream
+
+    def _close_stream(self) -> None:
+        stream, self.stream, self._format = self.stream, None, None
+        if stream is None:
+            return
+        try:
+            stream.stop_stream()
+            stream.close()
+        except Exception as e:
+            logger.warning("Error closing audio stream: %s", e)
@@ -2,21 +2,66 @@
 Audio utilities for Edward Voice AI.
 Handles audio playback and related functionality.
 """
+import io
 import os
 import wave
 import pyaudio
-import time
-from typing import Optional
+from typing import Optional, Tuple
 from pathlib import Path
 
+from audio_output import AudioOutputEngine, Playback
+from clip_bank import Clip, ClipBank
+from config import CLIP_DIR, CLIP_BANK_MAX_MB, CLIP_BANK_LAZY_CATEGORIES
+
+def decode_wav(audio_data: bytes) -> Tuple[int, int, int, memoryview]:
+    """
+    Decode WAV bytes in memory.
+    
+    Args:
+        audio_data: Complete WAV file contents
+        
+    Returns:
+        tuple: (sample_width, channels, sample_rate, frames)
+    """
+    with wave.open(io.BytesIO(audio_data), 'rb') as wf:
+        frames = wf.readframes(wf.getnframes())
+        return wf.getsampwidth(), wf.getnchannels(), wf.getframerate(), memoryview(frames)
+
+def is_wav(audio_data: bytes) -> bool:
+    """Return True if audio_data looks like a WAV file."""
+    return audio_data[:4] == b'RIFF' and audio_data[8:12] == b'WAVE'
+
 class AudioPlayer:
     """Handles audio playback functionality."""
     
     def __init__(self):
         """Initialize the audio player."""
-        self.pyaudio = pyaudio.PyAudio()
-        self.stream = None
-        self.is_playing = False
+        self._pyaudio = None  # Opened on first playback; device enumeration is slow
+        self._engine = None
+    
+    @property
+    def pyaudio(self) -> pyaudio.PyAudio:
+        """The PyAudio instance, created on first use."""
+        if self._pyaudio is None:
+            self._pyaudio = pyaudio.PyAudio()
+        return self._pyaudio
+    
+    @property
+    def engine(self) -> AudioOutputEngine:
+        """The persistent output engine all playback goes through."""
+        if self._engine is None:
+            self._engine = AudioOutputEngine(lambda: self.pyaudio)
+        return self._engine
+    
+    @property
+    def stream(self):
+        """The currently open output stream, if any."""
+        return self._engine.stream if self._engine is not None else None
+    
+    @property
+    def is_playing(self) -> bool:
+        """True while audio is playing or queued."""
+        return self._engine is not None and self._engine.busy
         
     def play_audio_file(self, file_path: str, block: bool = True) -> bool:
         """
@@ -27,7 +72,8 @@ class AudioPlayer:
             block: If True, blocks until playback is complete
             
         Returns:
-            bool: True if playback was successful, False otherwise
+            bool: True if playback was successful (or, without block, queued),
+                False otherwise
         """
         if not os.path.exists(file_path):
             print(f"Audio file not found: {file_path}")
@@ -35,47 +81,85 @@ class AudioPlayer:
             
         try:
             with wave.open(file_path, 'rb') as wf:
-                def callback(in_data, frame_count, time_info, status):
-                    data = wf.readframes(frame_count)
-                    return (data, pyaudio.paContinue)
-                
-                self.stream = self.pyaudio.open(
-                    format=self.pyaudio.get_format_from_width(wf.getsampwidth()),
-                    channels=wf.getnchannels(),
-                    rate=wf.getframerate(),
-                    output=True,
-                    stream_callback=callback
-                )
-                
-                self.is_playing = True
-                
-                if block:
-                    while self.stream.is_active():
-                        time.sleep(0.1)
-                    self.stop()
-                    
-                return True
+                frames = wf.readframes(wf.getnframes())
+                done = self.engine.submit(frames, wf.getsampwidth(), wf.getnchannels(), wf.getframerate())
+            return self._finish(done, block)
                 
         except Exception as e:
             print(f"Error playing audio: {e}")
             return False
     
+    def play_wav_bytes(self, audio_data: bytes, block: bool = True) -> bool:
+        """
+        Play WAV audio straight from memory.
+        
+        Args:
+            audio_data: Complete WAV file contents
+            block: If True, blocks until playback is complete
+            
+        Returns:
+            bool: True if playback was successful (or, without block, queued),
+                False otherwise
+        """
+        try:
+            sample_width, channels, rate, frames = decode_wav(audio_data)
+            done = self.engine.submit(frames, sample_width, channels, rate)
+            return self._finish(done, block)
+            
+        except Exception as e:
+            print(f"Error playing audio: {e}")
+            return False
+    
+    def play_clip(self, clip: Clip, block: bool = True) -> bool:
+        """
+        Play a decoded clip from the clip bank.
+        
+        Args:
+            clip: The clip to play
+            block: If True, blocks until playback is complete
+            
+        Returns:
+            bool: True if playback was successful (or, without block, queued),
+                False otherwise
+        """
+        done = self.engine.submit(clip.frames, clip.sample_width, clip.channels, clip.rate)
+        return self._finish(done, block)
+    
+    @staticmethod
+    def _finish(done: Playback, block: bool) -> bool:
+        """Wait for a submitted clip if blocking; False if the device failed to play it."""
+        if not block:
+            return True
+        done.wait()
+        if done.failed:
+            print(f"Error playing audio: {done.error}")
+            return False
+        return True
+    
     def stop(self):
         """Stop any currently playing audio."""
-        if self.stream and self.stream.is_active():
-            self.stream.stop_stream()
-            self.stream.close()
-            self.is_playing = False
+        if self._engine is not None:
+            self._engine.stop()
     
     def __del__(self):
         """Clean up resources."""
-        self.stop()
-        if hasattr(self, 'pyaudio'):
-            self.pyaudio.terminate()
+        if getattr(self, '_engine', None) is not None:
+            self._engine.close()
+        if getattr(self, '_pyaudio', None) is not None:
+            self._pyaudio.terminate()
 
 # Global instance for easy importing
 audio_player = AudioPlayer()
 
+# Pre-recorded clips; the app starts decoding them in the background at
+# start-up (clip_bank.start_preload()), anything else loads them on first use
+clip_bank = ClipBank(
+    CLIP_DIR,
+    max_bytes=CLIP_BANK_MAX_MB * 1024 * 1024,
+    lazy_categories=CLIP_BANK_LAZY_CATEGORIES,
+    preload=False
+)
+
 HUMAN_TRAITS = {"EMOTIONS":["angry","disust","fear","joy","sadness","surprise","neutral"]        
     }
 def play_response(response: dict) -> bool:
@@ -92,6 +176,9 @@ def play_response(response: dict) -> bool:
         return False
     
     print(f"Playing: {response.get('text', '')}")
+    clip = clip_bank.get(response['file'])
+    if clip is not None:
+        return audio_player.play_clip(clip)
     return audio_player.play_audio_file(response['file'])
 
 def speak_text(text: str, emotion: str = 'neutral') -> bool:
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-turn overhead of a fresh OpenAI client vs the shared client.
+
+Runs a local stand-in for the chat completions endpoint and times a series
+of turns. New TCP connections are counted by the server; an optional delay
+on every new connection stands in for the TLS handshake of the real API.
+
+Usage:
+    python bench_openai_client.py [turns] [handshake_ms]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import openai
+
+from openai_client import create_client
+
+COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-3.5-turbo",
+    "choices": [{
+        "index": 0,
+        "message": {"role": "assistant", "content": "[THOUGHTS: none]\n[RESPONSE: Hello.]"},
+        "finish_reason": "stop"
+    }],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+}
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a canned chat completion over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+    handshake_s = 0.0
+
+    def setup(self):
+        super().setup()
+        StandInHandler.connections += 1
+        time.sleep(StandInHandler.handshake_s)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_turns(turns: int, make_client, shared: bool) -> float:
+    """Run chat turns and return the mean seconds per turn."""
+    client = make_client() if shared else None
+    start = time.perf_counter()
+    for _ in range(turns):
+        turn_client = client or make_client()
+        turn_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[{"role": "user", "content": "Hello"}],
+            max_tokens=5
+        )
+        if not shared:
+            turn_client.close()
+    return (time.perf_counter() - start) / turns
+
+def main() -> int:
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    StandInHandler.handshake_s = (float(sys.argv[2]) if len(sys.argv) > 2 else 30.0) / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    print(f"OpenAI client benchmark ({turns} turns, "
+          f"{StandInHandler.handshake_s * 1000:.0f}ms simulated handshake)")
+    print("=" * 60)
+    print(f"{'client':<28} {'per turn':>10} {'connections':>12}")
+
+    cases = [
+        ("openai.OpenAI() per turn", lambda: openai.OpenAI(api_key="bench", base_url=base_url), False),
+        ("shared pooled client", lambda: create_client(api_key="bench", base_url=base_url), True),
+    ]
+    results = {}
+    for name, make_client, shared in cases:
+        StandInHandler.connections = 0
+        results[name] = run_turns(turns, make_client, shared)
+        print(f"{name:<28} {results[name] * 1000:>8.1f}ms {StandInHandler.connections:>12}")
+
+    before, after = (results[name] for name, _, _ in cases)
+    print(f"\nShared client saves {(before - after) * 1000:.1f}ms per turn")
+
+    server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
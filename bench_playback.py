@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-utterance overhead of the playback and system TTS paths.
+
+Compares the previous temp-file round trips with the in-memory versions:
+  playback   -- temp file + wave.open(path) vs decoding the WAV bytes in memory
+  system TTS -- reading pyttsx3's output back from the default temp directory
+                vs a RAM-backed one (/dev/shm)
+
+Audio goes to a null output device, so only the overhead around the sound
+card is measured. Pass a directory on the slow disk to see its effect.
+
+Usage:
+    python bench_playback.py [utterances] [temp_dir]
+"""
+import io
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+from audio_utils import AudioPlayer
+
+RATE = 22050
+SECONDS = 3.0
+
+class NullStream:
+    def write(self, data):
+        pass
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+class NullPyAudio:
+    def open(self, **kwargs):
+        return NullStream()
+
+    def get_format_from_width(self, width):
+        return width
+
+    def terminate(self):
+        pass
+
+def make_wav() -> bytes:
+    """A few seconds of 16-bit mono tone, like one spoken sentence."""
+    samples = (int(8000 * math.sin(2 * math.pi * 220 * i / RATE)) for i in range(int(RATE * SECONDS)))
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes(struct.pack(f"<{int(RATE * SECONDS)}h", *samples))
+    return buffer.getvalue()
+
+def play_via_temp_file(audio_data: bytes, temp_dir) -> None:
+    """The previous VoiceManager.play_audio fallback path."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False, dir=temp_dir) as tmp_file:
+        tmp_file.write(audio_data)
+        temp_path = tmp_file.name
+    try:
+        with wave.open(temp_path, 'rb') as wf:
+            stream = NullStream()
+            data = wf.readframes(1024)
+            while data:
+                stream.write(data)
+                data = wf.readframes(1024)
+            stream.close()
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+def render_round_trip(audio_data: bytes, temp_dir) -> bytes:
+    """What fallback_tts does around pyttsx3: render to a file and read it back."""
+    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False, dir=temp_dir) as tmp_file:
+        temp_path = tmp_file.name
+    try:
+        with open(temp_path, 'wb') as f:  # pyttsx3's save_to_file
+            f.write(audio_data)
+        with open(temp_path, 'rb') as f:
+            return f.read()
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+def measure(label: str, fn, runs: int) -> float:
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn()
+    per_call = (time.perf_counter() - start) / runs * 1000
+    print(f"  {label:<34} {per_call:>8.3f}ms")
+    return per_call
+
+def main() -> int:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    temp_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    audio = make_wav()
+    player = AudioPlayer()
+    player._pyaudio = NullPyAudio()
+
+    print(f"Per-utterance overhead ({runs} runs, {len(audio) / 1024:.0f} KB WAV, "
+          f"temp dir: {temp_dir or tempfile.gettempdir()})")
+    print("=" * 50)
+    print("Playback:")
+    before = measure("temp file + wave.open(path)", lambda: play_via_temp_file(audio, temp_dir), runs)
+    after = measure("in memory (play_wav_bytes)", lambda: player.play_wav_bytes(audio), runs)
+    print(f"  speed-up {before / after:.1f}x")
+
+    print("System TTS read-back:")
+    before = measure("temp dir", lambda: render_round_trip(audio, temp_dir), runs)
+    if os.path.isdir('/dev/shm'):
+        after = measure("/dev/shm", lambda: render_round_trip(audio, '/dev/shm'), runs)
+        print(f"  speed-up {before / after:.1f}x")
+    else:
+        print("  /dev/shm not available on this system")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: looking up pre-recorded responses in large clip libraries.
+
+Builds synthetic libraries of short spoken phrases and compares the previous
+linear substring scan with the indexed matcher for typical queries: exact
+transcripts, slightly different phrasing, a full LLM answer and a miss.
+Also reports the cost of a catalog reload that changes 1% of the clips,
+done incrementally versus rebuilding the whole index.
+
+Usage:
+    python bench_response_match.py [clips ...]
+"""
+import random
+import sys
+import time
+
+from response_index import ResponseIndex
+
+WORDS = (
+    "i you we it that this can will help plan task day time good great okay sure "
+    "let me know what need would like to do start with your most important take "
+    "short break continue later keep going making progress every small effort "
+    "matters stay consistent focused please careful question happy here assist "
+    "again explain understand information simpler way morning afternoon evening"
+).split()
+
+def make_library(size: int, rng: random.Random):
+    """Distinct phrases of 2-10 words, like clip transcripts."""
+    seen, library = set(), []
+    while len(library) < size:
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 10))).capitalize() + "."
+        if text not in seen:
+            seen.add(text)
+            library.append({'file': f"wav/anglo_bench_{len(library):05d}.wav", 'text': text})
+    return library
+
+def linear_scan(library, text):
+    """The previous find_matching_response."""
+    text = text.lower()
+    for response in library:
+        if text in response['text'].lower():
+            return response
+    return None
+
+def make_queries(library, rng: random.Random):
+    exact = [rng.choice(library)['text'] for _ in range(50)]
+    fuzzy = [rng.choice(library)['text'].rstrip('.') + " please" for _ in range(50)]
+    long_answers = [" ".join(rng.choice(WORDS) for _ in range(60)) for _ in range(50)]
+    misses = [" ".join(rng.choice(["zebra", "quantum", "violin", "harbor"]) for _ in range(4)) for _ in range(50)]
+    return {'exact': exact, 'fuzzy': fuzzy, 'long answer': long_answers, 'miss': misses}
+
+def per_lookup_us(fn, queries, repeat=5) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+def main() -> int:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 5000]
+    rng = random.Random(7)
+    print("Pre-recorded response lookup (microseconds per lookup)")
+    print("=" * 64)
+    print(f"{'clips':>6}  {'query':<12} {'linear scan':>12} {'index':>10} {'hit rate':>9}")
+    for size in sizes:
+        library = make_library(size, rng)
+        start = time.perf_counter()
+        index = ResponseIndex()
+        for response in library:
+            index.add(response)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        for kind, queries in make_queries(library, rng).items():
+            scan = per_lookup_us(lambda q: linear_scan(library, q), queries)
+            indexed = per_lookup_us(lambda q: index.match(q, 0.8), queries)
+            hits = sum(index.match(q, 0.8) is not None for q in queries) / len(queries)
+            print(f"{size:>6}  {kind:<12} {scan:>12.1f} {indexed:>10.1f} {hits:>8.0%}")
+        print(f"{'':>6}  index built in {build_ms:.1f}ms")
+
+        changed = max(1, size // 100)
+        start = time.perf_counter()
+        for position in range(changed):
+            index.remove(position)
+            index.add(dict(library[position], text=library[position]['text'] + " now"))
+        reload_ms = (time.perf_counter() - start) * 1000
+        print(f"{'':>6}  reload changing {changed} clips: {reload_ms:.2f}ms incremental, "
+              f"{build_ms:.1f}ms full rebuild")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: application start-up time.
+
+Reports the slowest imports of the GUI (python -X importtime) and the
+wall-clock time from process start until the first window has been drawn.
+Run it before and after changes to catch start-up regressions.
+
+Usage:
+    python bench_startup.py [runs]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+FIRST_WINDOW = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+import gui
+imported = time.perf_counter()
+root = tk.Tk()
+root.withdraw()
+app = gui.EdwardGUI(root)
+root.update()
+print(f"{imported - start:.4f} {time.perf_counter() - start:.4f}")
+root.destroy()
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def import_profile(top: int = 10) -> None:
+    """Print the total import time of the GUI and its slowest top-level imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import gui"],
+        cwd=ROOT, capture_output=True, text=True, timeout=300
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+            entries.append((cumulative, indent, module))
+
+    if not entries:
+        print("Could not profile imports:")
+        print(result.stderr[-2000:])
+        return
+
+    total = max(cumulative for cumulative, _, _ in entries)
+    print(f"Import gui: {total / 1000:.0f}ms")
+    print("Slowest imports (cumulative):")
+    first_level = min(indent for _, indent, _ in entries)
+    for cumulative, _, module in sorted(
+        (e for e in entries if e[1] <= first_level + 2), reverse=True
+    )[:top]:
+        print(f"  {cumulative / 1000:>8.0f}ms  {module}")
+
+def first_window(runs: int) -> None:
+    """Print the median time from process start to the first drawn window."""
+    imports, windows, processes = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-c", FIRST_WINDOW],
+            cwd=ROOT, capture_output=True, text=True, timeout=300
+        )
+        elapsed = time.perf_counter() - start
+        try:
+            imported, window = map(float, result.stdout.split()[-2:])
+        except ValueError:
+            print("Could not open a window (is a display available?):")
+            print(result.stderr[-2000:])
+            return
+        imports.append(imported)
+        windows.append(window)
+        processes.append(elapsed)
+
+    print(f"\nFirst window (median of {runs} runs):")
+    print(f"  imports done      {statistics.median(imports) * 1000:>8.0f}ms")
+    print(f"  window drawn      {statistics.median(windows) * 1000:>8.0f}ms")
+    print(f"  process wall time {statistics.median(processes) * 1000:>8.0f}ms")
+
+def main() -> int:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print("Edward Voice AI start-up benchmark")
+    print("=" * 50)
+    import_profile()
+    first_window(runs)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
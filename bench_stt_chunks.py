@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: transcription time of a whole recording, single request vs chunked.
+
+Recordings of several lengths (tone-coded phrases with short pauses, up to
+record_until_silence's 30 s limit) are transcribed by the local stand-in
+server, whose delay per request models upload plus inference:
+  single   -- the recording as one request
+  chunked  -- split at pauses into (at most) one chunk per worker, sent
+              concurrently
+
+--speed runs the server's delay faster than real time; reported times are
+scaled back to real seconds.
+
+Usage:
+    python bench_stt_chunks.py [--base SECONDS] [--per-second SECONDS] [--chunk SECONDS]
+                               [--workers N ...] [--speed N]
+"""
+import argparse
+import sys
+import time
+
+from openai_client import create_client
+from speech_to_text import encode_audio, transcribe_bytes, transcribe_chunked
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_phrases
+
+RATE = 16000
+LENGTHS = (5, 10, 20, 30)
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Chunked transcription latency")
+    parser.add_argument('--base', type=float, default=0.4, help="server delay per request (s)")
+    parser.add_argument('--per-second', type=float, default=0.08, help="server delay per second of audio (s)")
+    parser.add_argument('--chunk', type=float, default=6.0, help="shortest target chunk length (s)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4], help="worker pool sizes to compare")
+    parser.add_argument('--speed', type=float, default=4.0, help="run the server this many times faster")
+    args = parser.parse_args()
+
+    print(f"Recording to transcript (server: {args.base:.2f}s + {args.per_second:.2f}s per audio second, "
+          f"{args.chunk:g}s chunks; {args.speed:g}x time scale)")
+    print("=" * 72)
+    header = f"{'audio':>6} {'single':>8}" + "".join(f" {f'{n} workers':>16}" for n in args.workers)
+    print(header + f" {'correct':>8}")
+
+    with StandInTranscriptionServer(args.base, args.per_second, time_scale=1 / args.speed) as server:
+        client = create_client(api_key="bench", base_url=server.url)
+        send = lambda chunk: transcribe_bytes(encode_audio(chunk, RATE), client=client)
+        # Open as many connections as the largest pool will use
+        transcribe_chunked(synthesize_phrases(sentence(60), RATE), RATE, send,
+                           workers=max(args.workers), chunk_seconds=2.0)
+
+        for seconds in LENGTHS:
+            words = sentence(int(seconds / 0.4))
+            audio = synthesize_phrases(words, RATE)
+            expected = " ".join(words)
+
+            start = time.perf_counter()
+            correct = send(audio) == expected
+            cells = [f"{(time.perf_counter() - start) * args.speed:>7.2f}s"]
+            for workers in args.workers:
+                server.max_active = 0
+                requests = server.requests
+                start = time.perf_counter()
+                text = transcribe_chunked(audio, RATE, send, workers=workers, chunk_seconds=args.chunk)
+                elapsed = (time.perf_counter() - start) * args.speed
+                correct &= text == expected
+                cells.append(f"{elapsed:>6.2f}s ({server.requests - requests}/{server.max_active})")
+            print(f"{len(audio) / RATE:>5.1f}s " + " ".join(f"{cell:>8}" if i == 0 else f"{cell:>16}"
+                                                        for i, cell in enumerate(cells))
+                  + f" {'yes' if correct else 'NO':>8}")
+        client.close()
+    print("(requests sent / most at once)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
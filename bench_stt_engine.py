@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: speech recognition throughput as real-time factor (RTF).
+
+RTF is processing time divided by audio duration; below 1 the engine keeps
+up with speech. For the local engine the model load, the warm-up request and
+the first request after warm-up are timed separately from the steady state.
+Clips are the repo's recordings (test_recording.wav, *.m4a.mp4) unless
+files are given; compressed clips need faster-whisper (PyAV) to decode.
+
+Usage:
+    python bench_stt_engine.py [--engine local|openai] [--model NAME_OR_DIR]
+                               [--compute-type int8] [--threads N] [--beam-size N]
+                               [--runs N] [files ...]
+"""
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+import wave
+
+import numpy as np
+
+from config import ConfigError
+from speech_to_text import SpeechRecognitionError
+from stt_engines import LOCAL_ENGINE_AVAILABLE, WHISPER_SAMPLE_RATE, LocalWhisperEngine, OpenAIEngine, resample
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def load_clip(path: str):
+    """Decode a clip to 16 kHz mono float32, or None if it cannot be decoded here."""
+    if path.endswith(".wav"):
+        with wave.open(path, 'rb') as wf:
+            rate, channels = wf.getframerate(), wf.getnchannels()
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        audio = pcm.reshape(-1, channels).mean(axis=1).astype(np.float32) / 32768.0
+        return resample(audio, rate)
+    if not LOCAL_ENGINE_AVAILABLE:
+        return None
+    from faster_whisper import decode_audio
+    return decode_audio(path, sampling_rate=WHISPER_SAMPLE_RATE)
+
+def default_clips():
+    return [os.path.join(ROOT, "test_recording.wav")] + sorted(glob.glob(os.path.join(ROOT, "*.m4a.mp4")))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Speech recognition real-time factor")
+    parser.add_argument('--engine', choices=("local", "openai"), default="local")
+    parser.add_argument('--model', help="local model name or directory (default: as configured)")
+    parser.add_argument('--compute-type', default=None, help="local weight quantization, e.g. int8, float32")
+    parser.add_argument('--threads', type=int, default=None, help="local CPU threads")
+    parser.add_argument('--beam-size', type=int, default=None, help="local decoding beam size")
+    parser.add_argument('--runs', type=int, default=3, help="timed runs per clip")
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args()
+
+    clips = []
+    for path in args.files or default_clips():
+        audio = load_clip(path)
+        if audio is None or len(audio) == 0:
+            print(f"Skipping {os.path.basename(path)} (cannot decode)")
+            continue
+        clips.append((os.path.basename(path), audio))
+    if not clips:
+        print("No clips to transcribe")
+        return 1
+
+    if args.engine == "local":
+        if not LOCAL_ENGINE_AVAILABLE:
+            print("faster-whisper is not installed: pip install .[offline]")
+            return 1
+        options = {key: value for key, value in (
+            ('model', args.model), ('compute_type', args.compute_type),
+            ('cpu_threads', args.threads), ('beam_size', args.beam_size)
+        ) if value is not None}
+        engine = LocalWhisperEngine(**options)
+        label = f"local {engine.model_name} ({engine.compute_type}, {engine.cpu_threads or 'default'} threads, " \
+                f"beam {engine.beam_size})"
+    else:
+        engine = OpenAIEngine()
+        label = "openai whisper-1"
+
+    print(f"Real-time factor: {label}, {os.cpu_count()} CPUs")
+    print("=" * 72)
+    start = time.perf_counter()
+    try:
+        engine.warm_up()
+    except (SpeechRecognitionError, ConfigError) as e:
+        print(f"Warm-up failed: {e}")
+        return 1
+    warm_up = time.perf_counter() - start
+    if args.engine == "local":
+        print(f"Model load {engine.load_seconds:.2f}s, warm-up total {warm_up:.2f}s")
+
+    print(f"{'clip':<34} {'audio':>7} {'first':>8} {'median':>8} {'RTF':>6}  text")
+    total_audio = total_time = 0.0
+    for name, audio in clips:
+        seconds = len(audio) / WHISPER_SAMPLE_RATE
+        times = []
+        for _ in range(max(1, args.runs)):
+            start = time.perf_counter()
+            try:
+                text = engine.transcribe(audio, WHISPER_SAMPLE_RATE)
+            except (SpeechRecognitionError, ConfigError) as e:
+                print(f"Transcription failed: {e}")
+                return 1
+            times.append(time.perf_counter() - start)
+        median = statistics.median(times)
+        total_audio += seconds
+        total_time += median
+        print(f"{name[:34]:<34} {seconds:>6.1f}s {times[0]:>7.2f}s {median:>7.2f}s {median / seconds:>6.3f}  "
+              f"{text[:40]}")
+    print("-" * 72)
+    print(f"Overall RTF {total_time / total_audio:.3f} ({total_audio:.1f}s of audio in {total_time:.2f}s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
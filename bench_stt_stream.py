@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: time from end of speech to final transcript.
+
+Utterances of several lengths are fed block by block at (scaled) real time,
+as the recorder delivers them, to the local stand-in transcription server.
+  batch     -- the whole recording is sent once speech has ended
+  streaming -- StreamingTranscriber sends windows while the user talks and
+               only the tail at the end
+
+The server's delay models upload plus inference, growing with the audio
+sent. --speed runs everything faster than real time (audio pacing and
+server delay alike); reported times are scaled back to real seconds.
+
+Usage:
+    python bench_stt_stream.py [--base SECONDS] [--per-second SECONDS] [--speed N]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from openai_client import create_client
+from speech_to_text import encode_audio, transcribe_bytes
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_words
+from stt_stream import StreamingTranscriber
+
+RATE = 16000
+BLOCK = 1024
+TRAILING_SILENCE = 0.7
+LENGTHS = (3, 6, 12, 20)
+
+def make_utterance(seconds: float):
+    words = sentence(int(seconds / 0.35))
+    audio = np.concatenate((synthesize_words(words, RATE), np.zeros(int(TRAILING_SILENCE * RATE), np.float32)))
+    return words, audio
+
+def play(audio: np.ndarray, speed: float, on_block) -> None:
+    """Deliver audio in blocks at speed times real time."""
+    start = time.perf_counter()
+    for i in range(0, len(audio), BLOCK):
+        on_block(audio[i:i + BLOCK])
+        delay = start + (i + BLOCK) / RATE / speed - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+def run_batch(audio, speed, transcribe) -> tuple:
+    play(audio, speed, lambda block: None)
+    start = time.perf_counter()
+    text = transcribe(audio)
+    return text, (time.perf_counter() - start) * speed
+
+def run_streaming(audio, speed, transcribe) -> tuple:
+    streamer = StreamingTranscriber(transcribe, RATE, max_duration=len(audio) / RATE + 1)
+    play(audio, speed, streamer.feed)
+    start = time.perf_counter()
+    text = streamer.finish()
+    return text, (time.perf_counter() - start) * speed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Streaming STT end-of-speech latency")
+    parser.add_argument('--base', type=float, default=0.4, help="server delay per request (s)")
+    parser.add_argument('--per-second', type=float, default=0.08, help="server delay per second of audio (s)")
+    parser.add_argument('--speed', type=float, default=4.0, help="run this many times faster than real time")
+    args = parser.parse_args()
+
+    print(f"End of speech to final text (server: {args.base:.2f}s + {args.per_second:.2f}s "
+          f"per audio second; {args.speed:g}x time scale)")
+    print("=" * 72)
+    print(f"{'speech':>7} {'batch':>8} {'streaming':>10} {'requests':>9} {'audio sent':>11} {'correct':>8}")
+    with StandInTranscriptionServer(args.base, args.per_second, time_scale=1 / args.speed) as server:
+        client = create_client(api_key="bench", base_url=server.url)
+        transcribe = lambda audio: transcribe_bytes(encode_audio(audio, RATE), client=client)
+        transcribe(np.zeros(RATE // 10, np.float32))  # Open the connection
+
+        for seconds in LENGTHS:
+            words, audio = make_utterance(seconds)
+            batch_text, batch = run_batch(audio, args.speed, transcribe)
+
+            requests, audio_seconds = server.requests, server.audio_seconds
+            stream_text, streaming = run_streaming(audio, args.speed, transcribe)
+            requests = server.requests - requests
+            sent = (server.audio_seconds - audio_seconds) / (len(audio) / RATE)
+
+            correct = batch_text == stream_text == " ".join(words)
+            print(f"{len(audio) / RATE:>6.1f}s {batch:>7.2f}s {streaming:>9.2f}s {requests:>9} "
+                  f"{sent:>10.1f}x {'yes' if correct else 'NO':>8}")
+        client.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: upload size and transcription latency per upload encoding.
+
+Utterances of several lengths (tone-coded words in light room noise, with
+the leading and trailing silence a recording usually has) are transcribed
+by the local stand-in server, whose delay grows with the request body at
+the given uplink bandwidth.
+  wav       -- the whole recording as 16-bit PCM WAV (the old upload)
+  wav+trim  -- silence trimmed, still WAV
+  flac      -- trimmed, lossless FLAC
+  opus      -- trimmed, OGG/Opus
+
+Reported time is trimming and encoding plus the request. --speed runs the
+server's delay faster than real time; request times are scaled back to real
+seconds (encoding is measured as is).
+
+Usage:
+    python bench_stt_upload.py [--uplink KBITS] [--base SECONDS] [--per-second SECONDS] [--speed N]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from openai_client import create_client
+from speech_to_text import SOUNDFILE_AVAILABLE, encode_audio, transcribe_bytes, trim_silence
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_words
+
+RATE = 16000
+LEAD_SILENCE = 0.6
+TRAIL_SILENCE = 1.0
+NOISE_LEVEL = 0.003
+LENGTHS = (2, 5, 10, 20, 30)
+VARIANTS = (('wav', False), ('wav+trim', True), ('flac', True), ('opus', True))
+
+def make_utterance(seconds: float, rng: np.random.Generator):
+    words = sentence(int(seconds / 0.35))
+    audio = np.concatenate((
+        np.zeros(int(LEAD_SILENCE * RATE), np.float32),
+        synthesize_words(words, RATE),
+        np.zeros(int(TRAIL_SILENCE * RATE), np.float32),
+    ))
+    audio += (NOISE_LEVEL * rng.standard_normal(len(audio))).astype(np.float32)
+    return words, audio
+
+def run(audio, audio_format, trim, client, speed) -> tuple:
+    start = time.perf_counter()
+    if trim:
+        audio = trim_silence(audio, RATE)
+    data = encode_audio(audio, RATE, audio_format.split('+')[0])
+    encoded = time.perf_counter()
+    text = transcribe_bytes(data, client=client)
+    encode_time = encoded - start
+    return text, len(data), encode_time, encode_time + (time.perf_counter() - encoded) * speed
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="STT upload encoding benchmark")
+    parser.add_argument('--uplink', type=float, default=1000, help="uplink bandwidth (kbit/s)")
+    parser.add_argument('--base', type=float, default=0.3, help="server delay per request (s)")
+    parser.add_argument('--per-second', type=float, default=0.02, help="server delay per second of audio (s)")
+    parser.add_argument('--speed', type=float, default=4.0, help="run the server this many times faster")
+    args = parser.parse_args()
+
+    if not SOUNDFILE_AVAILABLE:
+        print("soundfile is not installed: flac and opus fall back to wav")
+    variants = [name for name, _ in VARIANTS]
+    print(f"Upload size and end-to-end time ({args.uplink:g} kbit/s uplink, server "
+          f"{args.base:.2f}s + {args.per_second:.2f}s per audio second)")
+    print("=" * 86)
+    print(f"{'audio':>6}  " + "  ".join(f"{name:>17}" for name in variants) + f"  {'correct':>7}")
+
+    rng = np.random.default_rng(0)
+    with StandInTranscriptionServer(args.base, args.per_second, time_scale=1 / args.speed,
+                                    uplink_bytes_per_second=args.uplink * 1000 / 8) as server:
+        client = create_client(api_key="bench", base_url=server.url)
+        transcribe_bytes(encode_audio(np.zeros(RATE // 10, np.float32), RATE, 'wav'), client=client)
+
+        totals = {name: [0, 0.0, 0.0] for name in variants}
+        for seconds in LENGTHS:
+            words, audio = make_utterance(seconds, rng)
+            cells, correct = [], True
+            for name, trim in VARIANTS:
+                text, size, encode_time, total = run(audio, name, trim, client, args.speed)
+                correct &= text == " ".join(words)
+                totals[name][0] += size
+                totals[name][1] += encode_time
+                totals[name][2] += total
+                cells.append(f"{size / 1024:>6.0f}KB {total:>6.2f}s")
+            print(f"{len(audio) / RATE:>5.1f}s  " + "  ".join(f"{cell:>17}" for cell in cells)
+                  + f"  {'yes' if correct else 'NO':>7}")
+        client.close()
+
+    print("-" * 86)
+    wav_size, _, wav_time = totals['wav']
+    for name in variants:
+        size, encode_time, total = totals[name]
+        print(f"{name:>9}: {size / wav_size:>5.1%} of wav bytes, {total / wav_time:>5.1%} of wav time, "
+              f"{encode_time * 1000 / len(LENGTHS):>5.1f} ms to trim and encode on average")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
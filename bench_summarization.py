@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: prompt tokens per turn over a long synthetic session,
+with and without rolling summarization.
+
+The summarizer is a deterministic stand-in (first sentence of each message,
+capped in length) so the run needs no network; token counts use the same
+TokenCounter as the live context builder.
+
+Usage:
+    python bench_summarization.py [turns]
+"""
+import os
+import sys
+import tempfile
+
+from ai_brain import ConversationManager, CONVERSATION_EXAMPLES
+from context_builder import ContextBuilder, TokenCounter
+from conversation_summary import ConversationSummarizer
+from config import CONTEXT_TOKEN_BUDGET, SUMMARY_KEEP_MESSAGES, SUMMARY_BATCH_MESSAGES
+
+CONTEXT = {"role": "system", "content": "[CONTEXT] Current time, user name, mood and personality instructions. " * 4}
+ANSWER = ("Let me explain it simply. The idea is to break the work into small steps, "
+          "check each one, and keep notes so you can come back to it later. "
+          "Start with the part you understand best and build from there. ")
+
+def stand_in_summary(previous_summary: str, messages) -> str:
+    """Keep the first sentence of each message, capped at 120 words in total."""
+    firsts = [m['content'].split('. ')[0] for m in messages]
+    words = (previous_summary + " " + " ".join(firsts)).split()
+    return " ".join(words[-120:])
+
+def run_session(turns: int, summarize: bool, summary_file: str):
+    conversation = ConversationManager(max_history=15, summary_file=summary_file)
+    conversation.conversation_history = conversation.conversation_history[:1]
+    conversation.running_summary = ""
+    builder = ContextBuilder(budget=CONTEXT_TOKEN_BUDGET, counter=TokenCounter())
+    summarizer = ConversationSummarizer(
+        conversation, stand_in_summary,
+        keep_recent=SUMMARY_KEEP_MESSAGES, batch_size=SUMMARY_BATCH_MESSAGES
+    )
+
+    tokens = []
+    for turn in range(turns):
+        conversation.add_message("user", f"Question {turn}: can you help me with part {turn} of my project?")
+        context = dict(CONTEXT)
+        if conversation.running_summary:
+            context["content"] += f"\n[CONVERSATION SUMMARY]\n{conversation.running_summary}"
+        builder.build(context, CONVERSATION_EXAMPLES, conversation.conversation_history)
+        tokens.append(builder.last_prompt_tokens)
+        conversation.add_message("assistant", f"[THOUGHTS: turn {turn}] {ANSWER * 2}")
+        if summarize:
+            summarizer.run_once()  # Runs in the background after speaking in the app
+    return tokens
+
+def main() -> int:
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        summary_file = os.path.join(tmp, "summary.json")
+        results = {
+            "full history": run_session(turns, False, summary_file),
+            "summarized": run_session(turns, True, summary_file),
+        }
+
+    print(f"Prompt tokens per turn over a {turns}-turn session")
+    print("=" * 60)
+    print(f"{'mode':<14} {'mean':>8} {'last 50':>8} {'max':>8} {'total':>10}")
+    for name, tokens in results.items():
+        tail = tokens[-50:]
+        print(f"{name:<14} {sum(tokens) / len(tokens):>8.0f} {sum(tail) / len(tail):>8.0f} "
+              f"{max(tokens):>8} {sum(tokens):>10}")
+
+    full, summarized = (sum(t) for t in results.values())
+    print(f"\nSummarization sends {1 - summarized / full:.0%} fewer prompt tokens")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs pipelined response stage of a voice turn.
+
+Each stage is simulated with sleeps sized like a real turn (the LLM emits a
+sentence every GENERATE_S seconds, synthesis and playback cost a fixed time
+per sentence), so the numbers only depend on how the stages overlap.
+
+Usage:
+    python bench_turn_pipeline.py [sentences]
+"""
+import sys
+import time
+
+from turn_pipeline import TurnPipeline
+
+GENERATE_S = 0.25     # LLM time per sentence
+SYNTHESIZE_S = 0.30   # TTS time per sentence
+PLAYBACK_S = 0.50     # Audio length per sentence
+
+def make_pipeline(sentences: int) -> TurnPipeline:
+    """Build a pipeline whose stages sleep instead of calling services."""
+    def respond(user_text):
+        for i in range(sentences):
+            time.sleep(GENERATE_S)
+            yield f"Sentence number {i + 1} of the answer."
+
+    def synthesize(text):
+        # Cost scales with the number of sentences in the text
+        time.sleep(SYNTHESIZE_S * max(1, text.count('.')))
+        return text.encode()
+
+    def play(audio):
+        time.sleep(PLAYBACK_S * max(1, audio.count(b'.')))
+
+    return TurnPipeline(
+        record=lambda: "unused.wav",
+        transcribe=lambda path: "unused",
+        respond=respond,
+        synthesize=synthesize,
+        play=play
+    )
+
+def main() -> int:
+    sentences = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    pipeline = make_pipeline(sentences)
+
+    print(f"Turn pipeline benchmark ({sentences} sentences)")
+    print("=" * 50)
+    print(f"{'mode':<10} {'first sound':>12} {'turn total':>12}")
+
+    results = {}
+    for mode, pipelined in (("serial", False), ("pipelined", True)):
+        result = pipeline.run_text("Tell me something", pipelined=pipelined)
+        results[mode] = result.timings
+        print(f"{mode:<10} {result.timings['first_playback'] * 1000:>10.0f}ms "
+              f"{result.timings['total'] * 1000:>10.0f}ms")
+
+    saved = results['serial']['total'] - results['pipelined']['total']
+    print(f"\nPipelining saves {saved * 1000:.0f}ms per turn "
+          f"({saved / results['serial']['total']:.0%})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CPU cost of voice activity detection per second of audio.
+
+Feeds audio through three implementations, both in 1024-sample blocks (as
+the input stream delivers it) and as whole 30 s files (offline evaluation):
+  per-frame loop -- the previous process_audio loop, asking WebRTC VAD about
+                    every 30 ms frame (no early exit, so every frame gets a
+                    decision, as classify_frames gives)
+  early exit     -- the previous loop as it was, stopping at the first speech frame
+  batched        -- classify_frames: energy gate, vectorized over a whole file
+                    and frame by frame within a two-frame block
+
+Signals: digital silence, a quiet room (-60 dBFS noise), and speech (the
+WAV given on the command line, test_recording.wav by default).
+
+Usage:
+    python bench_vad.py [speech.wav]
+"""
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+from vad import BLOCK_SIZE, VoiceActivityDetector
+
+RATE = 16000
+SECONDS = 30
+
+def load_speech(path: str) -> np.ndarray:
+    with wave.open(path, 'rb') as wf:
+        if wf.getframerate() != RATE or wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path} must be 16 kHz 16-bit mono")
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    repeats = int(np.ceil(SECONDS * RATE / len(pcm)))
+    return (np.tile(pcm, repeats)[:SECONDS * RATE] / 32768.0).astype(np.float32)
+
+def legacy_loop(detector: VoiceActivityDetector, block: np.ndarray, early_exit: bool) -> bool:
+    """The previous process_audio frame loop."""
+    pcm = (block * 32767).astype(np.int16)
+    detected = False
+    for i in range(0, len(pcm), detector.samples_per_frame):
+        frame = pcm[i:i + detector.samples_per_frame]
+        if len(frame) < detector.samples_per_frame:
+            continue
+        if detector.vad.is_speech(frame.tobytes(), RATE):
+            detected = True
+            if early_exit:
+                break
+    return detected
+
+def cpu_ms_per_second(fn, signal: np.ndarray, block_size: int) -> float:
+    blocks = [signal[i:i + block_size] for i in range(0, len(signal) - block_size + 1, block_size)]
+    start = time.process_time()
+    for _ in range(3):
+        for block in blocks:
+            fn(block)
+    return (time.process_time() - start) * 1000 / (3 * len(signal) / RATE)
+
+def main() -> int:
+    speech_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "test_recording.wav")
+    rng = np.random.default_rng(0)
+    signals = {
+        'silence': np.zeros(SECONDS * RATE, dtype=np.float32),
+        'quiet room': (0.001 * rng.standard_normal(SECONDS * RATE)).astype(np.float32),
+    }
+    if os.path.exists(speech_path):
+        signals['speech'] = load_speech(speech_path)
+
+    detector = VoiceActivityDetector(RATE)
+    if detector.vad is None:
+        print("webrtcvad is not installed; nothing to compare")
+        return 1
+
+    print("VAD CPU time (ms per second of audio)")
+    print("=" * 72)
+    print(f"{'signal':<12} {'blocks':>7} {'per-frame loop':>15} {'early exit':>11} {'batched':>9} {'WebRTC calls':>13}")
+    for name, signal in signals.items():
+        for block_size, label in ((BLOCK_SIZE, "1024"), (len(signal), "file")):
+            loop = cpu_ms_per_second(lambda b: legacy_loop(detector, b, early_exit=False), signal, block_size)
+            early = cpu_ms_per_second(lambda b: legacy_loop(detector, b, early_exit=True), signal, block_size)
+            batched = cpu_ms_per_second(detector.classify_frames, signal, block_size)
+            analysis = detector.classify_frames(signal)
+            calls = analysis.webrtc_calls / len(analysis)
+            print(f"{name:<12} {label:>7} {loop:>15.2f} {early:>11.2f} {batched:>9.2f} {calls:>13.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
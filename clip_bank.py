@@ -0,0 +1,208 @@
+"""
+In-memory bank of pre-recorded voice clips.
+The wav/anglo_*.wav clips are decoded into PCM buffers once, in a background
+thread at start-up, so playing a pre-recorded response reads no file (a stat
+notices clips that changed on disk). Memory use is capped; clips of rarely
+used categories are only loaded on first use and the least recently played
+clips are evicted over the cap.
+"""
+import logging
+import os
+import re
+import threading
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# anglo_<category>_<...>.wav, e.g. anglo_emotion_calm_001.wav -> "emotion"
+_CATEGORY = re.compile(r"^anglo_([a-z]+)_")
+
+class Clip:
+    """A decoded clip: PCM frames plus the format needed to play them."""
+
+    __slots__ = ('name', 'frames', 'sample_width', 'channels', 'rate', 'path', 'mtime')
+
+    def __init__(self, name: str, frames: bytes, sample_width: int, channels: int, rate: int,
+                 path: str = "", mtime: int = 0):
+        self.name = name
+        self.frames = frames
+        self.sample_width = sample_width
+        self.channels = channels
+        self.rate = rate
+        self.path = path  # Absolute path of the file it was decoded from
+        self.mtime = mtime  # The file's st_mtime_ns when decoded
+
+    @property
+    def duration(self) -> float:
+        """Length of the clip in seconds."""
+        return len(self.frames) / (self.sample_width * self.channels * self.rate)
+
+def clip_category(name: str) -> Optional[str]:
+    """Return the category encoded in a clip file name, if any."""
+    match = _CATEGORY.match(name)
+    return match.group(1) if match else None
+
+class ClipBank:
+    """
+    Decoded pre-recorded clips kept in memory, keyed by absolute path.
+
+    A clip whose file has been modified since it was decoded is decoded
+    again, so a manifest reload that replaces a clip (or points a name at
+    another directory) never plays stale audio.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int,
+        lazy_categories: Iterable[str] = (),
+        pattern: str = "anglo_*.wav",
+        preload: bool = True
+    ):
+        """
+        Initialize the bank.
+
+        Args:
+            directory: Directory holding the clips
+            max_bytes: Maximum PCM bytes kept in memory
+            lazy_categories: Categories loaded on first use instead of at start-up
+            pattern: Glob pattern of the clip files
+            preload: If True, start loading the clips in the background right away
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.lazy_categories = set(lazy_categories)
+        self.pattern = pattern
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._clips: "OrderedDict[str, Clip]" = OrderedDict()
+        self._invalid: Dict[str, int] = {}  # Path -> st_mtime_ns of the invalid file
+        self._lock = threading.Lock()
+        self._preload_thread: Optional[threading.Thread] = None
+        if preload:
+            self.start_preload()
+
+    def start_preload(self) -> None:
+        """Load the clips in a background thread (no-op if already started)."""
+        if self._preload_thread is not None:
+            return
+        self._preload_thread = threading.Thread(target=self.preload, name="clip-preload", daemon=True)
+        self._preload_thread.start()
+
+    def preload(self) -> int:
+        """
+        Load every clip outside the lazy categories, until the memory cap.
+
+        Returns:
+            int: Number of clips loaded
+        """
+        if not self.directory.is_dir():
+            logger.info("Clip directory %s not found; pre-recorded clips will be read on demand", self.directory)
+            return 0
+
+        loaded = 0
+        for path in sorted(self.directory.glob(self.pattern)):
+            if clip_category(path.name) in self.lazy_categories:
+                continue
+            with self._lock:
+                if os.path.abspath(path) in self._clips:
+                    continue
+            clip = self._load(path)
+            if clip is None:
+                continue
+            if self.size + len(clip.frames) > self.max_bytes:
+                logger.info("Clip bank full after %d clips; the rest load on demand", loaded)
+                break
+            self._store(clip)
+            loaded += 1
+
+        logger.info("Preloaded %d clips (%.1f MB)", loaded, self.size / (1024 * 1024))
+        return loaded
+
+    def get(self, path: Union[str, Path]) -> Optional[Clip]:
+        """
+        Return the decoded clip for a response's file path.
+
+        The path is used as given if it exists, else the file of that name
+        in the bank's directory. Clips not in memory yet, or changed on disk
+        since they were decoded, are loaded (and kept if they fit). A clip
+        whose file has since been deleted is still served from memory.
+
+        Returns:
+            Clip: The clip, or None if the file is missing or not a valid WAV
+        """
+        path = Path(path)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            path = self.directory / path.name
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+        key = os.path.abspath(path)
+
+        with self._lock:
+            clip = self._clips.get(key)
+            if clip is not None and (mtime is None or clip.mtime == mtime):
+                self._clips.move_to_end(key)
+                self.hits += 1
+                return clip
+            if mtime is not None and self._invalid.get(key) == mtime:
+                return None
+            self.misses += 1
+
+        clip = self._load(path)
+        if clip is not None:
+            self._store(clip)
+        return clip
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of clips, bytes in memory, hits and misses."""
+        with self._lock:
+            return {
+                'clips': len(self._clips),
+                'bytes': self.size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalid': len(self._invalid)
+            }
+
+    def _load(self, path: Path) -> Optional[Clip]:
+        """Read and validate a clip; invalid files are remembered and skipped until they change."""
+        key = os.path.abspath(path)
+        mtime = None
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with wave.open(str(path), 'rb') as wf:
+                if wf.getcomptype() != 'NONE':
+                    raise ValueError(f"compressed WAV ({wf.getcomptype()})")
+                if wf.getsampwidth() not in (1, 2, 3, 4) or wf.getnchannels() not in (1, 2):
+                    raise ValueError(f"unsupported format ({wf.getsampwidth()} bytes, {wf.getnchannels()} channels)")
+                return Clip(path.name, wf.readframes(wf.getnframes()),
+                            wf.getsampwidth(), wf.getnchannels(), wf.getframerate(), key, mtime)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Skipping invalid clip %s: %s", path, e)
+            with self._lock:
+                self._invalid[key] = mtime
+            return None
+
+    def _store(self, clip: Clip) -> None:
+        with self._lock:
+            previous = self._clips.pop(clip.path, None)
+            if previous is not None:
+                self.size -= len(previous.frames)
+            self._clips[clip.path] = clip
+            self.size += len(clip.frames)
+            # Evict the least recently used clips, never the one just added
+            while self.size > self.max_bytes and len(self._clips) > 1:
+                _, evicted = self._clips.popitem(last=False)
+                self.size -= len(evicted.frames)
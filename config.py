@@ -44,6 +44,15 @@ ELEVENLABS_API_KEY: Optional[str] = os.getenv("ELEVENLABS_API_KEY")
 logger.info(f"OpenAI API Key loaded: {bool(OPENAI_API_KEY)}")
 logger.info(f"ElevenLabs API Key loaded: {bool(ELEVENLABS_API_KEY)}")
 
+# OpenAI Connection Settings
+OPENAI_BASE_URL: Optional[str] = os.getenv("OPENAI_BASE_URL") or None  # None uses the default API
+OPENAI_TIMEOUT: float = 30.0  # Seconds per request
+OPENAI_CONNECT_TIMEOUT: float = 5.0  # Seconds to establish a connection
+OPENAI_MAX_CONNECTIONS: int = 10
+OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 5
+OPENAI_KEEPALIVE_EXPIRY: float = 120.0  # Seconds an idle connection is kept open
+OPENAI_MAX_RETRIES: int = 2
+
 # Application Settings
 ASSISTANT_NAME: str = os.getenv("ASSISTANT_NAME", "Edward")
 VOICE_NAME: str = os.getenv("VOICE_NAME", "Adam")
@@ -65,8 +74,16 @@ except OSError as e:
     raise
 
 # Conversation Settings
-CONVERSATION_HISTORY_FILE: Path = DATA_DIR / "conversation_history.json"
+CONVERSATION_HISTORY_FILE: Path = DATA_DIR / "conversation_history.json"  # Legacy format, migrated on start
+CONVERSATION_LOG_FILE: Path = DATA_DIR / "conversation_history.jsonl"
+CONVERSATION_FSYNC_BATCH: int = 8  # Messages appended between fsyncs
+CONVERSATION_FSYNC_INTERVAL: float = 2.0  # Maximum seconds between fsyncs
+CONVERSATION_COMPACT_BYTES: int = 1024 * 1024  # Log size that triggers compaction
 MAX_CONVERSATION_HISTORY: int = 15  # Number of exchanges to keep in memory
+CONTEXT_TOKEN_BUDGET: int = 3000  # Maximum prompt tokens sent per request
+CONVERSATION_SUMMARY_FILE: Path = DATA_DIR / "conversation_summary.json"
+SUMMARY_KEEP_MESSAGES: int = 6  # Recent messages always sent verbatim
+SUMMARY_BATCH_MESSAGES: int = 4  # Older messages needed before summarizing
 
 # Validate configuration
 if __name__ == "__main__":
@@ -84,9 +101,64 @@ VOICE_SETTINGS = {
     "pitch": 1.0,   # Pitch adjustment
 }
 
+# Seconds synthesis waits for the background voice loading before using fallback voices
+VOICE_LOAD_TIMEOUT: float = 10.0
+
+# Voice catalog cached on disk; refreshed in the background when older than the TTL
+VOICE_CATALOG_FILE: Path = DATA_DIR / "voice_catalog.json"
+VOICE_CATALOG_TTL: float = 24 * 60 * 60
+
+# TTS Cache Settings
+TTS_CACHE_DIR: Path = AUDIO_DIR / "tts_cache"
+TTS_CACHE_MAX_MB: int = 200  # Disk space for cached speech
+TTS_CACHE_MEMORY_ITEMS: int = 32  # Clips kept in memory
+
+# Streaming TTS Settings (voice_manager.stream_speak; opt-in, voice turns use TurnPipeline)
+TTS_STREAM_FORMAT: str = "pcm_22050"  # Raw PCM so chunks can be played as they arrive
+TTS_JITTER_BUFFER_MS: int = 200  # Audio buffered before streaming playback starts
+
+# Pre-recorded Response Settings
+# Minimum similarity (0-1) between the text to speak and a clip's transcript
+RESPONSE_MATCH_MIN_CONFIDENCE: float = 0.8
+CLIP_DIR: Path = BASE_DIR / "wav"  # wav/anglo_*.wav clips
+CLIP_BANK_MAX_MB: int = 64  # Decoded clips kept in memory
+CLIP_BANK_LAZY_CATEGORIES = ("safety", "emotion")  # Loaded on first use only
+RESPONSE_MANIFEST_FILE: Path = CLIP_DIR / "manifest.json"  # Optional; replaces the built-in catalog
+RESPONSE_MANIFEST_POLL_SECONDS: float = 2.0  # How often the manifest is checked for changes
+
+# Speech Recognition Settings
+# Streaming transcription sends windows of this length while the user talks;
+# consecutive windows share STT_STREAM_OVERLAP_SECONDS so no word is lost at a cut
+STT_STREAM_WINDOW_SECONDS: float = 5.0
+STT_STREAM_OVERLAP_SECONDS: float = 1.0
+# Upload encoding: "wav", "flac" (lossless) or "opus" (OGG/Opus, smallest but lossy).
+# flac and opus need the soundfile package (the "compression" extra); without it
+# uploads are sent as wav
+STT_UPLOAD_FORMAT: str = "flac"
+STT_TRIM_SILENCE: bool = True  # Cut leading and trailing silence (found by the VAD) before recognition
+STT_TRIM_PADDING_MS: int = 200  # Silence kept around the speech when trimming
+# Longer recordings are split at pauses into chunks of about STT_CHUNK_SECONDS,
+# transcribed concurrently by up to STT_CHUNK_WORKERS requests. Where no pause
+# is found, chunks are cut anyway and overlap by STT_CHUNK_OVERLAP_SECONDS
+STT_CHUNK_MIN_SECONDS: float = 12.0
+STT_CHUNK_SECONDS: float = 6.0
+STT_CHUNK_MIN_PAUSE_MS: int = 200
+STT_CHUNK_OVERLAP_SECONDS: float = 1.0
+STT_CHUNK_WORKERS: int = 4
+
+# Speech recognition engine: "openai", "local" (faster-whisper on the CPU) or
+# "auto" (OpenAI, falling back to the local model while the network is down).
+# The local engine needs the faster-whisper package (the "offline" extra)
+STT_ENGINE: str = "auto"
+STT_LOCAL_MODEL: str = "base.en"  # Model name, downloaded to MODELS_DIR, used if OFFLINE_MODEL_PATH is missing
+STT_LOCAL_COMPUTE_TYPE: str = "int8"  # Quantization of the local model's weights
+STT_LOCAL_THREADS: int = 0  # CPU threads for the local model (0: library default)
+STT_LOCAL_BEAM_SIZE: int = 1  # 1 is greedy decoding, the fastest
+STT_OFFLINE_RETRY_SECONDS: float = 30.0  # After a network failure, how long "auto" stays on the local model
+
 # Offline Mode Settings
-OFFLINE_MODE = False  # Set to True to enable offline capabilities
-OFFLINE_MODEL_PATH = MODELS_DIR / "offline_model"
+OFFLINE_MODE = False  # Set to True to enable offline capabilities (speech recognition uses the local engine)
+OFFLINE_MODEL_PATH = MODELS_DIR / "offline_model"  # A converted (CTranslate2) Whisper model directory
 
 # Logging Configuration
 LOG_LEVEL = "INFO"
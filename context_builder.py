@@ -0,0 +1,159 @@
+"""
+Token-budgeted prompt assembly for Edward Voice AI.
+Fits the context prompt, few-shot examples and conversation history into a
+fixed token budget so request size (and latency) stays bounded however long
+the session or the user's utterances get.
+"""
+import logging
+import math
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tokens the chat format adds per message and to prime the reply
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_PRIMING_TOKENS = 3
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (about four characters per token for English)."""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+def get_default_estimator(model: str = "gpt-3.5-turbo") -> Callable[[str], int]:
+    """
+    Get the most accurate token counter available.
+
+    Uses tiktoken when it is installed and falls back to estimate_tokens.
+    """
+    try:
+        import tiktoken
+        encoding = tiktoken.encoding_for_model(model)
+        return lambda text: len(encoding.encode(text))
+    except ImportError:
+        logger.debug("tiktoken not installed - using character-based token estimate")
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer for {model}: {e}. Using estimate.")
+    return estimate_tokens
+
+class TokenCounter:
+    """Counts message tokens with a pluggable estimator and caches the results."""
+
+    def __init__(self, estimator: Optional[Callable[[str], int]] = None, cache_size: int = 2048):
+        """
+        Initialize the counter.
+
+        Args:
+            estimator: Function returning the number of tokens in a string
+            cache_size: Maximum number of cached message counts
+        """
+        self.estimator = estimator or get_default_estimator()
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[Tuple[str, str], int]' = OrderedDict()
+
+    def count(self, message: Dict) -> int:
+        """Return the number of prompt tokens a message uses."""
+        key = (message.get('role', ''), message.get('content', ''))
+        tokens = self._cache.get(key)
+        if tokens is None:
+            tokens = self.estimator(key[0]) + self.estimator(key[1]) + MESSAGE_OVERHEAD_TOKENS
+            self._cache[key] = tokens
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return tokens
+
+    def count_all(self, messages: List[Dict]) -> int:
+        """Return the prompt tokens for a list of messages."""
+        return sum(self.count(message) for message in messages) + REPLY_PRIMING_TOKENS
+
+class ContextBuilder:
+    """
+    Assembles the messages for a chat request within a token budget.
+
+    The context prompt, the conversation's system message and the latest
+    message are always sent. Remaining room goes to history (newest first),
+    then to the few-shot examples, which are trimmed pair by pair and finally
+    dropped when the history needs the space.
+    """
+
+    def __init__(self, budget: int, counter: Optional[TokenCounter] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            budget: Maximum prompt tokens per request
+            counter: Token counter (a cached default is created if None)
+        """
+        self.budget = budget
+        self.counter = counter or TokenCounter()
+        self.last_prompt_tokens = 0
+
+    def build(self, context_prompt: Dict, examples: List[Dict], history: List[Dict]) -> List[Dict]:
+        """
+        Build the messages for the next request.
+
+        Args:
+            context_prompt: Per-turn system context
+            examples: Few-shot conversation examples (optionally led by a system message)
+            history: Conversation history, led by its system message
+
+        Returns:
+            list: Messages with only 'role' and 'content' keys
+        """
+        pinned_system = [m for m in history[:1] if m.get('role') == 'system']
+        conversation = history[len(pinned_system):]
+        latest = conversation[-1:]
+        earlier = conversation[:-1]
+
+        required = [context_prompt] + pinned_system + latest
+        remaining = self.budget - self.counter.count_all(required)
+        if remaining < 0:
+            logger.warning("Required context exceeds the token budget by %d tokens", -remaining)
+
+        # History, newest first
+        kept_history: List[Dict] = []
+        for message in reversed(earlier):
+            tokens = self.counter.count(message)
+            if tokens > remaining:
+                break
+            kept_history.append(message)
+            remaining -= tokens
+        kept_history.reverse()
+
+        kept_examples = self._fit_examples(examples, remaining)
+
+        messages = [context_prompt] + kept_examples + pinned_system + kept_history + latest
+        self.last_prompt_tokens = self.counter.count_all(messages)
+        if len(kept_history) < len(earlier) or len(kept_examples) < len(examples):
+            logger.debug(
+                "Context trimmed to %d tokens: %d/%d history messages, %d/%d examples",
+                self.last_prompt_tokens, len(kept_history), len(earlier),
+                len(kept_examples), len(examples)
+            )
+        return [{'role': m['role'], 'content': m['content']} for m in messages]
+
+    def _fit_examples(self, examples: List[Dict], remaining: int) -> List[Dict]:
+        """Keep the examples' system message and as many leading pairs as fit."""
+        if self.counter.count_all(examples) - REPLY_PRIMING_TOKENS <= remaining:
+            return list(examples)
+
+        kept: List[Dict] = []
+        body = examples
+        if examples and examples[0].get('role') == 'system':
+            tokens = self.counter.count(examples[0])
+            if tokens > remaining:
+                return []
+            kept.append(examples[0])
+            remaining -= tokens
+            body = examples[1:]
+
+        for i in range(0, len(body) - 1, 2):
+            pair = body[i:i + 2]
+            tokens = sum(self.counter.count(m) for m in pair)
+            if tokens > remaining:
+                break
+            kept.extend(pair)
+            remaining -= tokens
+        return kept
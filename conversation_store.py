@@ -0,0 +1,232 @@
+"""
+Append-only conversation store for Edward Voice AI.
+Each message is appended to a JSON Lines file, so saving costs one message
+rather than the whole history. Start-up reads only the tail of the file,
+fsyncs are batched, and the file is compacted once it grows past a limit.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class ConversationStore:
+    """Crash-safe JSON Lines store of conversation messages."""
+
+    READ_BLOCK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        legacy_path: Optional[Union[str, Path]] = None,
+        fsync_batch: int = 8,
+        fsync_interval: float = 2.0,
+        compact_bytes: int = 1024 * 1024,
+        keep_on_compact: int = 200
+    ):
+        """
+        Initialize the store, migrating a legacy JSON history if present.
+
+        Args:
+            path: JSON Lines file holding the messages
+            legacy_path: Old whole-file JSON history to migrate from
+            fsync_batch: Appends between fsyncs
+            fsync_interval: Maximum seconds between fsyncs while appending
+            compact_bytes: File size that triggers compaction
+            keep_on_compact: Number of most recent messages kept by compaction
+        """
+        self.path = Path(path)
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.compact_bytes = compact_bytes
+        self.keep_on_compact = keep_on_compact
+
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        if legacy_path:
+            self.migrate_legacy(legacy_path)
+
+    def append(self, message: Dict) -> None:
+        """Append a message; it reaches the OS immediately and the disk in batches."""
+        line = json.dumps(message, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            handle = self._open()
+            handle.write(line)
+            handle.flush()
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_batch or
+                    time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync()
+            if handle.tell() >= self.compact_bytes:
+                self._compact()
+
+    def load_tail(self, count: int) -> List[Dict]:
+        """
+        Load the most recent messages, reading only the end of the file.
+
+        Args:
+            count: Maximum number of messages to return
+
+        Returns:
+            list: Up to count messages, oldest first
+        """
+        if count <= 0 or not self.path.exists():
+            return []
+
+        with self._lock:
+            lines = self._read_tail_lines(count)
+
+        messages = []
+        for line in lines:
+            try:
+                messages.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A torn write from a crash; skip it
+                logger.warning("Skipping unreadable line in %s", self.path)
+        return messages[-count:]
+
+    def flush(self) -> None:
+        """Force appended messages to disk."""
+        with self._lock:
+            if self._file and self._unsynced:
+                self._sync()
+
+    def compact(self) -> None:
+        """Rewrite the file with only the most recent messages."""
+        with self._lock:
+            self._compact()
+
+    def clear(self) -> None:
+        """Delete every stored message."""
+        with self._lock:
+            self._close()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Flush and close the file."""
+        with self._lock:
+            self._close()
+
+    def migrate_legacy(self, legacy_path: Union[str, Path]) -> bool:
+        """
+        Convert a whole-file JSON history into this store.
+
+        The legacy file is renamed with a .migrated suffix afterwards.
+
+        Returns:
+            bool: True if a migration took place
+        """
+        legacy_path = Path(legacy_path)
+        if self.path.exists() or not legacy_path.exists():
+            return False
+
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                messages = json.load(f)
+            self._write_atomic(messages[-self.keep_on_compact:])
+            os.replace(legacy_path, legacy_path.with_name(legacy_path.name + '.migrated'))
+            logger.info("Migrated %d messages from %s", len(messages), legacy_path)
+            return True
+        except Exception as e:
+            logger.warning("Could not migrate conversation history from %s: %s", legacy_path, e)
+            return False
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._drop_torn_tail()
+            self._file = open(self.path, 'a', encoding='utf-8')
+        return self._file
+
+    def _drop_torn_tail(self) -> None:
+        """Cut a partial last line left by a crash, so the next append starts a fresh line."""
+        try:
+            f = open(self.path, 'rb+')
+        except FileNotFoundError:
+            return
+
+        with f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                step = min(self.READ_BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b'\n')
+                if newline >= 0:
+                    position += newline + 1
+                    break
+            if position < end:
+                logger.warning("Dropping a partially written line at the end of %s", self.path)
+                f.truncate(position)
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+            self._file = None
+
+    def _compact(self) -> None:
+        lines = self._read_tail_lines(self.keep_on_compact)
+        self._close()
+        messages = []
+        for line in lines:
+            try:
+                messages.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        self._write_atomic(messages[-self.keep_on_compact:])
+        logger.debug("Compacted %s to %d messages", self.path, len(messages))
+
+    def _write_atomic(self, messages: List[Dict]) -> None:
+        """Replace the file with the given messages in one atomic rename."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def _read_tail_lines(self, count: int) -> List[str]:
+        """Read the last count non-empty lines by scanning backwards in blocks."""
+        if self._file is not None:
+            self._file.flush()
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return []
+
+        with f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b''
+            # count + 1 newlines guarantee count complete lines
+            while position > 0 and data.count(b'\n') <= count:
+                step = min(self.READ_BLOCK_SIZE, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+
+        lines = [line for line in data.decode('utf-8', errors='replace').split('\n') if line.strip()]
+        if position > 0:
+            lines = lines[1:]  # The first line may be partial
+        return lines[-count:]
@@ -0,0 +1,131 @@
+"""
+Rolling conversation summarization for Edward Voice AI.
+Older turns are folded into a compact running summary in a background
+thread, after the response has been spoken, so long sessions stay cheap
+without adding latency to any turn.
+"""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and Anglo, "
+    "a personal assistant. Update the summary with the new messages. Keep names, "
+    "preferences, decisions, open tasks and topics discussed. Drop small talk. "
+    "Reply with the updated summary only, in at most 120 words."
+)
+
+def summarize_with_openai(previous_summary: str, messages: List[Dict],
+                          model: str = "gpt-3.5-turbo", max_tokens: int = 200) -> str:
+    """
+    Fold messages into the running summary using the chat model.
+
+    Args:
+        previous_summary: The current running summary (may be empty)
+        messages: Messages to fold into the summary, oldest first
+        model: Chat model to use
+        max_tokens: Maximum length of the new summary
+
+    Returns:
+        str: The updated summary
+    """
+    from openai_client import get_client
+
+    transcript = "\n".join(f"{m['role'].capitalize()}: {m['content']}" for m in messages)
+    response = get_client().chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": (
+                f"Current summary:\n{previous_summary or '(none)'}\n\n"
+                f"New messages:\n{transcript}"
+            )}
+        ],
+        max_tokens=max_tokens,
+        temperature=0.2
+    )
+    summary = response.choices[0].message.content
+    if not isinstance(summary, str) or not summary.strip():
+        raise ValueError("Empty summary received")
+    return summary.strip()
+
+class ConversationSummarizer:
+    """Folds older conversation messages into the manager's running summary."""
+
+    def __init__(
+        self,
+        conversation,
+        summarize: Optional[Callable[[str, List[Dict]], str]] = None,
+        keep_recent: int = 6,
+        batch_size: int = 4
+    ):
+        """
+        Initialize the summarizer.
+
+        Args:
+            conversation: The ConversationManager whose history is summarized
+            summarize: Function (previous_summary, messages) -> new summary
+            keep_recent: Number of recent messages that are never summarized
+            batch_size: Minimum number of messages to fold at once
+        """
+        self.conversation = conversation
+        self.summarize = summarize or summarize_with_openai
+        self.keep_recent = keep_recent
+        self.batch_size = batch_size
+        self.runs = 0
+        self.failures = 0
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._rerun = False
+
+    def schedule(self) -> None:
+        """Summarize in a background thread; coalesces with a run already in progress."""
+        with self._lock:
+            if self._thread is not None:
+                self._rerun = True
+                return
+            self._thread = threading.Thread(target=self._worker, name="conversation-summary", daemon=True)
+            self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Wait for a background run to finish."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def run_once(self) -> bool:
+        """
+        Fold pending messages into the summary now (in the calling thread).
+
+        Returns:
+            bool: True if the summary was updated
+        """
+        pending = self.conversation.messages_to_summarize(self.keep_recent)
+        if len(pending) < self.batch_size:
+            return False
+
+        try:
+            summary = self.summarize(self.conversation.running_summary, pending)
+        except Exception as e:
+            # Leave the messages in place; they are retried on the next run
+            self.failures += 1
+            logger.warning("Conversation summarization failed: %s", e)
+            return False
+
+        self.conversation.apply_summary(summary, pending)
+        self.runs += 1
+        logger.debug("Folded %d messages into the conversation summary", len(pending))
+        return True
+
+    def _worker(self) -> None:
+        while True:
+            self.run_once()
+            with self._lock:
+                if not self._rerun:
+                    self._thread = None
+                    return
+                self._rerun = False
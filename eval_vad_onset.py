@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation: how much of each utterance's onset the recorder clips.
+
+A recording's own start cannot serve as ground truth: it is already cut
+wherever the microphone happened to start, and its quiet first syllable is
+exactly what the detector misses. So the corpus is synthetic, with a known
+onset. From each WAV (16 kHz 16-bit mono, normalized to PEAK_LEVEL) the
+speech from its first loud frame on is faded in from FADE_FLOOR_DB over
+each of ONSET_RAMPS_MS, as a soft-spoken first syllable would, and placed
+after a second of quiet room noise, at a random position within an input
+block. The onset is the first sample of the fade. The signal is fed block
+by block through UtteranceRecorder, exactly as the input stream would
+deliver it; anything of the fade the recording starts after is clipped
+speech.
+
+Usage:
+    python eval_vad_onset.py [--trials N] [recording.wav ...]
+"""
+import argparse
+import os
+import sys
+import wave
+
+import numpy as np
+
+from vad import BLOCK_SIZE, UtteranceRecorder
+
+RATE = 16000
+LEAD_IN_SECONDS = 1.0
+ONSET_RATIO = 0.1
+PEAK_LEVEL = 0.5
+FADE_FLOOR_DB = -40.0
+ONSET_RAMPS_MS = (0, 100, 200, 400)
+PRE_ROLLS_MS = (0, 100, 200, 300, 400, 500)
+
+def load(path: str) -> np.ndarray:
+    with wave.open(path, 'rb') as wf:
+        if wf.getframerate() != RATE or wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path} must be 16 kHz 16-bit mono")
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    return (pcm / 32768.0).astype(np.float32)
+
+def loud_start(audio: np.ndarray, frame: int = RATE // 100) -> int:
+    """Sample index of the first frame within 20 dB of the loudest one."""
+    frames = audio[:len(audio) // frame * frame].reshape(-1, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    return int(np.argmax(rms >= ONSET_RATIO * rms.max())) * frame
+
+def soft_onset(speech: np.ndarray, ramp_ms: float) -> np.ndarray:
+    """The speech faded in from FADE_FLOOR_DB to full level over ramp_ms."""
+    envelope = np.ones(len(speech), dtype=np.float32)
+    ramp = min(int(ramp_ms * RATE / 1000), len(speech))
+    envelope[:ramp] = 10 ** (FADE_FLOOR_DB * (1 - np.arange(ramp) / ramp) / 20)
+    return speech * envelope
+
+def clipped_ms(signal: np.ndarray, onset: int, pre_roll_ms: float) -> float:
+    """Milliseconds of speech before the recording starts (inf if never triggered)."""
+    recorder = UtteranceRecorder(RATE, max_duration=0, pre_roll_ms=pre_roll_ms)
+    for i in range(0, len(signal) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        recorder.feed(signal[i:i + BLOCK_SIZE])
+        if recorder.started:
+            break
+    if not recorder.started:
+        return float('inf')
+    return max(0, recorder.start_sample - onset) * 1000 / RATE
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Onset clipping per pre-roll length")
+    parser.add_argument('--trials', type=int, default=8, help="block positions tried per recording and fade")
+    parser.add_argument('files', nargs='*')
+    args = parser.parse_args()
+
+    paths = args.files or [os.path.join(os.path.dirname(__file__), "test_recording.wav")]
+    rng = np.random.default_rng(0)
+    results = {(ramp, pre_roll): [] for ramp in ONSET_RAMPS_MS for pre_roll in PRE_ROLLS_MS}
+    for path in paths:
+        audio = load(path)
+        audio *= PEAK_LEVEL / max(float(np.abs(audio).max()), 1e-9)
+        speech = audio[loud_start(audio):]
+        for ramp in ONSET_RAMPS_MS:
+            onset_speech = soft_onset(speech, ramp)
+            for _ in range(args.trials):
+                lead_in = int(LEAD_IN_SECONDS * RATE) + int(rng.integers(BLOCK_SIZE))
+                room = (0.001 * rng.standard_normal(lead_in)).astype(np.float32)
+                signal = np.concatenate((room, onset_speech))
+                for pre_roll in PRE_ROLLS_MS:
+                    results[ramp, pre_roll].append(clipped_ms(signal, lead_in, pre_roll))
+
+    print(f"Onset clipping over {len(paths)} recording(s) x {args.trials} block positions "
+          f"(mean / worst ms, by fade-in)")
+    print("=" * 72)
+    print(f"{'pre-roll':>9}" + "".join(f" {f'{ramp} ms fade':>15}" for ramp in ONSET_RAMPS_MS))
+    for pre_roll in PRE_ROLLS_MS:
+        cells = []
+        for ramp in ONSET_RAMPS_MS:
+            clips = np.array(results[ramp, pre_roll])
+            cells.append(f"{clips.mean():>6.0f} / {clips.max():>4.0f}")
+        print(f"{pre_roll:>7}ms" + "".join(f" {cell:>15}" for cell in cells))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
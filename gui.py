@@ -12,10 +12,13 @@ from typing import Optional, Callable, Any
 
 # Import local modules
 from config import ConfigError
-from voice_input import record_voice
-from speech_to_text import speech_to_text, SpeechRecognitionError
-from ai_brain import get_response, clear_conversation, AIResponseError
+from voice_input import record_audio
+from speech_to_text import SpeechRecognitionError
+from stt_engines import start_warm_up
+from audio_utils import clip_bank
+from ai_brain import get_response, clear_conversation, schedule_summary, AIResponseError
 from text_to_speech import speak, TTSConversionError
+from turn_pipeline import TurnPipeline
 from utils.error_handler import (
     handle_error,
     handle_gui_error,
@@ -41,6 +44,11 @@ class EdwardGUI:
         self.is_recording = False
         self.recording_thread = None
         
+        # Decode the pre-recorded clips and warm up speech recognition
+        # while the user reads the window
+        clip_bank.start_preload()
+        start_warm_up()
+        
         # Bind keyboard shortcuts
         self.root.bind('<Control-q>', lambda e: self.root.quit())
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -103,32 +111,31 @@ class EdwardGUI:
     def _process_voice_thread(self) -> None:
         """Background thread for processing voice input."""
         try:
-            # Record audio
-            audio_file = record_voice(stop_event=lambda: not self.is_recording)
-            
-            if not audio_file:
-                self.update_status("No audio recorded", 'orange')
-                return
-                
-            self.update_status("Processing your request...", 'blue')
+            pipeline = TurnPipeline(
+                record=lambda: record_audio(stop_event=lambda: not self.is_recording),
+                on_stage=self._on_turn_stage,
+                on_transcript=lambda text: self._update_chat(f"You: {text}\n"),
+                on_response=lambda text: self._update_chat(f"{self.assistant_name.get()}: {text}")
+            )
             
-            # Convert speech to text
             try:
-                text = speech_to_text(audio_file)
-                if not text:
-                    self.update_status("Could not transcribe audio", 'orange')
+                # Record, transcribe, then generate and speak the response
+                # sentence by sentence
+                result = pipeline.run()
+                
+                if not result.audio_file:
+                    self.update_status("No audio recorded", 'orange')
                     return
                     
-                self._update_chat(f"You: {text}\n")
-                
-                # Get AI response
-                response = get_response(text)
-                if response:
-                    self._update_chat(f"{self.assistant_name.get()}: {response}")
-                    speak(response)
+                if not result.transcript:
+                    self.update_status("Could not transcribe audio", 'orange')
+                    return
                 
                 self.update_status("Ready", 'green')
                 
+                # The response has been spoken: summarize older turns off the critical path
+                schedule_summary()
+                
             except SpeechRecognitionError as e:
                 self.update_status(f"Speech recognition error: {str(e)}", 'red')
                 logger.error("Speech recognition failed: %s", str(e))
@@ -157,6 +164,13 @@ class EdwardGUI:
             self.is_recording = False
             self.root.after(0, self._reset_record_button)
     
+    def _on_turn_stage(self, stage: str) -> None:
+        """Update the status bar as a voice turn moves through its stages."""
+        if stage == 'transcribe':
+            self.update_status("Processing your request...", 'blue')
+        elif stage == 'respond':
+            self.update_status("Responding...", 'blue')
+    
     def _update_chat(self, message: str) -> None:
         """Update the chat display with a new message."""
         try:
@@ -309,6 +323,7 @@ class EdwardGUI:
                 # Speak the response
                 from text_to_speech import speak
                 speak(response)
+                schedule_summary()
                 
             except ImportError as e:
                 self.update_status(f"Error: {str(e)}", 'red')
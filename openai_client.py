@@ -0,0 +1,112 @@
+"""
+Shared OpenAI clients for Edward Voice AI.
+Every turn reuses the same client and its keep-alive connection pool instead
+of paying client construction and connection/TLS setup each time.
+"""
+import logging
+import threading
+from typing import Any, Optional
+
+import httpx
+import openai
+
+from config import (
+    OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_TIMEOUT, OPENAI_CONNECT_TIMEOUT,
+    OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE_CONNECTIONS, OPENAI_KEEPALIVE_EXPIRY,
+    OPENAI_MAX_RETRIES
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_client: Optional[openai.OpenAI] = None
+_async_client: Optional[openai.AsyncOpenAI] = None
+
+def _limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async clients."""
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY
+    )
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(OPENAI_TIMEOUT, connect=OPENAI_CONNECT_TIMEOUT)
+
+def _client_options(overrides: dict) -> dict:
+    options = {
+        'api_key': OPENAI_API_KEY,
+        'base_url': OPENAI_BASE_URL,
+        'timeout': _timeout(),
+        'max_retries': OPENAI_MAX_RETRIES
+    }
+    options.update(overrides)
+    return options
+
+def create_client(**overrides: Any) -> openai.OpenAI:
+    """
+    Create a new OpenAI client with a pooled keep-alive HTTP client.
+
+    Args:
+        **overrides: OpenAI client options overriding the configured ones
+
+    Returns:
+        openai.OpenAI: A new client
+    """
+    http_client = openai.DefaultHttpxClient(limits=_limits(), timeout=_timeout())
+    return openai.OpenAI(http_client=http_client, **_client_options(overrides))
+
+def create_async_client(**overrides: Any) -> openai.AsyncOpenAI:
+    """
+    Create a new async OpenAI client with a pooled keep-alive HTTP client.
+
+    Args:
+        **overrides: OpenAI client options overriding the configured ones
+
+    Returns:
+        openai.AsyncOpenAI: A new client
+    """
+    http_client = openai.DefaultAsyncHttpxClient(limits=_limits(), timeout=_timeout())
+    return openai.AsyncOpenAI(http_client=http_client, **_client_options(overrides))
+
+def get_client() -> openai.OpenAI:
+    """
+    Get the shared OpenAI client, creating it on first use.
+
+    Raises:
+        openai.OpenAIError: If the client cannot be created (e.g. no API key)
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = create_client()
+                logger.debug("Created shared OpenAI client")
+    return _client
+
+def get_async_client() -> openai.AsyncOpenAI:
+    """
+    Get the shared async OpenAI client, creating it on first use.
+
+    The client's connection pool is bound to the event loop it is first used on.
+
+    Raises:
+        openai.OpenAIError: If the client cannot be created (e.g. no API key)
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = create_async_client()
+                logger.debug("Created shared async OpenAI client")
+    return _async_client
+
+def close_clients() -> None:
+    """Close the shared sync client; the async client is dropped for recreation."""
+    global _client, _async_client
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _async_client = None
@@ -0,0 +1,203 @@
+"""
+Text index for pre-recorded voice responses.
+Finds the clip whose transcript best matches a piece of text: exact matches
+come from a hash map of normalized transcripts, near matches are scored with
+word n-grams (single words and word pairs) looked up through an inverted
+index. With a confidence threshold only the query's rarest n-grams are
+looked up (prefix filtering), so a lookup touches a handful of clips even
+in large libraries.
+"""
+import heapq
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and drop punctuation and repeated whitespace."""
+    text = _NON_WORD.sub("", text.lower())
+    return _SPACE.sub(" ", text).strip()
+
+def ngrams(text: str, n: int = 2) -> Set[str]:
+    """Word n-grams of normalized text, from single words up to n words long."""
+    words = text.split()
+    grams = set(words)
+    for size in range(2, n + 1):
+        grams.update(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+    return grams
+
+class ResponseIndex:
+    """
+    Index of response dictionaries ({'file': ..., 'text': ...}) by transcript.
+
+    Confidence is the Dice coefficient of the transcripts' word n-gram sets
+    (1.0 for identical normalized text). It is symmetric, so a short query
+    does not match a long clip that merely contains it and a long answer
+    does not match a short clip it happens to contain.
+
+    Responses can be added and removed at any time (e.g. on a catalog
+    reload); lookups from other threads see either the old or new entry.
+    Removed positions are reused by later additions, so repeated reloads
+    do not grow the index.
+    """
+
+    def __init__(self, n: int = 2):
+        """
+        Initialize an empty index.
+
+        Args:
+            n: Longest word n-gram used for fuzzy matching
+        """
+        self.n = n
+        self.responses: List[Optional[Dict[str, str]]] = []  # None once removed
+        self._exact: Dict[str, Set[int]] = defaultdict(set)
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._grams: List[Set[str]] = []
+        self._sizes: List[int] = []
+        self._size_counts: Counter = Counter()  # Live responses per n-gram count
+        self._max_size = 0
+        self._free: List[int] = []  # Heap of removed positions
+        self._count = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, response: Dict[str, str]) -> int:
+        """
+        Index a response by its transcript.
+
+        Returns:
+            int: Position of the response in the index
+        """
+        text = normalize_text(response['text'])
+        grams = ngrams(text, self.n)
+
+        with self._lock:
+            if self._free:
+                position = heapq.heappop(self._free)
+                self._grams[position] = grams
+                self._sizes[position] = len(grams)
+                self.responses[position] = response
+            else:
+                position = len(self.responses)
+                self._grams.append(grams)
+                self._sizes.append(len(grams))
+                self.responses.append(response)
+            self._exact[text].add(position)
+            for gram in grams:
+                self._postings[gram].add(position)
+            self._size_counts[len(grams)] += 1
+            self._max_size = max(self._max_size, len(grams))
+            self._count += 1
+        return position
+
+    def remove(self, position: int) -> None:
+        """Remove the response at position (as returned by add)."""
+        with self._lock:
+            response = self.responses[position]
+            if response is None:
+                return
+            text = normalize_text(response['text'])
+            self._exact[text].discard(position)
+            if not self._exact[text]:
+                del self._exact[text]
+            for gram in self._grams[position]:
+                postings = self._postings[gram]
+                postings.discard(position)
+                if not postings:
+                    del self._postings[gram]
+            self.responses[position] = None
+            self._grams[position] = set()
+            size = self._sizes[position]
+            self._sizes[position] = 0
+            self._size_counts[size] -= 1
+            if not self._size_counts[size]:
+                del self._size_counts[size]
+                if size == self._max_size:
+                    self._max_size = max(self._size_counts, default=0)
+            heapq.heappush(self._free, position)
+            self._count -= 1
+
+    def match(self, text: str, min_confidence: float = 0.0) -> Optional[Tuple[Dict[str, str], float]]:
+        """
+        Find the response whose transcript best matches text.
+
+        Args:
+            text: Text to look up
+            min_confidence: Lowest acceptable confidence (0.0 to 1.0)
+
+        Returns:
+            tuple: (response, confidence) or None if nothing reaches min_confidence
+        """
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+
+        with self._lock:
+            return self._match(normalized, min_confidence)
+
+    def _match(self, normalized: str, min_confidence: float) -> Optional[Tuple[Dict[str, str], float]]:
+        positions = self._exact.get(normalized)
+        if positions:
+            return self.responses[min(positions)], 1.0
+
+        grams = ngrams(normalized, self.n)
+        size = len(grams)
+        # Dice <= 2 * min(a, b) / (a + b): texts much longer than every clip
+        # (e.g. a full LLM answer) cannot reach the threshold
+        if min_confidence > 0 and size * min_confidence > self._max_size * (2 - min_confidence):
+            return None
+
+        if min_confidence > 0:
+            scores = self._score_candidates(grams, min_confidence)
+        else:
+            scores = self._score_all(grams)
+
+        best, best_score = None, 0.0
+        for position, score in scores:
+            if score > best_score or (score == best_score and best is not None and position < best):
+                best, best_score = position, score
+
+        if best is None or best_score < min_confidence:
+            return None
+        return self.responses[best], best_score
+
+    def _score_all(self, grams: Set[str]):
+        """Score every clip sharing at least one n-gram with the query."""
+        size = len(grams)
+        shared = Counter()
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if postings:
+                shared.update(postings)
+        for position, count in shared.items():
+            yield position, 2 * count / (size + self._sizes[position])
+
+    def _score_candidates(self, grams: Set[str], min_confidence: float):
+        """
+        Score only clips that can reach min_confidence.
+
+        A clip reaching the threshold shares at least min_overlap n-grams with
+        the query, so it must contain one of the query's (size - min_overlap + 1)
+        rarest n-grams; only those posting lists are read.
+        """
+        size = len(grams)
+        # Small tolerance so clips scoring exactly min_confidence are kept
+        smallest = size * min_confidence / (2 - min_confidence) - 1e-9
+        largest = size * (2 - min_confidence) / min_confidence + 1e-9
+        min_overlap = math.ceil(smallest)
+
+        ordered = sorted(grams, key=lambda gram: len(self._postings.get(gram, ())))
+        candidates = set()
+        for gram in ordered[:size - min_overlap + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        for position in candidates:
+            other = self._sizes[position]
+            if smallest <= other <= largest:
+                yield position, 2 * len(grams & self._grams[position]) / (size + other)
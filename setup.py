@@ -37,6 +37,14 @@ setup(
         "python-dateutil>=2.8.2",
     ],
     extras_require={
+        # FLAC/Opus uploads for speech recognition
+        "compression": [
+            "soundfile>=0.12.1",
+        ],
+        # Offline speech recognition on the CPU
+        "offline": [
+            "faster-whisper>=1.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "black>=22.0.0",
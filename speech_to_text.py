@@ -1,18 +1,318 @@
+import io
+import logging
 import openai
 import os
-from typing import Optional
-from config import OPENAI_API_KEY, ConfigError
+import wave
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from config import (
+    OPENAI_API_KEY, ConfigError, STT_UPLOAD_FORMAT, STT_TRIM_SILENCE, STT_TRIM_PADDING_MS,
+    STT_CHUNK_MIN_SECONDS, STT_CHUNK_SECONDS, STT_CHUNK_MIN_PAUSE_MS, STT_CHUNK_OVERLAP_SECONDS,
+    STT_CHUNK_WORKERS
+)
+from openai_client import get_client
+
+# soundfile (libsndfile) encodes FLAC and OGG/Opus; without it uploads stay WAV
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except (ImportError, OSError):
+    SOUNDFILE_AVAILABLE = False
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# (soundfile format, subtype) per upload format
+_ENCODINGS = {
+    'flac': ('FLAC', 'PCM_16'),
+    'opus': ('OGG', 'OPUS'),
+}
+
+# Leading bytes of each upload format, and the file name that tells the API the format
+_UPLOAD_NAMES = (
+    (b"RIFF", "audio.wav"),
+    (b"fLaC", "audio.flac"),
+    (b"OggS", "audio.ogg"),
+)
+
+_warned_fallback = False
 
 class SpeechRecognitionError(Exception):
     """Custom exception for speech recognition errors."""
     pass
 
-def speech_to_text(audio_file: str) -> str:
+def _to_pcm16(audio: np.ndarray) -> np.ndarray:
+    if audio.dtype != np.int16:
+        audio = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    return audio
+
+def wav_bytes(audio: np.ndarray, sample_rate: int = 16000) -> bytes:
+    """
+    Encode mono audio as an in-memory 16-bit PCM WAV file.
+    
+    Args:
+        audio: Float samples in [-1, 1] or 16-bit PCM
+        sample_rate: Sample rate in Hz
+        
+    Returns:
+        bytes: The WAV file
+    """
+    audio = _to_pcm16(audio)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio.tobytes())
+    return buffer.getvalue()
+
+def encode_audio(audio: np.ndarray, sample_rate: int = 16000,
+                 audio_format: str = STT_UPLOAD_FORMAT) -> bytes:
+    """
+    Encode mono audio for upload.
+    
+    Args:
+        audio: Float samples in [-1, 1] or 16-bit PCM
+        sample_rate: Sample rate in Hz
+        audio_format: "wav", "flac" or "opus"; falls back to wav if soundfile is missing
+        
+    Returns:
+        bytes: The encoded file
+    """
+    encoding = _ENCODINGS.get(audio_format)
+    if encoding is None:
+        if audio_format != 'wav':
+            raise ValueError(f"Unknown upload format: {audio_format}")
+        return wav_bytes(audio, sample_rate)
+    if not SOUNDFILE_AVAILABLE:
+        global _warned_fallback
+        if not _warned_fallback:
+            logger.warning(f"soundfile is not installed; uploading wav instead of {audio_format}")
+            _warned_fallback = True
+        return wav_bytes(audio, sample_rate)
+    
+    buffer = io.BytesIO()
+    # Same samples as the WAV upload, so FLAC decodes to exactly what WAV would
+    soundfile.write(buffer, _to_pcm16(audio), sample_rate, format=encoding[0], subtype=encoding[1])
+    return buffer.getvalue()
+
+def _speech_frames(audio: np.ndarray, sample_rate: int) -> Tuple[np.ndarray, int]:
+    """Per-frame speech decisions and the frame length in samples."""
+    from vad import VoiceActivityDetector
+    
+    detector = VoiceActivityDetector(sample_rate, adaptive=False)
+    frames = detector.classify_frames(audio)
+    # Loud frames count too: cutting a word costs far more than sending silence
+    return frames.speech | (frames.rms > detector.energy_threshold), detector.samples_per_frame
+
+def trim_silence(audio: np.ndarray, sample_rate: int = 16000, padding_ms: float = STT_TRIM_PADDING_MS,
+                 leading: bool = True, trailing: bool = True) -> np.ndarray:
+    """
+    Cut the silence before the first and after the last speech frame.
+    
+    Speech is found by the VAD, or by energy where the VAD disagrees. Audio
+    without any speech frame is returned unchanged, so the recognizer still
+    gets to hear it.
+    
+    Args:
+        audio: Mono audio
+        sample_rate: Sample rate in Hz
+        padding_ms: Audio kept on each side of the speech
+        leading: Trim the start
+        trailing: Trim the end
+        
+    Returns:
+        np.ndarray: A view of the audio
+    """
+    speech_frames, frame = _speech_frames(audio, sample_rate)
+    speech = np.flatnonzero(speech_frames)
+    if len(speech) == 0:
+        return audio
+    padding = int(padding_ms * sample_rate / 1000)
+    start = max(0, speech[0] * frame - padding) if leading else 0
+    end = min(len(audio), (speech[-1] + 1) * frame + padding) if trailing else len(audio)
+    return audio[start:end]
+
+def split_at_pauses(audio: np.ndarray, sample_rate: int = 16000, chunk_seconds: float = STT_CHUNK_SECONDS,
+                    min_pause_ms: float = STT_CHUNK_MIN_PAUSE_MS,
+                    overlap_seconds: float = STT_CHUNK_OVERLAP_SECONDS) -> List[Tuple[int, int, bool]]:
+    """
+    Split audio into chunks of about chunk_seconds, cutting in pauses.
+    
+    Each chunk ends in the middle of the pause (a run of at least
+    min_pause_ms without speech) nearest chunk_seconds from its start, if
+    one lies between half and one and a half times that. If there is none,
+    the chunk is cut at chunk_seconds and the next one starts
+    overlap_seconds earlier, so a word at the cut is heard whole by one of
+    them.
+    
+    Args:
+        audio: Mono audio
+        sample_rate: Sample rate in Hz
+        chunk_seconds: Target chunk length
+        min_pause_ms: Shortest silence that counts as a pause
+        overlap_seconds: Audio shared by chunks cut outside a pause
+        
+    Returns:
+        list: (start, end, overlaps_previous) sample ranges covering the audio
+        
+    Raises:
+        ValueError: If overlap_seconds is not shorter than chunk_seconds
+    """
+    if not 0 <= overlap_seconds < chunk_seconds:
+        raise ValueError("overlap_seconds must be shorter than chunk_seconds")
+    
+    speech, frame = _speech_frames(audio, sample_rate)
+    # Middle frame of every pause
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], (~speech).astype(np.int8), [0]))))
+    starts, ends = edges[::2], edges[1::2]
+    middles = ((starts + ends) // 2)[ends - starts >= max(1, int(min_pause_ms / 1000 * sample_rate / frame))]
+    
+    target = int(chunk_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    chunks = []
+    start, overlapped = 0, False
+    while len(audio) - start > target * 3 // 2:
+        lo, hi = (start + target // 2) // frame, (start + target * 3 // 2) // frame
+        candidates = middles[(middles > lo) & (middles < hi)]
+        if len(candidates):
+            end = candidates[np.argmin(np.abs(candidates * frame - (start + target)))] * frame
+            chunks.append((start, end, overlapped))
+            start, overlapped = end, False
+        else:
+            end = start + target
+            chunks.append((start, end, overlapped))
+            start, overlapped = end - overlap, True
+    chunks.append((start, len(audio), overlapped))
+    return chunks
+
+def transcribe_chunked(audio: np.ndarray, sample_rate: int, transcribe: Callable[[np.ndarray], str],
+                       workers: int = STT_CHUNK_WORKERS, chunk_seconds: float = STT_CHUNK_SECONDS,
+                       **split_options) -> str:
+    """
+    Transcribe audio as chunks split at pauses, several at a time.
+    
+    Chunks are made longer than chunk_seconds where that lets every chunk
+    be sent at once: a second round of requests would cost another round
+    trip, more than the longer chunks do.
+    
+    Args:
+        audio: Mono audio
+        sample_rate: Sample rate in Hz
+        transcribe: Converts a chunk of audio to text
+        workers: Most chunks transcribed at once
+        chunk_seconds: Shortest target chunk length
+        **split_options: Passed to split_at_pauses
+        
+    Returns:
+        str: The chunks' texts joined, words repeated in overlapping chunks kept once
+        
+    Raises:
+        SpeechRecognitionError: If any chunk cannot be transcribed
+    """
+    from stt_stream import merge_transcripts
+    
+    chunk_seconds = max(chunk_seconds, len(audio) / sample_rate / workers)
+    chunks = split_at_pauses(audio, sample_rate, chunk_seconds, **split_options)
+    if len(chunks) == 1:
+        return transcribe(audio)
+    
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks)), thread_name_prefix="stt-chunk") as pool:
+        futures = [pool.submit(transcribe, audio[start:end]) for start, end, _ in chunks]
+        try:
+            texts = [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    
+    text = texts[0]
+    for (_, _, overlapped), chunk_text in zip(chunks[1:], texts[1:]):
+        text = merge_transcripts(text, chunk_text) if overlapped else " ".join(filter(None, (text, chunk_text)))
+    return text
+
+def transcribe_audio(audio: np.ndarray, sample_rate: int = 16000, trim: bool = STT_TRIM_SILENCE,
+                     audio_format: str = STT_UPLOAD_FORMAT, client: Optional[openai.OpenAI] = None) -> str:
+    """
+    Transcribe in-memory audio, trimmed and encoded as configured.
+    
+    Audio longer than STT_CHUNK_MIN_SECONDS is split at pauses and the
+    chunks are transcribed concurrently (see transcribe_chunked), so the
+    wait no longer grows with the length of the recording.
+    
+    Args:
+        audio: Mono audio, float in [-1, 1] or 16-bit PCM
+        sample_rate: Sample rate in Hz
+        trim: Cut leading and trailing silence first
+        audio_format: Upload encoding, see encode_audio
+        client: OpenAI client to use instead of the shared one
+        
+    Returns:
+        str: The transcribed text
+        
+    Raises:
+        SpeechRecognitionError: If there's an error during speech recognition
+    """
+    if trim:
+        audio = trim_silence(audio, sample_rate)
+    send = lambda chunk: transcribe_bytes(encode_audio(chunk, sample_rate, audio_format), client=client)
+    if len(audio) < STT_CHUNK_MIN_SECONDS * sample_rate:
+        return send(audio)
+    return transcribe_chunked(audio, sample_rate, send)
+
+def transcribe_bytes(data: bytes, filename: Optional[str] = None,
+                     client: Optional[openai.OpenAI] = None) -> str:
     """
-    Convert speech from an audio file to text using OpenAI's Whisper API.
+    Transcribe an in-memory audio file using OpenAI's Whisper API.
     
     Args:
-        audio_file: Path to the audio file to transcribe
+        data: The audio file's contents (any format Whisper accepts)
+        filename: Name sent with the upload; its extension tells the API the format.
+            Detected for WAV, FLAC and OGG when not given.
+        client: OpenAI client to use instead of the shared one
+        
+    Returns:
+        str: The transcribed text
+        
+    Raises:
+        SpeechRecognitionError: If there's an error during speech recognition
+    """
+    if filename is None:
+        filename = next((name for magic, name in _UPLOAD_NAMES if data.startswith(magic)), "audio.wav")
+    return _transcribe((filename, data), client)
+
+def transcribe_file(path, client: Optional[openai.OpenAI] = None) -> str:
+    """
+    Transcribe an audio file using OpenAI's Whisper API.
+    
+    Args:
+        path: Path to the audio file
+        client: OpenAI client to use instead of the shared one
+        
+    Returns:
+        str: The transcribed text
+        
+    Raises:
+        SpeechRecognitionError: If there's an error during speech recognition
+    """
+    with open(path, "rb") as file:
+        return _transcribe(file, client)
+
+def speech_to_text(audio_file, client: Optional[openai.OpenAI] = None) -> str:
+    """
+    Convert speech from an audio file to text.
+    
+    The configured engine (see stt_engines) does the work: OpenAI's Whisper
+    API, a local model, or OpenAI with the local model as fallback.
+    
+    Args:
+        audio_file: Path to the audio file to transcribe, or an in-memory
+            recording (anything with `samples` and `sample_rate`, such as
+            voice_input.Recording), which is handed over without touching the
+            disk (for OpenAI: trimmed and encoded as configured)
+        client: OpenAI client to use; sends the request to OpenAI directly,
+            bypassing the configured engine
         
     Returns:
         str: The transcribed text
@@ -22,24 +322,37 @@ def speech_to_text(audio_file: str) -> str:
         FileNotFoundError: If the audio file doesn't exist
         PermissionError: If there's no permission to read the audio file
     """
+    if client is not None:
+        from stt_engines import OpenAIEngine
+        engine = OpenAIEngine(client)
+    else:
+        from stt_engines import get_engine
+        engine = get_engine()
+    
+    if hasattr(audio_file, 'samples'):
+        return engine.transcribe(audio_file.samples, audio_file.sample_rate)
+    
     if not os.path.exists(audio_file):
         raise FileNotFoundError(f"Audio file not found: {audio_file}")
     
     if not os.access(audio_file, os.R_OK):
         raise PermissionError(f"No permission to read audio file: {audio_file}")
     
-    if not OPENAI_API_KEY:
+    return engine.transcribe_file(audio_file)
+
+def _transcribe(file, client: Optional[openai.OpenAI] = None) -> str:
+    """Send one transcription request; file is an open file or a (name, bytes) tuple."""
+    if client is None and not OPENAI_API_KEY:
         raise ConfigError("OpenAI API key is not configured")
     
     try:
-        with open(audio_file, "rb") as file:
-            transcript = openai.audio.transcriptions.create(
-                file=file,
-                model="whisper-1"
-            )
+        transcript = (client or get_client()).audio.transcriptions.create(
+            file=file,
+            model="whisper-1"
+        )
         return transcript.text
         
     except openai.OpenAIError as e:
-        raise SpeechRecognitionError(f"OpenAI API error: {str(e)}")
+        raise SpeechRecognitionError(f"OpenAI API error: {str(e)}") from e
     except Exception as e:
-        raise SpeechRecognitionError(f"Error in speech recognition: {str(e)}")
+        raise SpeechRecognitionError(f"Error in speech recognition: {str(e)}") from e
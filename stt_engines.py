@@ -0,0 +1,327 @@
+"""
+Speech recognition engines for Edward Voice AI.
+speech_to_text hands recordings to the engine selected by config: OpenAI's
+Whisper API, a Whisper model running locally on the CPU (faster-whisper),
+or OpenAI with the local model standing in while the network is down.
+The local model is loaded once and kept warm for the life of the process.
+"""
+import importlib.util
+import logging
+from abc import ABC, abstractmethod
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import openai
+
+from config import (
+    STT_ENGINE, STT_LOCAL_MODEL, STT_LOCAL_COMPUTE_TYPE, STT_LOCAL_THREADS, STT_LOCAL_BEAM_SIZE,
+    STT_OFFLINE_RETRY_SECONDS, STT_TRIM_SILENCE, OFFLINE_MODE, OFFLINE_MODEL_PATH, MODELS_DIR, DEFAULT_LANGUAGE,
+    ConfigError
+)
+from speech_to_text import SpeechRecognitionError, transcribe_audio, transcribe_file, trim_silence
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# faster-whisper (and CTranslate2 behind it) is only imported when the model
+# is loaded, so it adds nothing to start-up time
+LOCAL_ENGINE_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+
+# Whisper models take 16 kHz audio
+WHISPER_SAMPLE_RATE = 16000
+
+def resample(audio: np.ndarray, sample_rate: int, target_rate: int = WHISPER_SAMPLE_RATE) -> np.ndarray:
+    """Convert mono audio to float32 at target_rate (linear interpolation)."""
+    if audio.dtype == np.int16:
+        audio = audio.astype(np.float32) / 32768.0
+    else:
+        audio = audio.astype(np.float32, copy=False)
+    if sample_rate == target_rate or len(audio) == 0:
+        return audio
+    count = int(round(len(audio) * target_rate / sample_rate))
+    positions = np.arange(count) * (sample_rate / target_rate)
+    return np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+
+class STTEngine(ABC):
+    """Interface of a speech recognition engine."""
+
+    name = "engine"
+
+    @abstractmethod
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, trim: bool = STT_TRIM_SILENCE) -> str:
+        """
+        Transcribe in-memory mono audio.
+
+        Args:
+            audio: Mono audio, float in [-1, 1] or 16-bit PCM
+            sample_rate: Sample rate in Hz
+            trim: Cut leading and trailing silence first; callers that trim
+                the audio themselves pass False
+
+        Raises:
+            SpeechRecognitionError: If the audio cannot be transcribed
+        """
+
+    @abstractmethod
+    def transcribe_file(self, path: Union[str, Path]) -> str:
+        """
+        Transcribe an audio file.
+
+        Raises:
+            SpeechRecognitionError: If the audio cannot be transcribed
+        """
+
+    def warm_up(self) -> None:
+        """Do the one-time work (loading models, ...) before the first request."""
+
+class OpenAIEngine(STTEngine):
+    """OpenAI's Whisper API; audio is trimmed and encoded as configured."""
+
+    name = "openai"
+
+    def __init__(self, client: Optional[openai.OpenAI] = None):
+        """
+        Args:
+            client: OpenAI client to use instead of the shared one
+        """
+        self.client = client
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, trim: bool = STT_TRIM_SILENCE) -> str:
+        return transcribe_audio(audio, sample_rate, trim=trim, client=self.client)
+
+    def transcribe_file(self, path: Union[str, Path]) -> str:
+        return transcribe_file(path, client=self.client)
+
+class LocalWhisperEngine(STTEngine):
+    """
+    A Whisper model run on the CPU by faster-whisper.
+
+    The model is loaded on first use (or by warm_up()) and then shared by
+    all requests. OFFLINE_MODEL_PATH is used if it holds a model; otherwise
+    STT_LOCAL_MODEL is fetched into MODELS_DIR once and read from there.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        model: Optional[Union[str, Path]] = None,
+        compute_type: str = STT_LOCAL_COMPUTE_TYPE,
+        cpu_threads: int = STT_LOCAL_THREADS,
+        beam_size: int = STT_LOCAL_BEAM_SIZE,
+        language: Optional[str] = DEFAULT_LANGUAGE.split('-')[0].lower(),
+        local_files_only: bool = OFFLINE_MODE
+    ):
+        """
+        Args:
+            model: Model directory or name (defaults as described above)
+            compute_type: Weight quantization, e.g. "int8" or "float32"
+            cpu_threads: Threads used by the model (0: library default)
+            beam_size: Decoding beam size; 1 decodes greedily
+            language: Spoken language, or None to detect it per request
+            local_files_only: Never download the model
+        """
+        if model is None:
+            model = OFFLINE_MODEL_PATH if Path(OFFLINE_MODEL_PATH).is_dir() else STT_LOCAL_MODEL
+        self.model_name = str(model)
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.beam_size = beam_size
+        self.language = language
+        self.local_files_only = local_files_only
+        self.load_seconds = 0.0
+
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self):
+        """
+        Load the model (once).
+
+        Raises:
+            SpeechRecognitionError: If faster-whisper or the model is missing
+        """
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    if not LOCAL_ENGINE_AVAILABLE:
+                        raise SpeechRecognitionError(
+                            "Local speech recognition needs the faster-whisper package"
+                        )
+                    start = time.perf_counter()
+                    try:
+                        from faster_whisper import WhisperModel
+                        self._model = WhisperModel(
+                            self.model_name,
+                            device="cpu",
+                            compute_type=self.compute_type,
+                            cpu_threads=self.cpu_threads,
+                            download_root=str(MODELS_DIR),
+                            local_files_only=self.local_files_only
+                        )
+                    except Exception as e:
+                        raise SpeechRecognitionError(
+                            f"Could not load local speech model {self.model_name}: {e}"
+                        ) from e
+                    self.load_seconds = time.perf_counter() - start
+                    logger.info("Loaded local speech model %s in %.1fs", self.model_name, self.load_seconds)
+        return self._model
+
+    def warm_up(self) -> None:
+        """Load the model and run it once, so the first request pays no set-up."""
+        self.load()
+        self.transcribe(np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32))
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, trim: bool = STT_TRIM_SILENCE) -> str:
+        if trim:
+            audio = trim_silence(audio, sample_rate)
+        return self._run(resample(audio, sample_rate))
+
+    def transcribe_file(self, path: Union[str, Path]) -> str:
+        return self._run(str(path))
+
+    def _run(self, audio) -> str:
+        model = self.load()
+        try:
+            segments, _ = model.transcribe(
+                audio,
+                language=self.language,
+                beam_size=self.beam_size,
+                condition_on_previous_text=False
+            )
+            return "".join(segment.text for segment in segments).strip()
+        except Exception as e:
+            raise SpeechRecognitionError(f"Error in local speech recognition: {str(e)}") from e
+
+def is_network_error(error: BaseException) -> bool:
+    """True if a failed request could not reach the API (connection error or timeout)."""
+    while error is not None:
+        if isinstance(error, openai.APIConnectionError):
+            return True
+        error = error.__cause__
+    return False
+
+class FallbackEngine(STTEngine):
+    """
+    Uses the primary engine, and the fallback while the primary is unreachable.
+
+    After a network failure the fallback answers the failed request and every
+    request for retry_seconds; then the primary is tried again. Any other
+    error (a rejected request, bad audio) is raised as is. The fallback is
+    only loaded once it is first needed: warming it up front would load (or
+    download) a local model that a connected machine never uses.
+    """
+
+    name = "auto"
+
+    def __init__(self, primary: STTEngine, fallback: STTEngine,
+                 retry_seconds: float = STT_OFFLINE_RETRY_SECONDS):
+        """
+        Args:
+            primary: Engine normally used
+            fallback: Engine used while the primary is unreachable
+            retry_seconds: How long to stay on the fallback after a network failure
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_seconds = retry_seconds
+        self._offline_until = 0.0
+
+    @property
+    def offline(self) -> bool:
+        """True while requests go to the fallback."""
+        return time.monotonic() < self._offline_until
+
+    def transcribe(self, audio: np.ndarray, sample_rate: int = 16000, trim: bool = STT_TRIM_SILENCE) -> str:
+        return self._call(lambda engine: engine.transcribe(audio, sample_rate, trim))
+
+    def transcribe_file(self, path: Union[str, Path]) -> str:
+        return self._call(lambda engine: engine.transcribe_file(path))
+
+    def warm_up(self) -> None:
+        """Warm the primary engine; the fallback loads on its first request."""
+        self.primary.warm_up()
+
+    def _call(self, request) -> str:
+        if not self.offline:
+            try:
+                return request(self.primary)
+            except SpeechRecognitionError as e:
+                if not is_network_error(e):
+                    raise
+                logger.warning(
+                    "%s speech recognition unreachable (%s); using %s for %.0fs",
+                    self.primary.name, e, self.fallback.name, self.retry_seconds
+                )
+            except ConfigError as e:
+                logger.warning("%s speech recognition unavailable (%s); using %s",
+                               self.primary.name, e, self.fallback.name)
+            self._offline_until = time.monotonic() + self.retry_seconds
+        return request(self.fallback)
+
+def create_engine(kind: str = STT_ENGINE) -> STTEngine:
+    """
+    Create the engine selected by config.
+
+    OFFLINE_MODE always selects the local engine. "auto" without
+    faster-whisper installed is plain OpenAI.
+
+    Args:
+        kind: "openai", "local" or "auto"
+    """
+    if OFFLINE_MODE:
+        kind = "local"
+    if kind == "openai" or (kind == "auto" and not LOCAL_ENGINE_AVAILABLE):
+        return OpenAIEngine()
+    if kind == "local":
+        return LocalWhisperEngine()
+    if kind == "auto":
+        return FallbackEngine(OpenAIEngine(), LocalWhisperEngine())
+    raise ValueError(f"Unknown speech recognition engine: {kind}")
+
+_lock = threading.Lock()
+_engine: Optional[STTEngine] = None
+_warm_up_thread: Optional[threading.Thread] = None
+
+def get_engine() -> STTEngine:
+    """Get the shared engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = create_engine()
+                logger.debug("Speech recognition engine: %s", _engine.name)
+    return _engine
+
+def warm_up() -> bool:
+    """
+    Warm up the shared engine.
+
+    Returns:
+        bool: True if it is ready; failures are logged, not raised
+    """
+    engine = get_engine()
+    start = time.perf_counter()
+    try:
+        engine.warm_up()
+    except (SpeechRecognitionError, ConfigError) as e:
+        logger.warning("Speech recognition warm-up failed: %s", e)
+        return False
+    logger.info("Speech recognition (%s) warmed up in %.1fs", engine.name, time.perf_counter() - start)
+    return True
+
+def start_warm_up() -> None:
+    """Warm up the shared engine in a background thread (no-op if already started)."""
+    global _warm_up_thread
+    with _lock:
+        if _warm_up_thread is not None:
+            return
+        _warm_up_thread = threading.Thread(target=warm_up, name="stt-warm-up", daemon=True)
+    _warm_up_thread.start()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI transcription endpoint, for tests and benchmarks.
+
+Speech is replaced by a tone code: every word of VOCABULARY is a short tone
+at its own frequency, separated by silence. The server decodes uploaded WAV
+files back into words, so transcripts can be checked exactly, and answers
+after a configurable delay that models upload and inference time:
+
+    latency = (base + per_second * audio_seconds
+               + upload_bytes / uplink_bytes_per_second) * time_scale
+
+WAV uploads are always understood; FLAC and OGG need soundfile.
+
+Tones shorter than MIN_WORD_SECONDS (a word cut at a window edge) are not
+recognized, as a real recognizer would garble a half word.
+
+Usage:
+    python stt_stand_in.py [port]
+"""
+import email.parser
+import io
+import json
+import sys
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Sequence
+
+import numpy as np
+
+try:
+    import soundfile
+except (ImportError, OSError):
+    soundfile = None
+
+VOCABULARY = (
+    "please turn on the kitchen lights and set a timer for ten minutes then "
+    "remind me to call my sister about dinner tomorrow evening at seven"
+).split()
+WORD_SECONDS = 0.25
+GAP_SECONDS = 0.1
+MIN_WORD_SECONDS = 0.15
+BASE_FREQUENCY = 400.0
+FREQUENCY_STEP = 100.0
+FRAME_SECONDS = 0.01
+
+def word_frequency(word: str) -> float:
+    return BASE_FREQUENCY + FREQUENCY_STEP * VOCABULARY.index(word)
+
+def synthesize_words(words: Sequence[str], sample_rate: int = 16000, amplitude: float = 0.3) -> np.ndarray:
+    """Render words as tone-coded float32 audio."""
+    t = np.arange(int(WORD_SECONDS * sample_rate)) / sample_rate
+    ramp = np.minimum(1.0, np.minimum(t, t[::-1]) / 0.01)  # 10 ms fades avoid clicks
+    gap = np.zeros(int(GAP_SECONDS * sample_rate))
+    parts = []
+    for word in words:
+        parts.append(amplitude * ramp * np.sin(2 * np.pi * word_frequency(word) * t))
+        parts.append(gap)
+    return np.concatenate(parts).astype(np.float32) if parts else np.zeros(0, dtype=np.float32)
+
+def synthesize_phrases(words: Sequence[str], sample_rate: int = 16000, phrase_words: int = 6,
+                       pause_seconds: float = 0.4) -> np.ndarray:
+    """Render words as tone-coded audio, with a pause after every phrase_words words."""
+    pause = np.zeros(int(pause_seconds * sample_rate), dtype=np.float32)
+    parts = []
+    for i in range(0, len(words), phrase_words):
+        parts.append(synthesize_words(words[i:i + phrase_words], sample_rate))
+        parts.append(pause)
+    return np.concatenate(parts[:-1]) if parts else np.zeros(0, dtype=np.float32)
+
+def sentence(count: int, offset: int = 0) -> List[str]:
+    """A deterministic list of count words."""
+    return [VOCABULARY[(offset + i) % len(VOCABULARY)] for i in range(count)]
+
+def recognize(samples: np.ndarray, sample_rate: int) -> str:
+    """Decode tone-coded audio back into text."""
+    frame = int(FRAME_SECONDS * sample_rate)
+    count = len(samples) // frame
+    if count == 0:
+        return ""
+    rms = np.sqrt(np.mean(samples[:count * frame].reshape(count, frame) ** 2, axis=1))
+    active = np.concatenate(([False], rms > 0.02, [False]))
+    edges = np.flatnonzero(active[1:] != active[:-1])
+    words = []
+    for start, end in zip(edges[::2] * frame, edges[1::2] * frame):
+        if end - start < MIN_WORD_SECONDS * sample_rate:
+            continue
+        spectrum = np.abs(np.fft.rfft(samples[start:end]))
+        peak = np.argmax(spectrum) * sample_rate / (end - start)
+        index = int(round((peak - BASE_FREQUENCY) / FREQUENCY_STEP))
+        if 0 <= index < len(VOCABULARY):
+            words.append(VOCABULARY[index])
+    return " ".join(words)
+
+def decode_audio(data: bytes):
+    """Decode a WAV file, or FLAC/OGG if soundfile is installed, to (float samples, rate)."""
+    if data.startswith(b"RIFF"):
+        with wave.open(io.BytesIO(data), 'rb') as wf:
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            return pcm / 32768.0, wf.getframerate()
+    if soundfile is None:
+        raise ValueError("compressed audio needs the soundfile package")
+    samples, rate = soundfile.read(io.BytesIO(data), dtype='float32')
+    return samples, rate
+
+def _decode_upload(content_type: str, body: bytes) -> bytes:
+    """Return the uploaded file from a multipart/form-data body."""
+    message = email.parser.BytesParser().parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body
+    )
+    for part in message.get_payload():
+        if part.get_param('name', header='content-disposition') == 'file':
+            return part.get_payload(decode=True)
+    raise ValueError("no file in upload")
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers POST .../audio/transcriptions like the real endpoint."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            upload = _decode_upload(self.headers.get("Content-Type", ""), body)
+            samples, rate = decode_audio(upload)
+        except Exception as e:
+            self._reply(400, {"error": {"message": f"Invalid file: {e}"}})
+            return
+
+        seconds = len(samples) / rate
+        with server.lock:
+            server.requests += 1
+            server.upload_bytes += len(upload)
+            server.audio_seconds += seconds
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            delay = server.base + server.per_second * seconds
+            if server.uplink_bytes_per_second:
+                delay += len(body) / server.uplink_bytes_per_second
+            time.sleep(delay * server.time_scale)
+            text = recognize(samples, rate)
+        finally:
+            with server.lock:
+                server.active -= 1
+        self._reply(200, {"text": text})
+
+    def _reply(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StandInTranscriptionServer(ThreadingHTTPServer):
+    """
+    Stand-in server running in a background thread.
+
+    Point an OpenAI client at `url` (any API key works). `requests`,
+    `audio_seconds`, `upload_bytes` and `max_active` (peak concurrent
+    requests) are counted. uplink_bytes_per_second, if set, adds the time
+    the request body would take on a slow uplink.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, base: float = 0.0, per_second: float = 0.0, time_scale: float = 1.0,
+                 port: int = 0, uplink_bytes_per_second: float = 0.0):
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.base = base
+        self.per_second = per_second
+        self.time_scale = time_scale
+        self.uplink_bytes_per_second = uplink_bytes_per_second
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.audio_seconds = 0.0
+        self.upload_bytes = 0
+        self.active = 0
+        self.max_active = 0
+        self._thread = threading.Thread(target=self.serve_forever, name="stt-stand-in", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def close(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def main() -> int:
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    with StandInTranscriptionServer(port=port) as server:
+        print(f"Stand-in transcription server at {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Streaming speech recognition for Edward Voice AI.
+Overlapping windows of the recording are transcribed while the user is still
+talking, so at the end of speech only the last few seconds are left to send.
+
+Streaming is opt-in: the GUI and TurnPipeline record first and transcribe the
+whole recording. Call transcribe_while_recording, or pass a StreamingTranscriber's
+feed as record_until_silence's on_audio, to use it.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from config import STT_STREAM_WINDOW_SECONDS, STT_STREAM_OVERLAP_SECONDS
+from response_index import normalize_text
+from speech_to_text import trim_silence
+from stt_engines import get_engine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Tails shorter than this hold no words worth a request
+MIN_TAIL_SECONDS = 0.1
+
+def merge_transcripts(previous: str, new: str, max_overlap_words: int = 12) -> str:
+    """
+    Append the transcript of an overlapping window to the text so far.
+
+    Words heard in both windows are dropped from the new text: the longest
+    run of words that ends previous and starts new (ignoring case and
+    punctuation) is kept once. A word cut at the end of the earlier window
+    may have been misheard there, so a match that skips previous's last
+    word is accepted too.
+
+    Args:
+        previous: Text of the earlier windows
+        new: Text of the next window
+        max_overlap_words: Longest overlap looked for
+
+    Returns:
+        str: The combined text
+    """
+    previous_words, new_words = previous.split(), new.split()
+    if not previous_words or not new_words:
+        return " ".join(previous_words or new_words)
+
+    tail = [normalize_text(word) for word in previous_words[-max_overlap_words - 1:]]
+    head = [normalize_text(word) for word in new_words[:max_overlap_words]]
+    for dropped in (0, 1):
+        end = len(tail) - dropped
+        for size in range(min(end, len(head)), 0, -1):
+            if tail[end - size:end] == head[:size]:
+                kept = previous_words[:len(previous_words) - dropped]
+                return " ".join(kept + new_words[size:])
+    return " ".join(previous_words + new_words)
+
+class StreamingTranscriber:
+    """
+    Transcribes a recording in overlapping windows while it is being made.
+
+    feed() is called with recorded samples (see record_until_silence's
+    on_audio) and only copies them into a preallocated buffer, so it is safe
+    on the audio thread. A worker sends each window as soon as it has
+    filled; consecutive windows overlap by overlap_seconds and their texts
+    are merged into the partial hypothesis. If the worker falls behind, the
+    next window stretches to cover everything recorded so far.
+
+    finish() sends only the audio after the last window (plus the overlap)
+    and merges it, so the wait at the end of speech no longer grows with
+    the length of the utterance. If any window failed, the whole recording
+    is transcribed instead.
+    """
+
+    def __init__(
+        self,
+        transcribe: Optional[Callable[[np.ndarray], str]] = None,
+        sample_rate: int = 16000,
+        window_seconds: float = STT_STREAM_WINDOW_SECONDS,
+        overlap_seconds: float = STT_STREAM_OVERLAP_SECONDS,
+        max_duration: float = 120.0,
+        on_partial: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize the transcriber and start its worker.
+
+        Args:
+            transcribe: Converts mono float audio at sample_rate to text (defaults to
+                the configured engine, so the offline fallback applies to windows too)
+            sample_rate: Sample rate of the fed audio in Hz
+            window_seconds: Length of each transcribed window
+            overlap_seconds: Audio shared by consecutive windows
+            max_duration: Longest recording kept; later samples are dropped
+            on_partial: Called from the worker with the text so far after each window
+        """
+        if not 0 <= overlap_seconds < window_seconds:
+            raise ValueError("overlap_seconds must be shorter than window_seconds")
+
+        # Trimming is decided here (see _transcribe_range), not again by the engine
+        self.transcribe = transcribe or (lambda audio: get_engine().transcribe(audio, sample_rate, trim=False))
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.overlap = int(overlap_seconds * sample_rate)
+        self.on_partial = on_partial
+
+        self._audio = np.zeros(int(max_duration * sample_rate), dtype=np.float32)
+        self._length = 0
+        self._cond = threading.Condition()
+        self._finished = False
+        self._failed = False
+        self._next_start = 0  # Start of the next window
+        self._sent_end = 0  # End of the last window handed to the worker
+        self._text = ""
+
+        self.windows_sent = 0
+        self.tail_seconds = 0.0  # Audio sent by finish()
+        self.finish_seconds = 0.0  # Time finish() took
+
+        self._worker = threading.Thread(target=self._run, name="stt-stream", daemon=True)
+        self._worker.start()
+
+    @property
+    def partial(self) -> str:
+        """The text of the windows transcribed so far."""
+        with self._cond:
+            return self._text
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio fed so far."""
+        return self._length / self.sample_rate
+
+    def audio(self) -> np.ndarray:
+        """The audio fed so far (a view into the buffer)."""
+        return self._audio[:self._length]
+
+    def feed(self, samples: np.ndarray) -> None:
+        """Add recorded mono float samples."""
+        with self._cond:
+            if self._finished:
+                return
+            count = min(len(samples), len(self._audio) - self._length)
+            self._audio[self._length:self._length + count] = samples[:count]
+            self._length += count
+            if self._length >= self._next_start + self.window:
+                self._cond.notify()
+
+    def finish(self) -> str:
+        """
+        Stop streaming and return the final transcript.
+
+        Raises:
+            SpeechRecognitionError: If the remaining audio cannot be transcribed
+        """
+        start = time.perf_counter()
+        with self._cond:
+            self._finished = True
+            length = self._length
+            tail_start = max(0, self._sent_end - self.overlap) if self._sent_end else 0
+            failed = self._failed
+            self._cond.notify()
+
+        # The tail is sent while the last window may still be in flight
+        tail_text = ""
+        if not failed and length - tail_start >= MIN_TAIL_SECONDS * self.sample_rate:
+            self.tail_seconds = (length - tail_start) / self.sample_rate
+            tail_text = self._transcribe_range(tail_start, length, trim=True)
+        self._worker.join()
+
+        if self._failed:
+            logger.warning("Streaming transcription failed; transcribing the whole recording")
+            self.tail_seconds = length / self.sample_rate
+            text = self._transcribe_range(0, length, trim=True)
+        else:
+            text = merge_transcripts(self._text, tail_text)
+        self.finish_seconds = time.perf_counter() - start
+        return text
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._finished and self._length < self._next_start + self.window:
+                    self._cond.wait()
+                if self._finished:
+                    return
+                start, end = self._next_start, self._length  # Catch up if behind
+                self._sent_end = end
+                self._next_start = end - self.overlap
+
+            try:
+                text = self._transcribe_range(start, end)
+            except Exception as e:
+                logger.warning(f"Window transcription failed: {e}")
+                with self._cond:
+                    self._failed = True
+                return
+
+            with self._cond:
+                self._text = merge_transcripts(self._text, text)
+                self.windows_sent += 1
+                partial = self._text
+            if self.on_partial:
+                self.on_partial(partial)
+
+    def _transcribe_range(self, start: int, end: int, trim: bool = False) -> str:
+        audio = self._audio[start:end]
+        if trim:
+            # The start of a tail has to line up with the previous window;
+            # only audio from the beginning of the recording is trimmed at both ends
+            audio = trim_silence(audio, self.sample_rate, leading=start == 0)
+        return self.transcribe(audio)
+
+def transcribe_while_recording(
+    transcribe: Optional[Callable[[np.ndarray], str]] = None,
+    on_partial: Optional[Callable[[str], None]] = None,
+    **record_options
+) -> Optional[str]:
+    """
+    Record one utterance and transcribe it while it is being spoken.
+
+    Args:
+        transcribe: Converts mono float audio to text (defaults to the configured engine)
+        on_partial: Called with the text so far after each window
+        **record_options: Passed to vad.record_until_silence
+
+    Returns:
+        str: The transcript, or None if no speech was recorded
+    """
+    from vad import record_until_silence
+
+    sample_rate = record_options.get('sample_rate', 16000)
+    max_duration = record_options.get('max_duration', 30.0) or 120.0
+    streamer = StreamingTranscriber(transcribe, sample_rate, max_duration=max_duration,
+                                    on_partial=on_partial)
+    audio = record_until_silence(on_audio=streamer.feed, **record_options)
+    if len(audio) == 0:
+        streamer.finish()
+        return None
+    return streamer.finish()
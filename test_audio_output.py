@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent audio output engine.
+"""
+import io
+import sys
+import tempfile
+import time
+import wave
+import traceback
+
+from audio_output import AudioOutputEngine
+from audio_utils import AudioPlayer, decode_wav
+from clip_bank import Clip
+
+class FakeStream:
+    def __init__(self, log, delay, fail=False):
+        self.log = log
+        self.delay = delay
+        self.fail = fail
+        self.closed = False
+
+    def write(self, data):
+        time.sleep(self.delay)
+        if self.fail:
+            raise OSError("device unplugged")
+        self.log.append(data)
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+class FakePyAudio:
+    """Opens fake streams that record what is written to them."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.opened = []
+        self.log = []
+
+    def open(self, **kwargs):
+        stream = FakeStream(self.log, self.delay, self.fail)
+        self.opened.append((kwargs, stream))
+        return stream
+
+    def get_format_from_width(self, width):
+        return width
+
+def test_one_stream_for_back_to_back_clips():
+    """Consecutive clips share one open stream and play in order."""
+    print("Testing stream reuse...")
+    pa = FakePyAudio()
+    engine = AudioOutputEngine(lambda: pa, block_frames=4)
+    events = [engine.submit(bytes([i]) * 16, 2, 1, 22050) for i in range(5)]
+    assert all(event.wait(2) for event in events)
+
+    assert len(pa.opened) == 1
+    assert b"".join(pa.log) == b"".join(bytes([i]) * 16 for i in range(5))
+    assert engine.clips_played == 5
+    engine.close()
+    assert pa.opened[0][1].closed
+    print("✓ 5 clips, 1 stream")
+    return True
+
+def test_format_change_reopens_stream():
+    """A clip with a different sample rate gets a new stream."""
+    print("\nTesting format changes...")
+    pa = FakePyAudio()
+    engine = AudioOutputEngine(lambda: pa)
+    engine.play(b"\x00" * 8, 2, 1, 22050, timeout=2)
+    engine.play(b"\x00" * 8, 2, 1, 22050, timeout=2)
+    engine.play(b"\x00" * 8, 2, 1, 44100, timeout=2)
+    assert [kwargs['rate'] for kwargs, _ in pa.opened] == [22050, 44100]
+    assert pa.opened[0][1].closed
+    engine.close()
+    print("✓ Stream reopened only on format change")
+    return True
+
+def test_stop_drops_current_and_queued():
+    """stop() ends the current clip early and releases every waiter."""
+    print("\nTesting stop...")
+    pa = FakePyAudio(delay=0.01)
+    engine = AudioOutputEngine(lambda: pa, block_frames=1)
+    long_clip = engine.submit(b"\x00" * 2000, 2, 1, 22050)  # 1000 blocks, ~10 s
+    queued = engine.submit(b"\x01" * 20, 2, 1, 22050)
+    time.sleep(0.05)
+
+    engine.stop()
+    assert long_clip.wait(1) and queued.wait(1)
+    assert b"\x01" not in b"".join(pa.log)
+    assert len(pa.log) < 1000
+    assert not engine.busy
+
+    # The engine keeps working after a stop
+    assert engine.play(b"\x02" * 4, 2, 1, 22050, timeout=2)
+    assert pa.log[-1] == b"\x02" * 2
+    engine.close()
+    print(f"✓ Stopped after {len(pa.log) - 2} blocks")
+    return True
+
+def test_completion_event_without_polling():
+    """Waiters wake as soon as the last block is written."""
+    print("\nTesting completion signalling...")
+    pa = FakePyAudio(delay=0.02)
+    engine = AudioOutputEngine(lambda: pa, block_frames=1)
+    start = time.perf_counter()
+    assert engine.play(b"\x00" * 10, 2, 1, 22050, timeout=2)  # 5 blocks of 20 ms
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.18, elapsed
+    engine.close()
+    print(f"✓ Clip of 100ms finished after {elapsed * 1000:.0f}ms")
+    return True
+
+def test_device_failure_reported():
+    """A stream whose write raises fails the clip, and the play_* methods return False."""
+    print("\nTesting device failure...")
+    pa = FakePyAudio(fail=True)
+    engine = AudioOutputEngine(lambda: pa)
+    done = engine.submit(b"\x00" * 8, 2, 1, 22050)
+    assert done.wait(2) and done.failed and isinstance(done.error, OSError)
+    assert not engine.play(b"\x00" * 8, 2, 1, 22050, timeout=2)
+    assert engine.clips_played == 0
+
+    # The engine reopens the stream and plays once the device works again
+    pa.fail = False
+    assert engine.play(b"\x00" * 8, 2, 1, 22050, timeout=2)
+    engine.close()
+
+    player = AudioPlayer()
+    player._pyaudio = FakePyAudio(fail=True)
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(22050)
+        wf.writeframes(b"\x00" * 64)
+    sample_width, channels, rate, frames = decode_wav(buffer.getvalue())
+    assert not player.play_wav_bytes(buffer.getvalue())
+    assert not player.play_clip(Clip("x", bytes(frames), sample_width, channels, rate))
+    with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+        tmp.write(buffer.getvalue())
+        tmp.flush()
+        assert not player.play_audio_file(tmp.name)
+    player._pyaudio = FakePyAudio()
+    assert player.play_wav_bytes(buffer.getvalue())
+    player.engine.close()
+    player._pyaudio = None
+    print("✓ Failures returned as False")
+    return True
+
+def main():
+    """Run all audio output tests."""
+    tests = [
+        test_one_stream_for_back_to_back_clips,
+        test_format_change_reopens_stream,
+        test_stop_drops_current_and_queued,
+        test_completion_event_without_polling,
+        test_device_failure_reported,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory clip bank.
+"""
+import os
+import sys
+import tempfile
+import traceback
+import wave
+
+from clip_bank import ClipBank, clip_category
+
+def _write_clip(directory, name, frames=1000, rate=22050):
+    path = os.path.join(directory, name)
+    with wave.open(path, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(b"\x01\x00" * frames)
+    return path
+
+def test_preload_skips_lazy_categories():
+    """Regular categories are decoded up front; lazy ones on first use."""
+    print("Testing preload...")
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_clip(tmp, "anglo_greeting_001.wav")
+        _write_clip(tmp, "anglo_greeting_002.wav")
+        _write_clip(tmp, "anglo_safety_001.wav")
+        assert clip_category("anglo_emotion_calm_001.wav") == "emotion"
+
+        bank = ClipBank(tmp, max_bytes=1 << 20, lazy_categories=["safety"], preload=False)
+        assert bank.preload() == 2
+        assert bank.stats()['clips'] == 2
+
+        clip = bank.get("wav/anglo_greeting_001.wav")
+        assert clip.rate == 22050 and len(clip.frames) == 2000
+        assert bank.stats()['hits'] == 1
+
+        os.remove(os.path.join(tmp, "anglo_greeting_002.wav"))
+        assert bank.get("wav/anglo_greeting_002.wav") is not None  # Served from memory
+
+        assert bank.get("wav/anglo_safety_001.wav") is not None
+        assert bank.stats()['misses'] == 1
+
+    print("✓ Lazy category loaded on demand")
+    return True
+
+def test_memory_cap_evicts_least_recent():
+    """The bank stays under its cap by dropping the least recently played clips."""
+    print("\nTesting memory cap...")
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(5):
+            _write_clip(tmp, f"anglo_task_00{i}.wav", frames=500)  # 1000 bytes each
+        bank = ClipBank(tmp, max_bytes=3000, preload=False)
+        assert bank.preload() == 3
+        assert bank.size == 3000
+
+        bank.get("anglo_task_000.wav")  # Most recently used now
+        bank.get("anglo_task_004.wav")  # Loaded on demand, evicts task_001
+        stats = bank.stats()
+        assert stats['bytes'] <= 3000 and stats['clips'] == 3
+        names = [clip.name for clip in bank._clips.values()]
+        assert "anglo_task_001.wav" not in names
+        assert "anglo_task_000.wav" in names and "anglo_task_004.wav" in names
+
+    print("✓ Memory cap respected")
+    return True
+
+def test_invalid_clip_validated_once():
+    """A corrupt file is reported once and never re-read."""
+    print("\nTesting validation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "anglo_outro_001.wav"), 'wb') as f:
+            f.write(b"not a wav file")
+        bank = ClipBank(tmp, max_bytes=1 << 20, preload=False)
+        assert bank.preload() == 0
+        assert bank.get("anglo_outro_001.wav") is None
+        assert bank.stats()['invalid'] == 1
+        assert bank.get("anglo_missing_001.wav") is None
+
+    print("✓ Invalid clip skipped")
+    return True
+
+def test_changed_clip_reloaded():
+    """A clip replaced on disk, or moved to another directory, is decoded again."""
+    print("\nTesting changed clips...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_clip(tmp, "anglo_greeting_001.wav", frames=100)
+        bank = ClipBank(tmp, max_bytes=1 << 20, preload=False)
+        assert len(bank.get(path).frames) == 200
+
+        _write_clip(tmp, "anglo_greeting_001.wav", frames=300)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1_000_000))
+        assert len(bank.get(path).frames) == 600
+        assert bank.stats()['clips'] == 1 and bank.size == 600
+
+        # Same name, another directory (as after a manifest change)
+        other = os.path.join(tmp, "other")
+        os.mkdir(other)
+        moved = _write_clip(other, "anglo_greeting_001.wav", frames=50)
+        assert len(bank.get(moved).frames) == 100
+        assert len(bank.get(path).frames) == 600
+
+    print("✓ Changed clips decoded again")
+    return True
+
+def main():
+    """Run all clip bank tests."""
+    tests = [
+        test_preload_skips_lazy_categories,
+        test_memory_cap_evicts_least_recent,
+        test_invalid_clip_validated_once,
+        test_changed_clip_reloaded,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for token-budgeted context assembly.
+"""
+import sys
+import traceback
+
+from context_builder import ContextBuilder, TokenCounter, estimate_tokens
+
+CONTEXT = {"role": "system", "content": "Current time: Monday"}
+SYSTEM = {"role": "system", "content": "You are Anglo. Use the THOUGHTS/RESPONSE format."}
+EXAMPLES = [
+    {"role": "system", "content": "You are Anglo, a calm assistant."},
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hello, I'm Anglo."},
+    {"role": "user", "content": "Thank you."},
+    {"role": "assistant", "content": "You're welcome."},
+]
+
+def _history(turns, words=5):
+    history = [SYSTEM]
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i} " + "word " * words,
+                        "timestamp": "2026-01-01T00:00:00"})
+        history.append({"role": "assistant", "content": f"answer {i} " + "word " * words})
+    history.append({"role": "user", "content": "latest question"})
+    return history
+
+def test_everything_fits_small_session():
+    """A short session is sent in full, in order."""
+    print("Testing a short session...")
+    builder = ContextBuilder(budget=10_000, counter=TokenCounter(estimate_tokens))
+    history = _history(2)
+    messages = builder.build(CONTEXT, EXAMPLES, history)
+
+    assert messages[0] == CONTEXT
+    assert messages[1:1 + len(EXAMPLES)] == EXAMPLES
+    assert messages[-1]['content'] == "latest question"
+    assert len(messages) == 1 + len(EXAMPLES) + len(history)
+    assert all(set(m) == {'role', 'content'} for m in messages)
+
+    print("✓ All messages kept, extra keys stripped")
+    return True
+
+def test_budget_is_respected():
+    """Long sessions drop examples first and the oldest history next."""
+    print("\nTesting budget enforcement...")
+    counter = TokenCounter(estimate_tokens)
+    builder = ContextBuilder(budget=300, counter=counter)
+    history = _history(40, words=10)
+    messages = builder.build(CONTEXT, EXAMPLES, history)
+
+    assert builder.last_prompt_tokens <= 300
+    assert counter.count_all(messages) == builder.last_prompt_tokens
+    assert SYSTEM in messages, "Conversation system message must always be sent"
+    assert messages[-1]['content'] == "latest question"
+    assert not any(m['content'] == "Hello" for m in messages), "Examples should be dropped first"
+    assert any(m['content'].startswith("answer 39") for m in messages), "Newest history kept"
+    assert not any(m['content'].startswith("question 0 ") for m in messages), "Oldest history dropped"
+
+    print(f"✓ Prompt fits in {builder.last_prompt_tokens} tokens")
+    return True
+
+def test_examples_trimmed_by_pairs():
+    """Examples are compressed to whole pairs rather than dropped outright."""
+    print("\nTesting example compression...")
+    counter = TokenCounter(estimate_tokens)
+    history = [SYSTEM, {"role": "user", "content": "hi"}]
+    required = counter.count_all([CONTEXT, SYSTEM, history[-1]])
+    first_pair = sum(counter.count(m) for m in EXAMPLES[:3])
+
+    builder = ContextBuilder(budget=required + first_pair, counter=counter)
+    messages = builder.build(CONTEXT, EXAMPLES, history)
+    assert messages[1:4] == EXAMPLES[:3]
+    assert EXAMPLES[3] not in messages
+
+    print("✓ Examples trimmed to the pairs that fit")
+    return True
+
+def test_counts_are_cached():
+    """Each distinct message is only measured once."""
+    print("\nTesting token count caching...")
+    calls = []
+
+    def estimator(text):
+        calls.append(text)
+        return estimate_tokens(text)
+
+    builder = ContextBuilder(budget=10_000, counter=TokenCounter(estimator))
+    history = _history(5)
+    builder.build(CONTEXT, EXAMPLES, history)
+    first_calls = len(calls)
+    builder.build(CONTEXT, EXAMPLES, history)
+    assert len(calls) == first_calls, "Token counts were recomputed"
+
+    print("✓ Second build reused cached counts")
+    return True
+
+def main():
+    """Run all context builder tests."""
+    tests = [
+        test_everything_fits_small_session,
+        test_budget_is_respected,
+        test_examples_trimmed_by_pairs,
+        test_counts_are_cached,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
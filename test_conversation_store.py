@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for the append-only conversation store.
+"""
+import json
+import os
+import sys
+import tempfile
+import traceback
+
+from conversation_store import ConversationStore
+
+def _message(i):
+    return {"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}",
+            "timestamp": f"2026-01-01T00:00:{i:02d}"}
+
+def test_append_and_tail():
+    """Appended messages are read back from the tail only."""
+    print("Testing append and tail loading...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.jsonl")
+        store = ConversationStore(path, fsync_batch=3)
+        store.READ_BLOCK_SIZE = 64  # Force several backwards reads
+        for i in range(50):
+            store.append(_message(i))
+
+        tail = store.load_tail(5)
+        assert [m['content'] for m in tail] == [f"message {i}" for i in range(45, 50)]
+        store.close()
+
+        reopened = ConversationStore(path)
+        assert reopened.load_tail(100)[0]['content'] == "message 0"
+        assert len(reopened.load_tail(100)) == 50
+
+    print("✓ Tail matches the most recent messages")
+    return True
+
+def test_torn_write_is_skipped():
+    """A partially written last line does not break loading."""
+    print("\nTesting crash recovery...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.jsonl")
+        store = ConversationStore(path)
+        store.append(_message(0))
+        store.append(_message(1))
+        store.close()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"role": "user", "cont')
+
+        tail = ConversationStore(path).load_tail(10)
+        assert [m['content'] for m in tail] == ["message 0", "message 1"]
+
+    print("✓ Torn line skipped")
+    return True
+
+def test_append_after_torn_write():
+    """A message appended after a torn write is stored on a line of its own."""
+    print("\nTesting append after crash...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.jsonl")
+        store = ConversationStore(path)
+        store.append(_message(0))
+        store.close()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"role": "user", "cont')
+
+        store = ConversationStore(path)
+        store.append({"role": "user", "content": "new message"})
+        store.close()
+        tail = ConversationStore(path).load_tail(10)
+        assert [m['content'] for m in tail] == ["message 0", "new message"], tail
+
+        # A file holding nothing but a torn line
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"role": "assis')
+        store = ConversationStore(path)
+        store.append(_message(1))
+        store.close()
+        assert [m['content'] for m in ConversationStore(path).load_tail(10)] == ["message 1"]
+
+    print("✓ New message kept")
+    return True
+
+def test_compaction():
+    """The file is rewritten with only recent messages once it grows too large."""
+    print("\nTesting compaction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.jsonl")
+        store = ConversationStore(path, compact_bytes=2000, keep_on_compact=10)
+        for i in range(60):
+            store.append(_message(i))
+
+        assert os.path.getsize(path) < 2000
+        tail = store.load_tail(100)
+        assert tail[-1]['content'] == "message 59"
+        assert len(tail) < 60
+
+    print("✓ Log compacted and still appendable")
+    return True
+
+def test_legacy_migration():
+    """The old whole-file JSON history is converted once."""
+    print("\nTesting migration...")
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "conversation_history.json")
+        with open(legacy, 'w') as f:
+            json.dump([_message(i) for i in range(4)], f, indent=2)
+
+        path = os.path.join(tmp, "conversation_history.jsonl")
+        store = ConversationStore(path, legacy_path=legacy)
+        assert [m['content'] for m in store.load_tail(10)] == [f"message {i}" for i in range(4)]
+        assert not os.path.exists(legacy)
+        assert os.path.exists(legacy + ".migrated")
+
+        # A second start does not migrate again
+        assert not store.migrate_legacy(legacy)
+
+    print("✓ Legacy history migrated")
+    return True
+
+def main():
+    """Run all conversation store tests."""
+    tests = [
+        test_append_and_tail,
+        test_torn_write_is_skipped,
+        test_append_after_torn_write,
+        test_compaction,
+        test_legacy_migration,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for rolling conversation summarization.
+"""
+import os
+import sys
+import tempfile
+import threading
+import traceback
+
+from ai_brain import ConversationManager
+from conversation_summary import ConversationSummarizer
+
+def _conversation(summary_file, max_history=15):
+    conversation = ConversationManager(max_history=max_history, summary_file=summary_file)
+    conversation.conversation_history = conversation.conversation_history[:1]
+    conversation.running_summary = ""
+    return conversation
+
+def _add_turns(conversation, turns):
+    for i in range(turns):
+        conversation.add_message("user", f"question {i}")
+        conversation.add_message("assistant", f"[THOUGHTS: x] answer {i}")
+
+def test_folds_older_messages():
+    """Older messages are replaced by a summary; recent ones stay verbatim."""
+    print("Testing message folding...")
+    with tempfile.TemporaryDirectory() as tmp:
+        summary_file = os.path.join(tmp, "summary.json")
+        conversation = _conversation(summary_file)
+        _add_turns(conversation, 5)
+
+        summarizer = ConversationSummarizer(
+            conversation,
+            lambda previous, messages: f"{previous} folded {len(messages)}".strip(),
+            keep_recent=4,
+            batch_size=2
+        )
+        assert summarizer.run_once()
+
+        assert conversation.running_summary == "folded 6"
+        assert len(conversation.conversation_history) == 5  # system + 4 recent
+        assert conversation.conversation_history[-1]['content'].endswith("answer 4")
+
+        reloaded = ConversationManager(max_history=15, summary_file=summary_file)
+        assert reloaded.running_summary == "folded 6"
+
+    print("✓ Summary persisted and recent messages kept")
+    return True
+
+def test_evicted_messages_are_summarized():
+    """Messages trimmed by max_history are folded instead of lost."""
+    print("\nTesting evicted messages...")
+    with tempfile.TemporaryDirectory() as tmp:
+        conversation = _conversation(os.path.join(tmp, "summary.json"), max_history=2)
+        _add_turns(conversation, 4)
+        assert len(conversation.evicted_messages) == 4
+
+        seen = []
+        summarizer = ConversationSummarizer(
+            conversation,
+            lambda previous, messages: seen.extend(messages) or "summary",
+            keep_recent=4,
+            batch_size=1
+        )
+        assert summarizer.run_once()
+        assert seen[0]['content'] == "question 0"
+        assert conversation.evicted_messages == []
+
+    print("✓ Evicted messages folded into the summary")
+    return True
+
+def test_background_run_and_failures():
+    """Background runs never raise and failed runs keep the messages."""
+    print("\nTesting background summarization...")
+    with tempfile.TemporaryDirectory() as tmp:
+        conversation = _conversation(os.path.join(tmp, "summary.json"))
+        _add_turns(conversation, 5)
+        before = list(conversation.conversation_history)
+
+        def failing(previous, messages):
+            raise RuntimeError("service unavailable")
+
+        summarizer = ConversationSummarizer(conversation, failing, keep_recent=2, batch_size=1)
+        summarizer.schedule()
+        summarizer.wait(timeout=5)
+        assert summarizer.failures == 1
+        assert conversation.conversation_history == before
+
+        release = threading.Event()
+        def slow(previous, messages):
+            release.wait(5)
+            return "done"
+
+        summarizer.summarize = slow
+        summarizer.schedule()
+        summarizer.schedule()  # Coalesced with the run in progress
+        release.set()
+        summarizer.wait(timeout=5)
+        assert conversation.running_summary == "done"
+
+    print("✓ Failures are contained and runs coalesce")
+    return True
+
+def main():
+    """Run all summarization tests."""
+    tests = [
+        test_folds_older_messages,
+        test_evicted_messages_are_summarized,
+        test_background_run_and_failures,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the background diagnostic log writer.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import traceback
+from unittest import mock
+
+from utils.log_writer import BackgroundLogWriter
+
+def test_records_written_as_json_lines():
+    """Records end up as compact JSON lines in the right files."""
+    print("Testing JSON lines output...")
+    with tempfile.TemporaryDirectory() as tmp:
+        errors = os.path.join(tmp, "error_log.txt")
+        thoughts = os.path.join(tmp, "ai_thoughts.log")
+        writer = BackgroundLogWriter(flush_interval=0.01)
+        for i in range(10):
+            writer.write(errors, {'error_type': 'API Error', 'n': i})
+        writer.write(thoughts, {'thoughts': 'thinking'})
+        writer.flush(timeout=5)
+
+        with open(errors, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert [json.loads(line)['n'] for line in lines] == list(range(10))
+        assert lines[0] == '{"error_type":"API Error","n":0}'
+        with open(thoughts, encoding='utf-8') as f:
+            assert json.loads(f.read())['thoughts'] == 'thinking'
+        assert writer.stats()['written'] == 11
+        writer.close()
+
+    print("✓ Records written in order")
+    return True
+
+def test_backpressure_drops_instead_of_blocking():
+    """A stalled disk never blocks callers; overflow is counted."""
+    print("\nTesting backpressure...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "error_log.txt")
+        writer = BackgroundLogWriter(max_queue=5, batch_size=1, flush_interval=0)
+        stall = threading.Event()
+        original = writer._write_batch
+
+        def stalled_write(batch):
+            stall.wait(5)
+            original(batch)
+
+        with mock.patch.object(writer, '_write_batch', side_effect=stalled_write):
+            accepted = sum(writer.write(path, {'n': i}) for i in range(50))
+            stats = writer.stats()
+            stall.set()
+            writer.close()
+
+        assert accepted < 50
+        assert stats['dropped'] == 50 - accepted
+        with open(path, encoding='utf-8') as f:
+            assert len(f.read().splitlines()) == accepted
+
+    print(f"✓ {stats['dropped']} records dropped, {accepted} written")
+    return True
+
+def main():
+    """Run all log writer tests."""
+    tests = [
+        test_records_written_as_json_lines,
+        test_backpressure_drops_instead_of_blocking,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the manifest-driven pre-recorded response catalog.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+
+from voice_responses import VoiceResponses
+
+CLIPS = [
+    {"file": "wav/anglo_greeting_001.wav", "text": "Hello.", "category": "greetings"},
+    {"file": "wav/anglo_greeting_002.wav", "text": "Hi there.", "category": "greetings"},
+    {"file": "wav/anglo_emotion_calm_001.wav", "text": "Everything is under control.",
+     "category": "emotions", "emotion": "calm"},
+]
+
+def _write(path, clips):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"clips": clips}, f)
+    # Make sure the change is visible even on coarse mtime filesystems
+    stamp = time.time() + len(clips)
+    os.utime(path, (stamp, stamp))
+
+def test_builtin_catalog_without_manifest():
+    """Without a manifest the built-in responses are used."""
+    print("Testing built-in catalog...")
+    with tempfile.TemporaryDirectory() as tmp:
+        responses = VoiceResponses(os.path.join(tmp, "manifest.json"), watch=False)
+        assert responses.find_matching_response("Good morning")['file'] == 'wav/anglo_greeting_003.wav'
+        assert responses.get_emotion_response('calm') is not None
+
+        # The built-in catalog can be exported as a starting manifest
+        responses.save_manifest()
+        reloaded = VoiceResponses(os.path.join(tmp, "manifest.json"), watch=False)
+        assert len(reloaded.index) == len(responses.index)
+        assert reloaded.reloads == 1
+    print("✓ Built-in responses indexed and exported")
+    return True
+
+def test_manifest_reload_is_incremental():
+    """A changed manifest only adds and removes the clips that changed."""
+    print("\nTesting incremental reload...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.json")
+        _write(path, CLIPS)
+        responses = VoiceResponses(path, watch=False)
+        assert responses.find_matching_response("Good morning") is None
+        assert responses.get_emotion_response('calm')['text'] == "Everything is under control."
+        kept_position = responses._positions[("wav/anglo_greeting_001.wav", "Hello.")]
+
+        _write(path, CLIPS[:1] + [{"file": "wav/anglo_outro_003.wav", "text": "Goodbye.", "category": "outros"}])
+        assert responses.reload()
+        assert responses._positions[("wav/anglo_greeting_001.wav", "Hello.")] == kept_position
+        assert responses.find_matching_response("hi there") is None
+        assert responses.find_matching_response("goodbye")['file'] == "wav/anglo_outro_003.wav"
+        assert responses.get_emotion_response('calm') is None
+        assert len(responses.index) == 2
+
+        # Unchanged file: nothing to do
+        assert not responses.reload()
+    print("✓ Only changed clips re-indexed")
+    return True
+
+def test_invalid_manifest_keeps_catalog():
+    """A broken edit is logged and the previous catalog stays in use."""
+    print("\nTesting invalid manifest...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.json")
+        _write(path, CLIPS)
+        responses = VoiceResponses(path, watch=False)
+        with open(path, 'w') as f:
+            f.write('{"clips": [')
+        os.utime(path, (time.time() + 60, time.time() + 60))
+        assert not responses.reload()
+        assert responses.find_matching_response("hello") is not None
+    print("✓ Previous catalog kept")
+    return True
+
+def test_watcher_picks_up_changes():
+    """The watch thread reloads the manifest without a restart."""
+    print("\nTesting hot reload...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "manifest.json")
+        _write(path, CLIPS)
+        responses = VoiceResponses(path, watch=True, poll_interval=0.02)
+        try:
+            _write(path, CLIPS + [{"file": "wav/anglo_task_001.wav", "text": "Let's plan your day.",
+                                   "category": "tasks"}])
+            deadline = time.time() + 2
+            while responses.reloads < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert responses.find_matching_response("let's plan your day")['file'] == "wav/anglo_task_001.wav"
+            assert responses.get_random_response('tasks') is not None
+        finally:
+            responses.stop_watching()
+    print("✓ Manifest change picked up")
+    return True
+
+def main():
+    """Run all response catalog tests."""
+    tests = [
+        test_builtin_catalog_without_manifest,
+        test_manifest_reload_is_incremental,
+        test_invalid_manifest_keeps_catalog,
+        test_watcher_picks_up_changes,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Tests for the pre-recorded response index.
+"""
+import sys
+import traceback
+
+from response_index import ResponseIndex, normalize_text
+
+RESPONSES = [
+    {'file': 'wav/anglo_greeting_001.wav', 'text': "Hello."},
+    {'file': 'wav/anglo_greeting_002.wav', 'text': "Hi there."},
+    {'file': 'wav/anglo_assist_001.wav', 'text': "How can I help you?"},
+    {'file': 'wav/anglo_intro_001.wav', 'text': "Hello, I'm Edward, your personal assistant."},
+    {'file': 'wav/anglo_outro_004.wav', 'text': "Take care."},
+]
+
+def _index():
+    index = ResponseIndex()
+    for response in RESPONSES:
+        index.add(response)
+    return index
+
+def test_exact_match_ignores_case_and_punctuation():
+    """Normalized transcripts match exactly with full confidence."""
+    print("Testing exact matches...")
+    index = _index()
+    assert normalize_text("  Hello,   I'm EDWARD! ") == "hello im edward"
+    response, confidence = index.match("hi THERE!")
+    assert response['file'] == 'wav/anglo_greeting_002.wav'
+    assert confidence == 1.0
+    print("✓ Exact match found")
+    return True
+
+def test_near_match_scored():
+    """A slightly different phrasing matches with a confidence below 1."""
+    print("\nTesting fuzzy matches...")
+    response, confidence = _index().match("how can i help", min_confidence=0.8)
+    assert response['file'] == 'wav/anglo_assist_001.wav'
+    assert 0.8 <= confidence < 1.0
+    print(f"✓ Near match with confidence {confidence:.2f}")
+    return True
+
+def test_containment_alone_is_not_a_match():
+    """Neither a fragment nor a long answer matches a clip that only overlaps it."""
+    print("\nTesting containment...")
+    index = _index()
+    assert index.match("hello", 0.8)[0]['text'] == "Hello."  # Not the introduction
+    assert index.match("help", 0.8) is None
+    long_answer = ("Take care. Tomorrow you should start with the report, then reply "
+                   "to the emails, and finally review the budget before the meeting.")
+    assert index.match(long_answer, 0.8) is None
+    assert index.match("completely unrelated words", 0.8) is None
+    print("✓ Partial overlaps rejected")
+    return True
+
+def test_reload_reuses_positions():
+    """Removing and re-adding responses does not grow the index."""
+    print("\nTesting reload churn...")
+    index = ResponseIndex()
+    positions = [index.add(response) for response in RESPONSES]
+    long_clip = {'file': 'wav/anglo_story_001.wav', 'text': "Once upon a time there was a very long story told."}
+    for i in range(50):
+        position = index.add(long_clip)
+        assert index.match(long_clip['text'], 0.8)[0] is long_clip
+        index.remove(position)
+        # A reload that changed the first clip
+        index.remove(positions[0])
+        positions[0] = index.add(dict(RESPONSES[0], text=f"Hello number {i}."))
+
+    assert len(index) == len(RESPONSES)
+    assert len(index.responses) <= len(RESPONSES) + 1, len(index.responses)
+    # The long clip is gone, so the length pre-filter is as tight as before it
+    assert index._max_size == max(len(grams) for grams in index._grams)
+    assert index.match("Hello number 49.")[0]['file'] == RESPONSES[0]['file']
+    assert index.match("Take care.")[0]['file'] == 'wav/anglo_outro_004.wav'
+    print(f"✓ {len(index.responses)} slots after 50 reloads")
+    return True
+
+def main():
+    """Run all response index tests."""
+    tests = [
+        test_exact_match_ignores_case_and_punctuation,
+        test_near_match_scored,
+        test_containment_alone_is_not_a_match,
+        test_reload_reuses_positions,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming responses in ai_brain (sentence-by-sentence delivery).
+"""
+import sys
+import traceback
+from types import SimpleNamespace
+from unittest import mock
+
+ENVELOPE = (
+    "[THOUGHTS: The user is greeting me.]\n"
+    "[RESPONSE: Hello, I'm Anglo, your personal assistant. "
+    "How can I help you today? Let me know.]"
+)
+
+def _chunk(content):
+    """Build an object shaped like a streamed chat completion chunk."""
+    delta = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+def _feed_all(parser, text, step):
+    sentences = []
+    for i in range(0, len(text), step):
+        sentences.extend(parser.feed(text[i:i + step]))
+    sentences.extend(parser.finish())
+    return sentences
+
+def test_parser_strips_envelope():
+    """The envelope is removed no matter how the stream is chunked."""
+    print("Testing envelope stripping...")
+    from ai_brain import ResponseStreamParser
+
+    for step in (1, 4, 17, len(ENVELOPE)):
+        parser = ResponseStreamParser()
+        sentences = _feed_all(parser, ENVELOPE, step)
+        assert sentences == [
+            "Hello, I'm Anglo, your personal assistant.",
+            "How can I help you today?",
+            "Let me know.",
+        ], sentences
+        assert parser.thoughts == "The user is greeting me."
+        assert parser.response == " ".join(sentences)
+
+    print("✓ Envelope stripped and sentences split for every chunk size")
+    return True
+
+def test_parser_plain_text():
+    """Output without an envelope is spoken as-is."""
+    print("\nTesting plain text output...")
+    from ai_brain import ResponseStreamParser
+
+    parser = ResponseStreamParser()
+    sentences = _feed_all(parser, "Sure, here you go. That is all for now", 3)
+    assert sentences == ["Sure, here you go.", "That is all for now"], sentences
+
+    parser = ResponseStreamParser()
+    sentences = _feed_all(parser, "[THOUGHTS: never finished", 5)
+    assert sentences == ["[THOUGHTS: never finished"], sentences
+
+    print("✓ Plain and malformed output handled")
+    return True
+
+def test_first_sentence_before_stream_ends():
+    """The first sentence is yielded before the rest of the stream is read."""
+    print("\nTesting incremental delivery...")
+    import ai_brain
+
+    consumed = []
+
+    def chunks():
+        for piece in ("[RESPONSE: First sentence is here. ", "Second one follows.]"):
+            consumed.append(piece)
+            yield _chunk(piece)
+
+    client = mock.Mock()
+    client.chat.completions.create.return_value = chunks()
+
+    with mock.patch.object(ai_brain, 'get_client', return_value=client), \
+         mock.patch.object(ai_brain, '_log_thoughts'), \
+         mock.patch.object(ai_brain.conversation, 'store', None):
+        stream = ai_brain.stream_response("Tell me something")
+        first = next(stream)
+        assert first == "First sentence is here."
+        assert len(consumed) == 1, "Stream was read ahead of the first sentence"
+        rest = list(stream)
+
+    assert rest == ["Second one follows."], rest
+    assert client.chat.completions.create.call_args.kwargs['stream'] is True
+    last = ai_brain.conversation.conversation_history[-1]
+    assert last['role'] == 'assistant'
+
+    print("✓ Sentences delivered incrementally and response committed")
+    return True
+
+def main():
+    """Run all streaming tests."""
+    tests = [
+        test_parser_strips_envelope,
+        test_parser_plain_text,
+        test_first_sentence_before_stream_ends,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
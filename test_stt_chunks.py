@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for splitting long recordings at pauses and transcribing the chunks concurrently.
+"""
+import sys
+import traceback
+
+import numpy as np
+
+from openai_client import create_client
+from speech_to_text import (
+    SpeechRecognitionError, encode_audio, split_at_pauses, transcribe_audio, transcribe_bytes,
+    transcribe_chunked
+)
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_phrases, synthesize_words
+
+RATE = 16000
+
+def test_cuts_fall_in_pauses():
+    """Chunks end inside pauses and cover the audio without gaps or overlap."""
+    print("Testing pause splitting...")
+    audio = synthesize_phrases(sentence(60), RATE, phrase_words=6, pause_seconds=0.4)
+    chunks = split_at_pauses(audio, RATE, chunk_seconds=5.0)
+    assert len(chunks) > 2
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(audio)
+    for (_, end, _), (start, _, overlapped) in zip(chunks, chunks[1:]):
+        assert start == end and not overlapped
+        # The cut is in silence
+        assert np.max(np.abs(audio[end - 1600:end + 1600])) == 0, end / RATE
+    lengths = [(end - start) / RATE for start, end, _ in chunks]
+    assert all(4.0 <= length <= 6.0 for length in lengths[:-1]), lengths
+    print(f"✓ {len(audio) / RATE:.1f}s in {len(chunks)} chunks: " + ", ".join(f"{x:.1f}s" for x in lengths))
+    return True
+
+def test_cuts_without_pauses_overlap():
+    """Speech without pauses is still cut, with overlapping chunks."""
+    print("\nTesting splitting without pauses...")
+    audio = synthesize_words(sentence(60), RATE)
+    chunks = split_at_pauses(audio, RATE, chunk_seconds=5.0, overlap_seconds=1.0)
+    assert len(chunks) > 2
+    for (_, end, _), (start, _, overlapped) in zip(chunks, chunks[1:]):
+        assert overlapped and end - start == RATE
+    assert len(split_at_pauses(audio[:RATE * 7], RATE, chunk_seconds=5.0)) == 1
+
+    # An overlap as long as the chunk would never advance
+    for overlap in (5.0, 6.0):
+        try:
+            split_at_pauses(audio, RATE, chunk_seconds=5.0, overlap_seconds=overlap)
+            assert False, "overlap not rejected"
+        except ValueError:
+            pass
+    print(f"✓ {len(chunks)} overlapping chunks")
+    return True
+
+def test_chunks_transcribed_concurrently():
+    """Long audio is sent as concurrent requests and stitched back exactly."""
+    print("\nTesting concurrent chunk transcription...")
+    with StandInTranscriptionServer(base=0.2, per_second=0.02) as server:
+        client = create_client(api_key="test", base_url=server.url)
+        send = lambda chunk: transcribe_bytes(encode_audio(chunk, RATE), client=client)
+
+        words = sentence(72, offset=5)
+        audio = synthesize_phrases(words, RATE)
+        assert transcribe_chunked(audio, RATE, send, workers=3, chunk_seconds=4.0) == " ".join(words)
+        # One chunk per worker, all sent at once
+        assert server.requests == 3 and server.max_active == 3, (server.requests, server.max_active)
+
+        # No pauses: the overlap is de-duplicated
+        words = sentence(50, offset=2)
+        text = transcribe_chunked(synthesize_words(words, RATE), RATE, send, workers=4, chunk_seconds=4.0)
+        assert text == " ".join(words), text
+
+        # Short audio stays a single request
+        before = server.requests
+        words = sentence(8)
+        assert transcribe_audio(synthesize_words(words, RATE), RATE, client=client) == " ".join(words)
+        assert server.requests == before + 1
+        client.close()
+    print(f"✓ Up to {server.max_active} requests at once")
+    return True
+
+def test_failed_chunk_raises():
+    """One failed chunk fails the transcription."""
+    print("\nTesting chunk failure...")
+    calls = []
+
+    def transcribe(chunk):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            raise SpeechRecognitionError("OpenAI API error: server error")
+        return "words"
+
+    audio = synthesize_phrases(sentence(60), RATE)
+    try:
+        transcribe_chunked(audio, RATE, transcribe, workers=4, chunk_seconds=4.0)
+        assert False, "failure swallowed"
+    except SpeechRecognitionError:
+        pass
+    assert len(calls) > 1
+    print("✓ Error raised")
+    return True
+
+def main():
+    """Run all chunked transcription tests."""
+    tests = [
+        test_cuts_fall_in_pauses,
+        test_cuts_without_pauses_overlap,
+        test_chunks_transcribed_concurrently,
+        test_failed_chunk_raises,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
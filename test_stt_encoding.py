@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for trimming and compressing audio before transcription uploads.
+"""
+import io
+import sys
+import traceback
+import wave
+from unittest import mock
+
+import numpy as np
+
+import speech_to_text
+from openai_client import create_client
+from speech_to_text import encode_audio, transcribe_audio, trim_silence, wav_bytes
+from stt_stand_in import StandInTranscriptionServer, decode_audio, sentence, synthesize_words
+
+RATE = 16000
+
+def _utterance(words, lead=1.0, tail=1.0):
+    silence = lambda seconds: np.zeros(int(seconds * RATE), dtype=np.float32)
+    return np.concatenate((silence(lead), synthesize_words(words, RATE), silence(tail)))
+
+def test_trim_keeps_padded_speech():
+    """Silence around the speech is cut, keeping the configured padding."""
+    print("Testing silence trimming...")
+    words = sentence(5)
+    speech_seconds = len(synthesize_words(words, RATE)) / RATE
+    audio = _utterance(words)
+    trimmed = trim_silence(audio, RATE, padding_ms=200)
+    # The last word is followed by a 0.1 s gap that counts as silence
+    assert speech_seconds - 0.1 < len(trimmed) / RATE <= speech_seconds + 0.45, len(trimmed) / RATE
+    assert np.shares_memory(trimmed, audio)
+
+    kept_end = trim_silence(audio, RATE, padding_ms=200, leading=False)
+    assert len(kept_end) > len(trimmed) and kept_end[0] == audio[0]
+
+    silence = np.zeros(RATE, dtype=np.float32)
+    assert len(trim_silence(silence, RATE)) == RATE
+    print(f"✓ {len(audio) / RATE:.1f}s trimmed to {len(trimmed) / RATE:.1f}s")
+    return True
+
+def test_encodings():
+    """FLAC is lossless, Opus smaller still, WAV the fallback."""
+    print("\nTesting encodings...")
+    audio = _utterance(sentence(8), 0.2, 0.2)
+    audio += np.float32(0.002) * np.random.default_rng(0).standard_normal(len(audio)).astype(np.float32)
+    wav = encode_audio(audio, RATE, 'wav')
+    assert wav == wav_bytes(audio, RATE)
+
+    try:
+        encode_audio(audio, RATE, 'mp3')
+        assert False, "unknown format accepted"
+    except ValueError:
+        pass
+
+    with mock.patch.object(speech_to_text, 'SOUNDFILE_AVAILABLE', False):
+        assert encode_audio(audio, RATE, 'flac').startswith(b"RIFF")
+
+    if not speech_to_text.SOUNDFILE_AVAILABLE:
+        print("✓ WAV fallback (soundfile not installed, FLAC/Opus skipped)")
+        return True
+
+    flac = encode_audio(audio, RATE, 'flac')
+    opus = encode_audio(audio, RATE, 'opus')
+    assert flac.startswith(b"fLaC") and opus.startswith(b"OggS")
+    assert len(opus) < len(flac) < len(wav)
+
+    with wave.open(io.BytesIO(wav), 'rb') as wf:
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    decoded, rate = decode_audio(flac)
+    assert rate == RATE and np.array_equal(np.round(decoded * 32768), pcm)
+    print(f"✓ wav {len(wav)} bytes, flac {len(flac)}, opus {len(opus)}")
+    return True
+
+def test_upload_names_follow_format():
+    """The upload's file name tells the API which format it is."""
+    print("\nTesting upload names...")
+    sent = []
+    with mock.patch.object(speech_to_text, '_transcribe', lambda file, client=None: sent.append(file[0]) or ""):
+        speech_to_text.transcribe_bytes(b"RIFF....WAVE")
+        speech_to_text.transcribe_bytes(b"fLaC....")
+        speech_to_text.transcribe_bytes(b"OggS....")
+        speech_to_text.transcribe_bytes(b"ID3.....", filename="clip.mp3")
+    assert sent == ["audio.wav", "audio.flac", "audio.ogg", "clip.mp3"], sent
+    print("✓ Names detected")
+    return True
+
+def test_compressed_upload_transcribed():
+    """A trimmed, compressed upload still transcribes correctly."""
+    print("\nTesting compressed upload...")
+    words = sentence(10, offset=3)
+    audio = _utterance(words, 1.0, 1.5)
+    uploads = {}
+    with StandInTranscriptionServer() as server:
+        client = create_client(api_key="test", base_url=server.url)
+        for audio_format, trim in (('wav', False), ('flac', True), ('opus', True)):
+            before = server.upload_bytes
+            text = transcribe_audio(audio, RATE, trim=trim, audio_format=audio_format, client=client)
+            assert text == " ".join(words), (audio_format, text)
+            uploads[audio_format] = server.upload_bytes - before
+        client.close()
+    assert uploads['flac'] < uploads['wav']
+    print("✓ " + ", ".join(f"{name} {size} bytes" for name, size in uploads.items()))
+    return True
+
+def main():
+    """Run all upload encoding tests."""
+    tests = [
+        test_trim_keeps_padded_speech,
+        test_encodings,
+        test_upload_names_follow_format,
+        test_compressed_upload_transcribed,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the speech recognition engines and their selection.
+"""
+import sys
+import tempfile
+import traceback
+from unittest import mock
+
+import numpy as np
+
+import speech_to_text
+import stt_engines
+from openai_client import create_client
+from speech_to_text import SpeechRecognitionError
+from stt_engines import (
+    FallbackEngine, LocalWhisperEngine, OpenAIEngine, STTEngine, create_engine, resample
+)
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_words
+from voice_input import Recording
+
+RATE = 16000
+
+class FixedEngine(STTEngine):
+    """Answers every request with the same text and counts the requests."""
+
+    name = "fixed"
+
+    def __init__(self, text="offline text"):
+        self.text = text
+        self.calls = 0
+        self.warmed = False
+
+    def transcribe(self, audio, sample_rate=16000, trim=True):
+        self.calls += 1
+        self.trim = trim
+        return self.text
+
+    def transcribe_file(self, path):
+        self.calls += 1
+        return self.text
+
+    def warm_up(self):
+        self.warmed = True
+
+def _unreachable_client():
+    # Nothing listens on port 9; connecting fails at once
+    return create_client(api_key="test", base_url="http://127.0.0.1:9/v1", max_retries=0)
+
+def test_engine_selection():
+    """Config picks the engine; OFFLINE_MODE forces the local one."""
+    print("Testing engine selection...")
+    assert isinstance(create_engine("openai"), OpenAIEngine)
+    assert isinstance(create_engine("local"), LocalWhisperEngine)
+    with mock.patch.object(stt_engines, 'LOCAL_ENGINE_AVAILABLE', True):
+        engine = create_engine("auto")
+        assert isinstance(engine, FallbackEngine) and isinstance(engine.fallback, LocalWhisperEngine)
+    with mock.patch.object(stt_engines, 'LOCAL_ENGINE_AVAILABLE', False):
+        assert isinstance(create_engine("auto"), OpenAIEngine)
+    with mock.patch.object(stt_engines, 'OFFLINE_MODE', True):
+        assert isinstance(create_engine("openai"), LocalWhisperEngine)
+    try:
+        create_engine("other")
+        assert False, "unknown engine accepted"
+    except ValueError:
+        pass
+    try:
+        STTEngine()
+        assert False, "abstract engine created"
+    except TypeError:
+        pass
+    print("✓ Engines selected")
+    return True
+
+def test_fallback_while_offline():
+    """Network failures go to the fallback, which keeps serving until the retry time."""
+    print("\nTesting offline fallback...")
+    audio = synthesize_words(sentence(3), RATE)
+    client = _unreachable_client()
+    fallback = FixedEngine()
+    engine = FallbackEngine(OpenAIEngine(client), fallback, retry_seconds=60)
+    assert engine.transcribe(audio, RATE) == "offline text"
+    assert engine.offline and fallback.calls == 1
+
+    # While offline the primary is not tried again
+    with mock.patch.object(OpenAIEngine, 'transcribe', side_effect=AssertionError("primary tried")):
+        assert engine.transcribe(audio, RATE) == "offline text"
+    client.close()
+
+    # Once the retry time has passed, the primary answers again
+    words = sentence(4)
+    with StandInTranscriptionServer() as server:
+        client = create_client(api_key="test", base_url=server.url)
+        engine.primary = OpenAIEngine(client)
+        engine._offline_until = 0.0
+        assert engine.transcribe(synthesize_words(words, RATE), RATE) == " ".join(words)
+        client.close()
+    assert fallback.calls == 2 and not engine.offline
+    print("✓ Fell back and recovered")
+    return True
+
+def test_other_errors_not_hidden():
+    """A request the API rejects is an error, not a reason to go offline."""
+    print("\nTesting rejected request...")
+    fallback = FixedEngine()
+    primary = FixedEngine()
+    primary.transcribe = mock.Mock(side_effect=SpeechRecognitionError("OpenAI API error: invalid file"))
+    engine = FallbackEngine(primary, fallback)
+    try:
+        engine.transcribe(np.zeros(RATE, dtype=np.float32), RATE)
+        assert False, "error swallowed"
+    except SpeechRecognitionError:
+        pass
+    assert fallback.calls == 0 and not engine.offline
+
+    # The fallback is not loaded until it is needed
+    engine.warm_up()
+    assert primary.warmed and not fallback.warmed
+    print("✓ Error raised")
+    return True
+
+def test_speech_to_text_uses_engine():
+    """speech_to_text hands recordings and files to the configured engine."""
+    print("\nTesting engine routing...")
+    engine = FixedEngine("from engine")
+    with mock.patch.object(stt_engines, '_engine', engine):
+        assert speech_to_text.speech_to_text(Recording(np.zeros(RATE, dtype=np.float32), RATE)) == "from engine"
+        with tempfile.NamedTemporaryFile(suffix=".wav") as tmp:
+            assert speech_to_text.speech_to_text(tmp.name) == "from engine"
+    assert engine.calls == 2 and engine.trim
+
+    # Callers that trim themselves can say so through the fallback engine too
+    primary = FixedEngine()
+    FallbackEngine(primary, FixedEngine()).transcribe(np.zeros(RATE, dtype=np.float32), RATE, trim=False)
+    assert primary.trim is False
+    print("✓ Routed")
+    return True
+
+def test_local_engine_without_model():
+    """A missing local model is a SpeechRecognitionError, raised on first use."""
+    print("\nTesting local engine without a model...")
+    engine = LocalWhisperEngine(model="/nonexistent/model", local_files_only=True)
+    assert not engine.loaded
+    try:
+        engine.transcribe(np.zeros(RATE, dtype=np.float32), RATE)
+        assert False, "transcribed without a model"
+    except SpeechRecognitionError as e:
+        print(f"✓ {e}")
+    return True
+
+def test_resample():
+    """Audio reaches the local model as 16 kHz float32."""
+    print("\nTesting resampling...")
+    t = np.arange(48000) / 48000
+    tone = np.sin(2 * np.pi * 440 * t).astype(np.float32)
+    out = resample(tone, 48000)
+    assert out.dtype == np.float32 and len(out) == RATE
+    assert np.allclose(out[:100], np.sin(2 * np.pi * 440 * np.arange(100) / RATE), atol=1e-3)
+    pcm = (tone * 32767).astype(np.int16)
+    assert np.allclose(resample(pcm[:RATE], RATE), tone[:RATE], atol=1e-3)
+    print("✓ Resampled")
+    return True
+
+def main():
+    """Run all STT engine tests."""
+    tests = [
+        test_engine_selection,
+        test_fallback_while_offline,
+        test_other_errors_not_hidden,
+        test_speech_to_text_uses_engine,
+        test_local_engine_without_model,
+        test_resample,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
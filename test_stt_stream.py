@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming speech recognition, against the local stand-in server.
+"""
+import sys
+import time
+import traceback
+from unittest import mock
+
+import numpy as np
+
+import stt_engines
+from openai_client import create_client
+from speech_to_text import encode_audio, transcribe_bytes
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_words
+from stt_stream import StreamingTranscriber, merge_transcripts
+
+RATE = 16000
+
+def _feed(streamer, audio, block=1024, pause=0.0):
+    for i in range(0, len(audio), block):
+        streamer.feed(audio[i:i + block])
+        if pause:
+            time.sleep(pause)
+
+def test_merge_drops_repeated_words():
+    """Words heard in two overlapping windows are kept once."""
+    print("Testing transcript merging...")
+    assert merge_transcripts("turn on the kitchen", "the kitchen lights") == "turn on the kitchen lights"
+    assert merge_transcripts("Turn on the kitchen.", "Kitchen lights.") == "Turn on the kitchen. lights."
+    # The cut word at the end of the first window was misheard
+    assert merge_transcripts("set a timer fur", "timer for ten") == "set a timer for ten"
+    assert merge_transcripts("call my", "sister about") == "call my sister about"
+    assert merge_transcripts("", "hello") == "hello"
+    print("✓ Overlap removed")
+    return True
+
+def test_stream_matches_whole_transcript():
+    """Windows sent while talking add up to the full transcript."""
+    print("\nTesting streaming transcription...")
+    words = sentence(30)
+    audio = synthesize_words(words, RATE)
+    with StandInTranscriptionServer() as server:
+        client = create_client(api_key="test", base_url=server.url)
+        partials = []
+        streamer = StreamingTranscriber(
+            lambda audio: transcribe_bytes(encode_audio(audio, RATE), client=client), RATE,
+            window_seconds=3.0, overlap_seconds=1.0, max_duration=20, on_partial=partials.append
+        )
+        _feed(streamer, audio, pause=0.002)
+        text = streamer.finish()
+        client.close()
+
+    assert text == " ".join(words), text
+    assert streamer.windows_sent >= 3
+    assert partials and text.startswith(partials[-1])
+    assert streamer.tail_seconds < 3.5  # Only the tail was sent at the end
+    print(f"✓ {streamer.windows_sent} windows, {streamer.tail_seconds:.1f}s tail of "
+          f"{len(audio) / RATE:.1f}s, {server.requests} requests")
+    return True
+
+def test_short_utterance_single_request():
+    """An utterance shorter than a window is transcribed once, at the end."""
+    print("\nTesting short utterance...")
+    calls = []
+
+    def transcribe(audio):
+        calls.append(len(audio))
+        return "hello there"
+
+    streamer = StreamingTranscriber(transcribe, RATE, window_seconds=5.0, overlap_seconds=1.0, max_duration=10)
+    _feed(streamer, np.zeros(RATE * 2, dtype=np.float32))
+    assert streamer.finish() == "hello there"
+    assert len(calls) == 1 and streamer.windows_sent == 0
+    print("✓ One request")
+    return True
+
+def test_failed_window_falls_back_to_whole_recording():
+    """If a window request fails, the whole recording is transcribed at the end."""
+    print("\nTesting window failure...")
+    calls = []
+
+    def transcribe(audio):
+        calls.append(len(audio))
+        if len(calls) == 1:
+            raise RuntimeError("network down")
+        return "whole recording"
+
+    streamer = StreamingTranscriber(transcribe, RATE, window_seconds=1.0, overlap_seconds=0.2, max_duration=10)
+    _feed(streamer, np.zeros(RATE * 3, dtype=np.float32))
+    deadline = time.time() + 2
+    while not calls and time.time() < deadline:
+        time.sleep(0.01)
+    assert streamer.finish() == "whole recording"
+    assert streamer.tail_seconds == 3.0
+    print("✓ Fell back to the full recording")
+    return True
+
+def test_default_goes_through_engine():
+    """Without a transcribe callable, windows go to the configured engine; the fallback is trimmed."""
+    print("\nTesting engine routing...")
+    lengths = []
+
+    class FailingFirstEngine(stt_engines.STTEngine):
+        def transcribe(self, audio, sample_rate=16000, trim=True):
+            assert not trim, "trimmed twice"
+            lengths.append(len(audio))
+            if len(lengths) == 1:
+                raise RuntimeError("network down")
+            return "from engine"
+
+        def transcribe_file(self, path):
+            raise AssertionError("not a file")
+
+    silence = np.zeros(RATE, dtype=np.float32)
+    audio = np.concatenate((silence, synthesize_words(sentence(6), RATE), silence))
+    with mock.patch.object(stt_engines, '_engine', FailingFirstEngine()):
+        streamer = StreamingTranscriber(None, RATE, window_seconds=1.5, overlap_seconds=0.5, max_duration=10)
+        _feed(streamer, audio)
+        deadline = time.time() + 2
+        while not lengths and time.time() < deadline:
+            time.sleep(0.01)
+        assert streamer.finish() == "from engine"
+    # The whole-recording fallback lost the second of silence at both ends
+    assert lengths[-1] < len(audio) - 1.5 * RATE, (lengths[-1], len(audio))
+    print(f"✓ Sent {lengths[-1] / RATE:.1f}s of {len(audio) / RATE:.1f}s")
+    return True
+
+def main():
+    """Run all streaming STT tests."""
+    tests = [
+        test_merge_drops_repeated_words,
+        test_stream_matches_whole_transcript,
+        test_short_utterance_single_request,
+        test_failed_window_falls_back_to_whole_recording,
+        test_default_goes_through_engine,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed TTS audio cache.
+"""
+import os
+import sys
+import tempfile
+import time
+import traceback
+
+from tts_cache import TTSCache
+
+def test_key_depends_on_voice_and_settings():
+    """Keys change with any input that changes the audio."""
+    print("Testing cache keys...")
+    base = TTSCache.make_key("Hello.", "voice-1", "model", {'stability': 0.7})
+    assert base == TTSCache.make_key("Hello.", "voice-1", "model", {'stability': 0.7})
+    assert base != TTSCache.make_key("Hello!", "voice-1", "model", {'stability': 0.7})
+    assert base != TTSCache.make_key("Hello.", "voice-2", "model", {'stability': 0.7})
+    assert base != TTSCache.make_key("Hello.", "voice-1", "other", {'stability': 0.7})
+    assert base != TTSCache.make_key("Hello.", "voice-1", "model", {'stability': 0.8})
+
+    print("✓ Keys are stable and content-addressed")
+    return True
+
+def test_hits_misses_and_persistence():
+    """Clips survive a restart and counters track hits and misses."""
+    print("\nTesting hits, misses and persistence...")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TTSCache(cache_dir, max_bytes=1024)
+        key = TTSCache.make_key("I'm always here to help.", "voice", "model")
+
+        assert cache.get(key) is None
+        cache.put(key, b"audio-bytes")
+        assert cache.get(key) == b"audio-bytes"
+        assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+        assert cache.stats()['memory_hits'] == 1
+
+        reopened = TTSCache(cache_dir, max_bytes=1024)
+        assert reopened.get(key) == b"audio-bytes"
+        assert reopened.stats()['memory_hits'] == 0
+
+    print("✓ Disk tier persists across instances")
+    return True
+
+def test_lru_eviction():
+    """The least recently used clip is evicted when over the size cap."""
+    print("\nTesting LRU eviction...")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TTSCache(cache_dir, max_bytes=30, memory_items=0)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.put("c", b"x" * 10)
+        assert cache.get("a") is not None  # "b" is now the oldest
+        cache.put("d", b"x" * 10)
+
+        assert cache.get("b") is None
+        assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+        assert cache.stats()['evictions'] == 1
+        assert cache.stats()['bytes'] == 30
+        assert len(os.listdir(cache_dir)) == 3
+
+        # Recency on disk is restored on the next start
+        time.sleep(0.01)
+        os.utime(os.path.join(cache_dir, "c" + TTSCache.SUFFIX))
+        reopened = TTSCache(cache_dir, max_bytes=20)
+        assert reopened.get("c") is not None
+
+    print("✓ Oldest clips evicted first")
+    return True
+
+def main():
+    """Run all TTS cache tests."""
+    tests = [
+        test_key_depends_on_voice_and_settings,
+        test_hits_misses_and_persistence,
+        test_lru_eviction,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
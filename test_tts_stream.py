@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming TTS playback.
+"""
+import sys
+import threading
+import time
+import traceback
+
+from tts_stream import JitterBuffer, PCMDecoder, StreamingPlayer
+
+RATE = 8000  # 16 bytes per millisecond of 16-bit mono audio
+
+class FakeOutput:
+    """Records writes instead of playing them."""
+
+    def __init__(self):
+        self.writes = []
+        self.closed = False
+
+    def write(self, data):
+        self.writes.append((time.perf_counter(), data))
+
+    def close(self):
+        self.closed = True
+
+def _player(jitter_ms, output):
+    return StreamingPlayer(RATE, jitter_ms=jitter_ms, block_ms=10,
+                           open_output=lambda rate, width, channels: output)
+
+def test_decoder_keeps_whole_frames():
+    """Chunks split mid-sample are reassembled into whole frames."""
+    print("Testing PCM decoder...")
+    decoder = PCMDecoder(sample_width=2, channels=1)
+    pieces = [decoder.feed(chunk) for chunk in (b"\x01", b"\x02\x03", b"\x04\x05\x06\x07")]
+    assert pieces == [b"", b"\x01\x02", b"\x03\x04\x05\x06"]
+    assert all(len(piece) % 2 == 0 for piece in pieces)
+    print("✓ Partial samples carried over")
+    return True
+
+def test_playback_starts_before_stream_ends():
+    """The first sound is played while later chunks are still arriving."""
+    print("\nTesting time to first sound...")
+    output = FakeOutput()
+    finished = []
+
+    def slow_chunks():
+        for _ in range(10):
+            time.sleep(0.03)
+            yield b"\x00" * 16 * 50  # 50 ms of audio every 30 ms
+        finished.append(time.perf_counter())
+
+    start = time.perf_counter()
+    stats = _player(100, output).play(slow_chunks())
+
+    first_write = output.writes[0][0]
+    assert first_write < finished[0]
+    assert stats['first_sound'] < 0.2
+    assert abs(stats['duration'] - 0.5) < 1e-6
+    assert sum(len(data) for _, data in output.writes) == 16 * 500
+    assert output.closed
+    print(f"✓ First sound after {(first_write - start) * 1000:.0f}ms, "
+          f"stream finished after {(finished[0] - start) * 1000:.0f}ms")
+    return True
+
+def test_jitter_buffer_prebuffers_and_counts_underruns():
+    """Reads wait for the target, and running dry mid-stream is an underrun."""
+    print("\nTesting jitter buffer...")
+    buffer = JitterBuffer(target_bytes=32)
+    buffer.put(b"a" * 40)
+    assert buffer.read(16) == b"a" * 16
+    assert buffer.read(16) == b"a" * 16
+    assert buffer.underruns == 0
+
+    # Only 8 bytes left: the next read is an underrun and waits for the target again
+    refill = threading.Timer(0.05, buffer.put, args=(b"b" * 24,))
+    refill.start()
+    assert buffer.read(16) == b"a" * 8 + b"b" * 8
+    assert buffer.underruns == 1
+    buffer.put(b"c" * 8)
+    buffer.close()
+    assert buffer.read(64) == b"b" * 16 + b"c" * 8
+    assert buffer.read(16) == b""
+    print(f"✓ {buffer.underruns} underrun(s) counted")
+    return True
+
+def test_stream_error_plays_received_audio_then_raises():
+    """Audio received before a network error is still played."""
+    print("\nTesting stream errors...")
+    output = FakeOutput()
+
+    def failing_chunks():
+        yield b"\x00" * 320
+        raise ConnectionError("stream dropped")
+
+    try:
+        _player(10, output).play(failing_chunks())
+        raise AssertionError("error was swallowed")
+    except ConnectionError:
+        pass
+    assert sum(len(data) for _, data in output.writes) == 320
+    print("✓ Partial audio played, error raised")
+    return True
+
+def main():
+    """Run all streaming playback tests."""
+    tests = [
+        test_decoder_keeps_whole_frames,
+        test_playback_starts_before_stream_ends,
+        test_jitter_buffer_prebuffers_and_counts_underruns,
+        test_stream_error_plays_received_audio_then_raises,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
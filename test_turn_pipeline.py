@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tests for the pipelined turn engine.
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import wave
+from unittest import mock
+
+import audio_utils
+from audio_utils import AudioPlayer
+from turn_pipeline import TurnPipeline
+
+def _pipeline(events, sentences=3, fail_on=None):
+    """Build a pipeline that records the order in which stages run."""
+    def respond(user_text):
+        for i in range(sentences):
+            time.sleep(0.02)
+            events.append(('generated', i))
+            yield f"Sentence {i}."
+
+    def synthesize(text):
+        index = int(text.split()[1].rstrip('.'))
+        if index == fail_on:
+            raise RuntimeError("synthesis failed")
+        events.append(('synthesize_start', index))
+        time.sleep(0.02 * text.count('.'))
+        return text.encode()
+
+    def play(audio):
+        index = int(audio.split()[1].rstrip(b'.'))
+        events.append(('play_start', index))
+        time.sleep(0.05 * audio.count(b'.'))
+        events.append(('play_end', index))
+
+    return TurnPipeline(
+        record=lambda: "voice.wav",
+        transcribe=lambda path: "hello",
+        respond=respond,
+        synthesize=synthesize,
+        play=play
+    )
+
+def test_playback_overlaps_synthesis():
+    """Sentence 1 is synthesized while sentence 0 is playing."""
+    print("Testing stage overlap...")
+    events = []
+    result = _pipeline(events).run()
+
+    assert result.transcript == "hello"
+    assert result.response == "Sentence 0. Sentence 1. Sentence 2."
+    assert events.index(('synthesize_start', 1)) < events.index(('play_end', 0)), events
+    assert [e for e in events if e[0] == 'play_start'] == [('play_start', i) for i in range(3)]
+    for key in ('record', 'transcribe', 'first_sentence', 'first_playback', 'total'):
+        assert key in result.timings, key
+
+    print("✓ Synthesis overlaps playback and clips play in order")
+    return True
+
+def test_pipelined_faster_than_serial():
+    """The pipelined turn finishes before the serial one."""
+    print("\nTesting latency against the serial path...")
+    serial = _pipeline([]).run(pipelined=False)
+    pipelined = _pipeline([]).run()
+
+    assert serial.response == pipelined.response
+    assert pipelined.timings['first_playback'] < serial.timings['first_playback']
+    assert pipelined.timings['total'] < serial.timings['total']
+
+    print(f"✓ Pipelined {pipelined.timings['total'] * 1000:.0f}ms "
+          f"vs serial {serial.timings['total'] * 1000:.0f}ms")
+    return True
+
+def test_errors_propagate_without_deadlock():
+    """A failing stage stops the turn and its error reaches the caller."""
+    print("\nTesting error propagation...")
+    pipeline = _pipeline([], sentences=6, fail_on=1)
+
+    outcome = {}
+    def run():
+        try:
+            pipeline.run()
+        except RuntimeError as e:
+            outcome['error'] = e
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive(), "Pipeline deadlocked"
+    assert 'error' in outcome
+
+    print("✓ Synthesis error raised from run()")
+    return True
+
+def test_nothing_recorded():
+    """No recording short-circuits the turn."""
+    print("\nTesting empty recording...")
+    pipeline = TurnPipeline(
+        record=lambda: None,
+        transcribe=lambda path: "unused",
+        respond=lambda text: iter(()),
+        synthesize=lambda text: b"",
+        play=lambda audio: None
+    )
+    result = pipeline.run()
+    assert result.audio_file is None and result.transcript is None
+
+    print("✓ Turn ends without transcription")
+    return True
+
+def test_matching_sentence_plays_clip():
+    """A sentence with a pre-recorded clip plays the clip instead of being synthesized."""
+    print("\nTesting pre-recorded clips...")
+    clip = {'file': 'wav/ready.wav', 'text': 'Sentence 1.'}
+    events = []
+    pipeline = _pipeline(events)
+    pipeline.match = lambda text: clip if text == clip['text'] else None
+    pipeline.play_clip = lambda response: events.append(('clip', response['file'])) or True
+    pipeline.run()
+
+    assert ('synthesize_start', 1) not in events, events
+    starts = [e for e in events if e[0] in ('play_start', 'clip')]
+    assert starts == [('play_start', 0), ('clip', clip['file']), ('play_start', 2)], starts
+
+    # A clip that fails to play is synthesized after all
+    events.clear()
+    pipeline.play_clip = lambda response: False
+    pipeline.run()
+    assert ('synthesize_start', 1) in events and ('play_start', 1) in events, events
+    print("✓ Clip played without synthesis")
+    return True
+
+class _FailingDevice:
+    """PyAudio stand-in whose output streams raise on write."""
+
+    def open(self, **kwargs):
+        return self
+
+    def get_format_from_width(self, width):
+        return width
+
+    def write(self, data):
+        raise OSError("device unplugged")
+
+    def stop_stream(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_clip_device_failure_synthesizes():
+    """A clip the output device fails to play (via play_response) is synthesized instead."""
+    print("\nTesting clip playback failure...")
+    player = AudioPlayer()
+    player._pyaudio = _FailingDevice()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "one.wav")
+        with wave.open(path, 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(22050)
+            wf.writeframes(b"\x00" * 64)
+        clip = {'file': path, 'text': 'Sentence 1.'}
+
+        events = []
+        pipeline = _pipeline(events)
+        pipeline = TurnPipeline(pipeline.record, pipeline.transcribe, pipeline.respond,
+                                pipeline.synthesize, pipeline.play,
+                                match=lambda text: clip if text == clip['text'] else None)
+        with mock.patch.object(audio_utils, 'audio_player', player):
+            pipeline.run()
+    player.engine.close()
+    player._pyaudio = None
+
+    assert pipeline.play_clip is audio_utils.play_response
+    assert ('synthesize_start', 1) in events and ('play_start', 1) in events, events
+    print("✓ Synthesized after the device failed")
+    return True
+
+def main():
+    """Run all turn pipeline tests."""
+    tests = [
+        test_playback_overlaps_synthesis,
+        test_pipelined_faster_than_serial,
+        test_errors_propagate_without_deadlock,
+        test_nothing_recorded,
+        test_matching_sentence_plays_clip,
+        test_clip_device_failure_synthesizes,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Tests for voice activity detection and recording.
+"""
+import sys
+import tracemalloc
+import traceback
+from unittest import mock
+
+import numpy as np
+
+import vad
+from vad import (AudioRingBuffer, BLOCK_SIZE, EndpointPolicy, NoiseFloorEstimator,
+                 UtteranceRecorder, VoiceActivityDetector, record_until_silence)
+
+RATE = 16000
+
+class FakeInputStream:
+    """Delivers a prepared signal to the callback, one block per poll of `active`."""
+
+    def __init__(self, signal, samplerate, channels, dtype, blocksize, callback):
+        self.blocks = [signal[i:i + blocksize].reshape(-1, 1).astype(np.float32)
+                       for i in range(0, len(signal) - blocksize + 1, blocksize)]
+        self.callback = callback
+        self.delivered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def active(self):
+        if self.delivered >= len(self.blocks):
+            return False
+        self.callback(self.blocks[self.delivered], BLOCK_SIZE, None, None)
+        self.delivered += 1
+        return True
+
+def _record(signal, **kwargs):
+    """Run record_until_silence over signal with the energy-based detector."""
+    streams = []
+
+    def make_stream(**stream_kwargs):
+        streams.append(FakeInputStream(signal, **stream_kwargs))
+        return streams[-1]
+
+    with mock.patch.object(vad, 'VAD_AVAILABLE', False), \
+            mock.patch.object(vad.sd, 'InputStream', make_stream, create=True), \
+            mock.patch.object(vad.sd, 'sleep', lambda ms: None, create=True):
+        audio = record_until_silence(sample_rate=RATE, **kwargs)
+    return audio, streams[0]
+
+def _signal(*parts):
+    """Concatenate (seconds, amplitude) segments of noise and silence."""
+    rng = np.random.default_rng(0)
+    return np.concatenate([
+        amplitude * rng.uniform(-1, 1, int(seconds * RATE)).astype(np.float32)
+        for seconds, amplitude in parts
+    ])
+
+def test_ring_buffer_wraps():
+    """The ring keeps the most recent samples in order."""
+    print("Testing ring buffer...")
+    ring = AudioRingBuffer(5)
+    ring.write(np.arange(3, dtype=np.float32))
+    view = ring.view()
+    assert view.base is not None  # A view, not a copy
+    assert list(view) == [0, 1, 2]
+
+    ring.write(np.arange(3, 7, dtype=np.float32))
+    assert list(ring.view()) == [2, 3, 4, 5, 6]
+    assert len(ring) == 5 and ring.total == 7
+
+    ring.write(np.arange(10, 20, dtype=np.float32))
+    assert list(ring.view()) == [15, 16, 17, 18, 19]
+    ring.clear()
+    assert len(ring) == 0
+    print("✓ Oldest samples overwritten")
+    return True
+
+def test_record_stops_after_silence():
+    """Recording starts with speech and ends after the silence window."""
+    print("\nTesting recording...")
+    signal = _signal((0.5, 0.0), (1.0, 0.5), (2.0, 0.0), (1.0, 0.5))
+    audio, stream = _record(signal, silence_duration=0.5, max_duration=10, pre_roll_ms=0)
+
+    assert audio.ndim == 1
+    assert stream.delivered < len(stream.blocks)  # Stopped before the second utterance
+    # About one second of speech plus half a second of trailing silence
+    assert 1.2 < len(audio) / RATE < 1.8, len(audio) / RATE
+    print(f"✓ Recorded {len(audio) / RATE:.2f}s")
+    return True
+
+def test_record_respects_max_duration():
+    """Continuous speech is cut at max_duration without losing its start."""
+    print("\nTesting max duration...")
+    signal = _signal((3.0, 0.5))
+    audio, _ = _record(signal, silence_duration=0.5, max_duration=1.0)
+    assert len(audio) == int(1.0 * RATE / BLOCK_SIZE) * BLOCK_SIZE
+    print(f"✓ Capped at {len(audio) / RATE:.2f}s")
+    return True
+
+def test_pre_roll_keeps_onset():
+    """Audio from before the VAD triggers is prepended to the recording."""
+    print("\nTesting pre-roll...")
+    signal = _signal((0.5, 0.0), (1.0, 0.5), (1.0, 0.0))
+    onset = int(0.5 * RATE)
+    clipped = {}
+    with mock.patch.object(vad, 'VAD_AVAILABLE', False):
+        for pre_roll_ms in (0, 400):
+            recorder = UtteranceRecorder(RATE, silence_duration=0.5, pre_roll_ms=pre_roll_ms)
+            for i in range(0, len(signal) - BLOCK_SIZE + 1, BLOCK_SIZE):
+                recorder.feed(signal[i:i + BLOCK_SIZE])
+                if recorder.done:
+                    break
+            clipped[pre_roll_ms] = max(0, recorder.start_sample - onset) / RATE * 1000
+            # The recording begins exactly at start_sample
+            audio = recorder.audio()
+            assert np.array_equal(audio[:BLOCK_SIZE], signal[recorder.start_sample:recorder.start_sample + BLOCK_SIZE])
+
+    assert clipped[0] > 50, clipped
+    assert clipped[400] == 0, clipped
+    print(f"✓ Onset clipped by {clipped[0]:.0f}ms without pre-roll, {clipped[400]:.0f}ms with 400ms")
+    return True
+
+def test_noise_floor_adapts():
+    """The energy threshold follows the room instead of staying at 0.01."""
+    print("\nTesting noise floor...")
+    detector = VoiceActivityDetector(RATE)
+    detector.vad = None  # Energy-based detection
+    assert detector.energy_threshold == vad.FALLBACK_ENERGY_THRESHOLD
+
+    quiet_room, quiet_speech = _signal((2.0, 0.001)), _signal((0.5, 0.012))
+    for i in range(0, len(quiet_room), BLOCK_SIZE):
+        detector.process_audio(quiet_room[i:i + BLOCK_SIZE])
+    assert detector.energy_threshold < 0.005, detector.energy_threshold
+    assert detector.classify_frames(quiet_speech).speech.all()  # RMS 0.007, under the old threshold
+
+    noisy_room = _signal((20.0, 0.02))
+    for i in range(0, len(noisy_room), BLOCK_SIZE):
+        detector.process_audio(noisy_room[i:i + BLOCK_SIZE])
+    assert not detector.classify_frames(noisy_room[:RATE]).speech.any()
+
+    # A word spoken between pauses does not move the floor
+    floor = NoiseFloorEstimator(0.03, initial=0.001)
+    floor.update(np.full(50, 0.3))
+    assert np.isclose(floor.level, 0.001)
+
+    # The level tracked between rescans is always the window's minimum
+    floor = NoiseFloorEstimator(0.03, window_seconds=0.3)
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        floor.update(rng.uniform(0.001, 0.05, 2))
+        assert floor.level == float(floor._history.min())
+    print(f"✓ Threshold {detector.energy_threshold:.3f} in a noisy room")
+    return True
+
+def test_endpointing_policy():
+    """Fading speech ends sooner than speech that stops at full energy."""
+    print("\nTesting endpointing...")
+    fading = EndpointPolicy(silence_duration=1.0)
+    fading.observe(np.full(30, 0.2), 0.01)
+    fading.observe(np.array([0.1, 0.05, 0.03, 0.02]), 0.01)
+    assert fading.falling and fading.trailing_silence() == vad.ENDPOINT_MIN_SILENCE
+
+    abrupt = EndpointPolicy(silence_duration=1.0)
+    abrupt.observe(np.full(30, 0.2), 0.01)
+    assert not abrupt.falling and abrupt.trailing_silence() == vad.ENDPOINT_MAX_SILENCE
+
+    short = EndpointPolicy(silence_duration=1.0)
+    short.observe(np.array([0.2, 0.05]), 0.01)
+    assert short.trailing_silence() == 1.0
+
+    # End to end: a sentence fading out is cut after the short window
+    fade = np.linspace(1, 0, int(0.3 * RATE), dtype=np.float32) ** 2
+    speech = _signal((1.0, 0.5))
+    speech[-len(fade):] *= fade
+    signal = np.concatenate((_signal((0.5, 0.0)), speech, _signal((2.0, 0.0))))
+    stops = {}
+    with mock.patch.object(vad, 'VAD_AVAILABLE', False):
+        for name, policy in (("fixed", None), ("adaptive", EndpointPolicy(silence_duration=1.0))):
+            recorder = UtteranceRecorder(RATE, silence_duration=1.0, endpointing=policy)
+            for i in range(0, len(signal) - BLOCK_SIZE + 1, BLOCK_SIZE):
+                recorder.feed(signal[i:i + BLOCK_SIZE])
+                if recorder.done:
+                    break
+            stops[name] = recorder.samples_seen / RATE
+    assert stops["adaptive"] < stops["fixed"] - 0.3, stops
+    print(f"✓ Stopped at {stops['adaptive']:.2f}s instead of {stops['fixed']:.2f}s")
+    return True
+
+def test_block_and_file_agree():
+    """Frame-by-frame and vectorized analysis agree; blocks reuse the work buffers."""
+    print("\nTesting frame analysis paths...")
+    t = np.arange(3 * RATE) / RATE
+    signal = np.concatenate((_signal((1.0, 0.0)), 0.2 * np.sin(2 * np.pi * 200 * t))).astype(np.float32)
+    whole = VoiceActivityDetector(RATE, adaptive=False).classify_frames(signal)
+    speech, rms = whole.speech.copy(), whole.rms.copy()
+    assert np.allclose(whole.zcr[-1], 400 / RATE, atol=1 / 480)
+
+    detector = VoiceActivityDetector(RATE, adaptive=False)
+    buffer = detector._rms
+    step = 2 * detector.samples_per_frame  # Whole frames, so blocks line up with the file's frames
+    for i in range(0, len(signal) - step + 1, step):
+        block = detector.classify_frames(signal[i:i + step])
+        frames = slice(i // detector.samples_per_frame, i // detector.samples_per_frame + 2)
+        assert np.array_equal(block.speech, speech[frames])
+        assert np.allclose(block.rms, rms[frames], atol=1e-6)
+    assert detector._rms is buffer
+    assert not speech[:33].any() and np.allclose(rms[-90:], 0.2 / np.sqrt(2), atol=0.005)
+    print(f"✓ {len(speech)} frames classified the same either way")
+    return True
+
+def test_callback_path_does_not_allocate():
+    """Feeding blocks allocates no arrays, only small Python objects."""
+    print("\nTesting callback allocations...")
+    signal = np.concatenate((_signal((1.0, 0.001)), _signal((3.0, 0.2))))
+    recorder = UtteranceRecorder(RATE, max_duration=10, endpointing=EndpointPolicy())
+    blocks = [signal[i:i + BLOCK_SIZE] for i in range(0, len(signal) - BLOCK_SIZE + 1, BLOCK_SIZE)]
+    for block in blocks[:20]:
+        recorder.feed(block)
+
+    worst = 0
+    tracemalloc.start()
+    try:
+        for block in blocks[20:]:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            recorder.feed(block)
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    assert recorder.started
+    # One 30 ms frame of float32 alone would be 1920 bytes
+    assert worst < 1500, worst
+    print(f"✓ At most {worst} bytes per block")
+    return True
+
+def main():
+    """Run all VAD tests."""
+    tests = [
+        test_ring_buffer_wraps,
+        test_record_stops_after_silence,
+        test_record_respects_max_duration,
+        test_pre_roll_keeps_onset,
+        test_noise_floor_adapts,
+        test_endpointing_policy,
+        test_block_and_file_agree,
+        test_callback_path_does_not_allocate,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
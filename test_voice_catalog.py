@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk voice catalog cache.
+"""
+import os
+import sys
+import tempfile
+import time
+import traceback
+from types import SimpleNamespace
+from unittest import mock
+
+from voice_catalog import VoiceCatalogCache
+
+CATALOG = {
+    "Rachel": {"voice_id": "21m00", "category": "premade", "settings": None},
+    "Edward": {"voice_id": "abc12", "category": "cloned",
+               "settings": {"stability": 0.5, "similarity_boost": 0.75}},
+}
+
+def test_round_trip_and_ttl():
+    """A fetched catalog is served from disk until it is older than the TTL."""
+    print("Testing catalog round trip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voice_catalog.json")
+        cache = VoiceCatalogCache(path, ttl=60)
+        assert cache.load() is None
+        assert cache.is_stale()
+
+        assert cache.update(dict(CATALOG))
+        reloaded = VoiceCatalogCache(path, ttl=60)
+        assert reloaded.load() == CATALOG
+        assert not reloaded.is_stale()
+
+        # Age the file past the TTL
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        assert VoiceCatalogCache(path, ttl=60).load() == CATALOG
+        aged = VoiceCatalogCache(path, ttl=60)
+        aged.load()
+        assert aged.is_stale()
+
+    print("✓ Catalog cached and expired by TTL")
+    return True
+
+def test_unchanged_refresh_only_touches():
+    """Refreshing with an identical catalog reports no change but resets the TTL."""
+    print("\nTesting unchanged refresh...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voice_catalog.json")
+        VoiceCatalogCache(path, ttl=60).update(dict(CATALOG))
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        cache = VoiceCatalogCache(path, ttl=60)
+        cache.load()
+        assert not cache.update(dict(CATALOG))
+        assert not cache.is_stale()
+        assert os.path.getmtime(path) > old
+
+        changed = dict(CATALOG, Bella={"voice_id": "xyz", "category": "premade", "settings": None})
+        assert cache.update(changed)
+        assert "Bella" in VoiceCatalogCache(path, ttl=60).load()
+
+    print("✓ Only real changes rewrite the catalog")
+    return True
+
+def test_add_keeps_fetch_time():
+    """Adding a cloned voice does not count as a full refresh."""
+    print("\nTesting single voice add...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voice_catalog.json")
+        VoiceCatalogCache(path, ttl=60).update(dict(CATALOG))
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        cache = VoiceCatalogCache(path, ttl=60)
+        cache.load()
+        cache.add("Clone", {"voice_id": "c1", "category": "cloned", "settings": None})
+
+        reloaded = VoiceCatalogCache(path, ttl=60)
+        assert reloaded.load()["Clone"]["voice_id"] == "c1"
+        assert reloaded.is_stale()
+
+    print("✓ Clone added without resetting the TTL")
+    return True
+
+def test_fallback_voices_replaced():
+    """Voices fetched after a slow start replace the fallbacks even if the catalog is unchanged."""
+    print("\nTesting fallback replacement...")
+    from voice_manager import VoiceManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = VoiceCatalogCache(os.path.join(tmp, "voice_catalog.json"), ttl=60)
+        cache.update(dict(CATALOG))
+        fetched = [SimpleNamespace(name=name, voice_id=entry['voice_id'], category=entry['category'],
+                                   settings=None) for name, entry in CATALOG.items()]
+
+        manager = VoiceManager.__new__(VoiceManager)
+        manager.voice_catalog = cache
+        manager.client = mock.Mock()
+        manager.client.voices.get_all.return_value = SimpleNamespace(voices=fetched)
+        manager.add_fallback_voices()
+        manager.load_voices()
+        assert set(manager.voices) == set(CATALOG), manager.voices
+
+        # Real voices are kept as they are when nothing changed
+        current = manager.voices
+        manager.load_voices()
+        assert manager.voices is current
+
+    print("✓ Fallback voices replaced")
+    return True
+
+def main():
+    """Run all voice catalog tests."""
+    tests = [
+        test_round_trip_and_ttl,
+        test_unchanged_refresh_only_touches,
+        test_add_keeps_fetch_time,
+        test_fallback_voices_replaced,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for handing recordings to speech recognition in memory.
+"""
+import os
+import sys
+import tempfile
+import traceback
+import wave
+from unittest import mock
+
+import numpy as np
+
+import voice_input
+from openai_client import create_client
+from speech_to_text import speech_to_text
+from stt_stand_in import StandInTranscriptionServer, sentence, synthesize_words
+from voice_input import Recording, archive_recording, record_audio, record_voice
+
+RATE = 16000
+
+def test_recording_transcribed_from_memory():
+    """speech_to_text uploads a Recording without writing a file."""
+    print("Testing in-memory transcription...")
+    words = sentence(6)
+    recording = Recording(synthesize_words(words, RATE), RATE)
+    with StandInTranscriptionServer() as server, \
+            mock.patch('speech_to_text.open', side_effect=AssertionError("file opened"), create=True):
+        client = create_client(api_key="test", base_url=server.url)
+        text = speech_to_text(recording, client=client)
+        client.close()
+    assert text == " ".join(words), text
+    print("✓ Transcribed without touching the disk")
+    return True
+
+def test_archive_in_background():
+    """Archived recordings get unique names and are written off the caller's thread."""
+    print("\nTesting archival...")
+    with tempfile.TemporaryDirectory() as tmp:
+        first = Recording(np.full(RATE, 0.25, dtype=np.float32), RATE)
+        second = Recording(np.full(RATE // 2, -0.25, dtype=np.float32), RATE)
+        futures = [archive_recording(first, tmp), archive_recording(second, tmp)]
+        assert first.archive_path != second.archive_path
+        paths = [future.result(timeout=5) for future in futures]
+
+        with wave.open(paths[0], 'rb') as wf:
+            assert wf.getframerate() == RATE and wf.getnframes() == RATE
+            assert np.frombuffer(wf.readframes(1), dtype=np.int16)[0] == int(0.25 * 32767)
+        assert os.path.getsize(paths[1]) < os.path.getsize(paths[0])
+    print("✓ Both recordings archived")
+    return True
+
+def test_record_audio_and_record_voice():
+    """record_audio returns the buffer; record_voice still writes the file."""
+    print("\nTesting recording API...")
+    audio = np.linspace(-0.5, 0.5, RATE, dtype=np.float32)
+    with tempfile.TemporaryDirectory() as tmp, \
+            mock.patch.object(voice_input, 'record_until_silence', return_value=audio):
+        recording = record_audio()
+        assert recording.samples is audio and recording.duration == 1.0
+        assert recording.archive_path is None
+
+        path = record_voice(os.path.join(tmp, "voice.wav"))
+        with wave.open(path, 'rb') as wf:
+            assert wf.getnframes() == RATE
+
+    with mock.patch.object(voice_input, 'record_until_silence', return_value=audio[:0]):
+        assert record_audio() is None
+        assert record_voice("unused.wav") is None
+    print("✓ Buffer returned and file written on request")
+    return True
+
+def main():
+    """Run all voice input tests."""
+    tests = [
+        test_recording_transcribed_from_memory,
+        test_archive_in_background,
+        test_record_audio_and_record_voice,
+    ]
+
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"✗ Test {test.__name__} failed: {e}")
+            traceback.print_exc()
+
+    print(f"\nResults: {passed}/{len(tests)} tests passed")
+    return 0 if passed == len(tests) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,36 +24,16 @@ from audio_utils import play_response, audio_player
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Configure ElevenLabs API key if available
+# ElevenLabs is enabled when the package is installed and a key is configured.
+# The key is checked by the voice manager's background warm-up instead of a
+# blocking request at import time, so the GUI can open immediately.
 ELEVENLABS_ENABLED = False
 try:
     import elevenlabs
     
     if ELEVENLABS_API_KEY:
-        try:
-            # Try the newer API first
-            from elevenlabs import ElevenLabs
-            client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
-            # Test the API key by making a simple request
-            voices = client.voices.get_all()
-            ELEVENLABS_ENABLED = True
-            logger.info("ElevenLabs TTS is enabled and API key is valid")
-        except ImportError:
-            # Fall back to older API
-            try:
-                from elevenlabs import set_api_key
-                set_api_key(ELEVENLABS_API_KEY)
-                voices = elevenlabs.voices()
-                ELEVENLABS_ENABLED = True
-                logger.info("ElevenLabs TTS is enabled and API key is valid (legacy API)")
-            except Exception as e:
-                logger.error(f"Failed to initialize ElevenLabs with legacy API: {str(e)}")
-                ELEVENLABS_ENABLED = False
-                logger.warning("Dynamic TTS will be disabled due to invalid API key")
-        except Exception as e:
-            logger.error(f"Failed to initialize ElevenLabs: {str(e)}")
-            ELEVENLABS_ENABLED = False
-            logger.warning("Dynamic TTS will be disabled due to invalid API key")
+        ELEVENLABS_ENABLED = True
+        logger.info("ElevenLabs TTS is enabled; voices are loading in the background")
     else:
         logger.warning("ElevenLabs API key not found. Dynamic TTS will be disabled.")
         
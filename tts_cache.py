@@ -0,0 +1,188 @@
+"""
+Content-addressed cache for synthesized speech.
+Audio is keyed by a hash of the text and everything that affects how it
+sounds, kept on disk with LRU eviction under a size cap, and the most
+recently used clips are also held in memory.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class TTSCache:
+    """Two-tier (memory + disk) LRU cache of synthesized audio."""
+
+    SUFFIX = '.audio'
+
+    def __init__(self, cache_dir: Union[str, Path], max_bytes: int, memory_items: int = 32):
+        """
+        Initialize the cache and index the clips already on disk.
+
+        Args:
+            cache_dir: Directory holding the cached clips
+            max_bytes: Maximum total size of the clips on disk
+            memory_items: Number of clips kept in the in-memory hot tier
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        # key -> size on disk, least recently used first
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._disk_bytes = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(text: str, voice_id: str, model: str, settings: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for an utterance.
+
+        Args:
+            text: Text being spoken
+            voice_id: Voice identifier
+            model: Synthesis model (or engine) name
+            settings: Voice settings that affect the audio
+
+        Returns:
+            str: Hex digest identifying the audio
+        """
+        payload = json.dumps(
+            {'text': text, 'voice_id': voice_id, 'model': model, 'settings': settings or {}},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up cached audio.
+
+        Returns:
+            bytes: The cached audio, or None on a miss
+        """
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self._index.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return audio
+
+            if key not in self._index:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                audio = path.read_bytes()
+                os.utime(path)  # Persist recency for the next start
+            except OSError as e:
+                logger.warning("Dropping unreadable TTS cache entry %s: %s", key, e)
+                self._disk_bytes -= self._index.pop(key)
+                self.misses += 1
+                return None
+
+            self._index.move_to_end(key)
+            self._remember(key, audio)
+            self.hits += 1
+            return audio
+
+    def put(self, key: str, audio: bytes) -> None:
+        """Store audio, evicting the least recently used clips if over the size cap."""
+        if not audio or len(audio) > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            temp_path = path.with_suffix('.tmp')
+            try:
+                temp_path.write_bytes(audio)
+                os.replace(temp_path, path)
+            except OSError as e:
+                logger.warning("Could not write TTS cache entry: %s", e)
+                return
+
+            self._disk_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(audio)
+            self._disk_bytes += len(audio)
+            self._remember(key, audio)
+            self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current usage."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._index),
+                'bytes': self._disk_bytes
+            }
+
+    def clear(self) -> None:
+        """Remove every cached clip."""
+        with self._lock:
+            for key in list(self._index):
+                self._delete(key)
+            self._memory.clear()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def _load_index(self) -> None:
+        """Index the clips on disk, oldest access first, and enforce the size cap."""
+        entries = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._disk_bytes += size
+        self._evict()
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        """Keep a clip in the hot tier."""
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = audio
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least recently used clips until under the size cap."""
+        while self._disk_bytes > self.max_bytes and self._index:
+            key = next(iter(self._index))
+            self._delete(key)
+            self.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        self._disk_bytes -= self._index.pop(key, 0)
+        self._memory.pop(key, None)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("Could not delete TTS cache entry %s: %s", key, e)
@@ -0,0 +1,233 @@
+"""
+Streaming playback for synthesized speech.
+Audio chunks are decoded as they arrive from the TTS service and played
+through a jitter buffer, so the first words are heard while the rest of the
+sentence is still being synthesized.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class PCMDecoder:
+    """
+    Incremental decoder for raw PCM streams.
+
+    Network chunks can split a sample in half; the decoder only releases
+    whole frames and carries the remainder over to the next chunk.
+    """
+
+    def __init__(self, sample_width: int = 2, channels: int = 1):
+        self.frame_size = sample_width * channels
+        self._remainder = b""
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Return the whole frames available after adding chunk."""
+        data = self._remainder + chunk if self._remainder else chunk
+        usable = len(data) - len(data) % self.frame_size
+        self._remainder = data[usable:]
+        return data[:usable]
+
+    def finish(self) -> None:
+        """Drop a trailing partial frame, if any, and reset the decoder."""
+        if self._remainder:
+            logger.debug("Discarding %d bytes of a partial frame", len(self._remainder))
+        self._remainder = b""
+
+class JitterBuffer:
+    """
+    Thread-safe byte buffer between a network producer and an audio consumer.
+
+    Reading starts only once target_bytes are buffered (or the stream ended).
+    If the buffer runs dry mid-stream it is counted as an underrun and the
+    buffer refills to the target again before playback resumes, so a slow
+    network produces one gap instead of constant stutter.
+    """
+
+    def __init__(self, target_bytes: int):
+        self.target_bytes = target_bytes
+        self.underruns = 0
+        self._chunks: deque = deque()
+        self._size = 0
+        self._closed = False
+        self._primed = False
+        self._cond = threading.Condition()
+
+    def put(self, data: bytes) -> None:
+        """Add decoded audio."""
+        if not data:
+            return
+        with self._cond:
+            self._chunks.append(data)
+            self._size += len(data)
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Mark the end of the stream; readers drain what is left."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def read(self, size: int) -> bytes:
+        """
+        Return the next size bytes, blocking while buffering.
+
+        Returns fewer bytes only at the end of the stream, and b"" once drained.
+        """
+        with self._cond:
+            if self._primed and self._size < size and not self._closed:
+                self.underruns += 1
+                self._primed = False
+            if not self._primed:
+                self._cond.wait_for(lambda: self._size >= max(self.target_bytes, size) or self._closed)
+                self._primed = True
+            return self._take(size)
+
+    def _take(self, size: int) -> bytes:
+        parts = []
+        needed = size
+        while needed and self._chunks:
+            chunk = self._chunks.popleft()
+            if len(chunk) > needed:
+                self._chunks.appendleft(chunk[needed:])
+                chunk = chunk[:needed]
+            parts.append(chunk)
+            needed -= len(chunk)
+        data = b"".join(parts)
+        self._size -= len(data)
+        return data
+
+class StreamingPlayer:
+    """Plays a stream of PCM chunks as they arrive."""
+
+    def __init__(
+        self,
+        sample_rate: int,
+        sample_width: int = 2,
+        channels: int = 1,
+        jitter_ms: int = 200,
+        block_ms: int = 20,
+        open_output: Optional[Callable[[int, int, int], object]] = None
+    ):
+        """
+        Initialize the player.
+
+        Args:
+            sample_rate: Sample rate of the PCM stream in Hz
+            sample_width: Bytes per sample
+            channels: Number of channels
+            jitter_ms: Audio buffered before playback starts (and after an underrun)
+            block_ms: Size of each write to the output device
+            open_output: Called with (sample_rate, sample_width, channels) to open an
+                output with write() and close(); defaults to the shared output engine
+        """
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self.jitter_ms = jitter_ms
+        self.block_ms = block_ms
+        self.open_output = open_output or _open_engine_output
+
+    def ms_to_bytes(self, ms: float) -> int:
+        """Number of bytes holding ms milliseconds of whole frames."""
+        frame_size = self.sample_width * self.channels
+        return max(1, int(self.sample_rate * ms / 1000)) * frame_size
+
+    def play(self, chunks: Iterable[bytes]) -> Dict[str, float]:
+        """
+        Play chunks as they arrive (blocking until playback ends).
+
+        Args:
+            chunks: Raw PCM byte chunks, e.g. straight from the TTS response
+
+        Returns:
+            dict: first_sound (seconds until the first write to the device),
+                  duration (audio seconds played), underruns and total time
+
+        Raises:
+            Exception: Whatever the chunk iterator raised, after the audio
+                received before the error has been played
+        """
+        start = time.perf_counter()
+        buffer = JitterBuffer(self.ms_to_bytes(self.jitter_ms))
+        decoder = PCMDecoder(self.sample_width, self.channels)
+        errors = []
+        stopped = threading.Event()
+
+        def produce():
+            try:
+                for chunk in chunks:
+                    if stopped.is_set():
+                        break
+                    buffer.put(decoder.feed(chunk))
+                decoder.finish()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                buffer.close()
+
+        producer = threading.Thread(target=produce, name="tts-stream", daemon=True)
+        producer.start()
+
+        stats = {'first_sound': None, 'duration': 0.0, 'underruns': 0, 'total': 0.0}
+        block_bytes = self.ms_to_bytes(self.block_ms)
+        played = 0
+        output = None
+        try:
+            while True:
+                block = buffer.read(block_bytes)
+                if not block:
+                    break
+                if output is None:
+                    output = self.open_output(self.sample_rate, self.sample_width, self.channels)
+                    stats['first_sound'] = time.perf_counter() - start
+                output.write(block)
+                played += len(block)
+        finally:
+            # Stop reading the stream if playback failed part way
+            stopped.set()
+            buffer.close()
+            producer.join()
+            if output is not None:
+                output.close()
+
+        stats['duration'] = played / (self.sample_rate * self.sample_width * self.channels)
+        stats['underruns'] = buffer.underruns
+        stats['total'] = time.perf_counter() - start
+        if errors:
+            raise errors[0]
+        return stats
+
+class _EngineOutput:
+    """Writes blocks to the application's persistent output engine."""
+
+    def __init__(self, sample_rate: int, sample_width: int, channels: int):
+        from audio_utils import audio_player
+        self.engine = audio_player.engine
+        self.format = (sample_width, channels, sample_rate)
+        self._pending = None
+
+    def write(self, data: bytes) -> None:
+        # Keep one block queued behind the one playing: gapless, but the
+        # jitter buffer (not the engine queue) still absorbs network delays
+        done = self.engine.submit(data, *self.format)
+        if self._pending is not None:
+            self._wait(self._pending)
+        self._pending = done
+
+    def close(self) -> None:
+        if self._pending is not None:
+            self._wait(self._pending)
+
+    @staticmethod
+    def _wait(done) -> None:
+        done.wait()
+        if done.failed:
+            raise done.error
+
+def _open_engine_output(sample_rate: int, sample_width: int, channels: int) -> _EngineOutput:
+    return _EngineOutput(sample_rate, sample_width, channels)
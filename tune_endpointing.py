@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Offline tuning harness for end-of-utterance detection.
+
+Replays a corpus through UtteranceRecorder, block by block, in two
+scenarios per utterance:
+  end   -- the utterance followed by room noise; measures endpoint latency,
+           the time from the last speech to the end of the recording
+  pause -- the utterance cut at a loud frame near its middle, a pause of
+           --pause seconds, then the rest; the recording must not end in
+           the pause (an early cut makes the user repeat themselves)
+
+Every EndpointPolicy setting in the grid is compared with the fixed
+one-second silence window record_voice used before.
+
+The corpus is the WAVs (16 kHz 16-bit mono) given on the command line,
+files or directories, and/or synthetic voiced utterances whose last
+syllable fades out, as spoken sentences do.
+
+Usage:
+    python tune_endpointing.py [--synthetic N] [--pause SECONDS] [path ...]
+"""
+import argparse
+import itertools
+import os
+import sys
+
+import numpy as np
+
+from eval_vad_onset import PEAK_LEVEL, RATE, load, loud_start
+from vad import BLOCK_SIZE, EndpointPolicy, UtteranceRecorder
+
+BASELINE_SILENCE = 1.0
+LEAD_IN_SECONDS = 0.5
+TAIL_SECONDS = 3.0
+ROOM_NOISE = 0.001
+
+GRID = {
+    'min_silence': (0.3, 0.4, 0.5, 0.6),
+    'max_silence': (1.0, 1.2, 1.5),
+    'fall_ratio': (0.3, 0.5, 0.7),
+}
+
+def synthetic_utterance(rng: np.random.Generator) -> np.ndarray:
+    """A voiced, syllable-modulated phrase whose last syllable fades out."""
+    t = np.arange(int(rng.uniform(0.8, 2.5) * RATE)) / RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.3, 1.0) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 20))
+    syllables = 0.3 + 0.7 * np.sin(2 * np.pi * rng.uniform(3, 6) * t) ** 2
+    fade = np.clip((t[-1] - t) / 0.4, 0.05, 1.0) ** 2  # Last 400 ms fall off
+    audio = voiced * syllables * fade
+    return (PEAK_LEVEL * audio / np.abs(audio).max()).astype(np.float32)
+
+def speech_end(audio: np.ndarray) -> int:
+    """Sample index just after the last frame within 20 dB of the loudest one."""
+    return len(audio) - loud_start(audio[::-1])
+
+def split_point(audio: np.ndarray, frame: int = RATE // 100) -> int:
+    """The loudest frame boundary in the middle half, so speech stops at full energy."""
+    frames = audio[:len(audio) // frame * frame].reshape(-1, frame)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1))
+    lo, hi = len(rms) // 4, max(len(rms) * 3 // 4, len(rms) // 4 + 1)
+    return (lo + int(np.argmax(rms[lo:hi])) + 1) * frame
+
+def run(signal: np.ndarray, policy) -> int:
+    """Input sample at which the recording ends (len(signal) if it never does)."""
+    recorder = UtteranceRecorder(RATE, silence_duration=BASELINE_SILENCE, max_duration=0,
+                                 endpointing=policy)
+    for i in range(0, len(signal) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        recorder.feed(signal[i:i + BLOCK_SIZE])
+        if recorder.done:
+            return recorder.samples_seen
+    return len(signal)
+
+def build_scenarios(utterances, pause: float, rng: np.random.Generator):
+    """(signal, speech end, earliest allowed end) for the end and pause scenarios."""
+    def noise(seconds):
+        return (ROOM_NOISE * rng.standard_normal(int(seconds * RATE))).astype(np.float32)
+
+    ends, pauses = [], []
+    for audio in utterances:
+        lead = noise(LEAD_IN_SECONDS)
+        ends.append((np.concatenate((lead, audio, noise(TAIL_SECONDS))), len(lead) + speech_end(audio)))
+
+        cut = split_point(audio)
+        gap = noise(pause)
+        signal = np.concatenate((lead, audio[:cut], gap, audio[cut:], noise(TAIL_SECONDS)))
+        pauses.append((signal, len(lead) + cut + len(gap)))
+    return ends, pauses
+
+def evaluate(policy_factory, ends, pauses):
+    latencies = [(run(signal, policy_factory()) - end) / RATE for signal, end in ends]
+    early = sum(run(signal, policy_factory()) < resume for signal, resume in pauses)
+    return np.array(latencies), early
+
+def collect(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path)
+                                if name.lower().endswith('.wav')))
+        else:
+            files.append(path)
+    return files
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('paths', nargs='*', help="WAV files or directories")
+    parser.add_argument('--synthetic', type=int, default=None,
+                        help="synthetic utterances to add (default: 20 without paths, else 0)")
+    parser.add_argument('--pause', type=float, default=0.7, help="mid-sentence pause in seconds")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    utterances = []
+    for path in collect(args.paths):
+        audio = load(path)
+        utterances.append(audio * PEAK_LEVEL / max(float(np.abs(audio).max()), 1e-9))
+    synthetic = args.synthetic if args.synthetic is not None else (0 if args.paths else 20)
+    utterances.extend(synthetic_utterance(rng) for _ in range(synthetic))
+    if not utterances:
+        print("No utterances to evaluate")
+        return 1
+
+    ends, pauses = build_scenarios(utterances, args.pause, rng)
+    print(f"Endpointing over {len(utterances)} utterance(s), {args.pause:.1f}s mid-sentence pause")
+    print("=" * 72)
+    print(f"{'policy':<34} {'mean latency':>13} {'p90':>7} {'early cuts':>11}")
+
+    latencies, early = evaluate(lambda: None, ends, pauses)
+    print(f"{f'fixed {BASELINE_SILENCE:.1f}s silence':<34} {latencies.mean():>12.2f}s "
+          f"{np.percentile(latencies, 90):>6.2f}s {early:>5}/{len(pauses)}")
+
+    latencies, early = evaluate(lambda: EndpointPolicy(silence_duration=BASELINE_SILENCE), ends, pauses)
+    print(f"{'EndpointPolicy defaults':<34} {latencies.mean():>12.2f}s "
+          f"{np.percentile(latencies, 90):>6.2f}s {early:>5}/{len(pauses)}")
+    print("-" * 72)
+
+    results = []
+    for values in itertools.product(*GRID.values()):
+        settings = dict(zip(GRID, values))
+        latencies, early = evaluate(
+            lambda: EndpointPolicy(silence_duration=BASELINE_SILENCE, **settings), ends, pauses)
+        results.append((early, latencies.mean(), np.percentile(latencies, 90), settings))
+
+    results.sort(key=lambda result: (result[0], result[1]))
+    for early, mean, p90, settings in results[:10]:
+        label = "min {min_silence:.1f}s max {max_silence:.1f}s fall {fall_ratio:.1f}".format(**settings)
+        print(f"{label:<34} {mean:>12.2f}s {p90:>6.2f}s {early:>5}/{len(pauses)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+Turn pipeline for Edward Voice AI.
+Connects recording, speech recognition, response generation, speech synthesis
+(or a matching pre-recorded clip) and playback with bounded queues, so sentence N is synthesized while sentence
+N+1 is still being generated and played while sentence N+1 is synthesized.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output in its queue
+_DONE = object()
+
+class _Clip:
+    """A pre-recorded response queued for playback in place of synthesized audio."""
+
+    __slots__ = ('response', 'sentence')
+
+    def __init__(self, response: Dict[str, str], sentence: str):
+        self.response = response
+        self.sentence = sentence  # Synthesized instead if the clip fails to play
+
+class TurnResult:
+    """
+    Outcome of a single conversational turn.
+
+    Timings (seconds) are collected in `timings`:
+        record, transcribe        -- duration of the input stages
+        generate, synthesize,
+        playback                  -- busy time of each response stage
+        first_sentence,
+        first_audio,
+        first_playback            -- latency from the start of the response
+                                     stage until the first sentence, the first
+                                     synthesized clip and the first sound
+        response                  -- response stage start to end of playback
+        total                     -- the whole turn
+    """
+
+    def __init__(self):
+        self.audio_file = None  # What record returned: a voice_input.Recording or a file path
+        self.transcript: Optional[str] = None
+        self.sentences: List[str] = []
+        self.timings: Dict[str, float] = {}
+
+    @property
+    def response(self) -> str:
+        """The full spoken response."""
+        return " ".join(self.sentences)
+
+class TurnPipeline:
+    """Runs a voice turn with overlapping generation, synthesis and playback."""
+
+    def __init__(
+        self,
+        record: Optional[Callable[[], Any]] = None,
+        transcribe: Optional[Callable[[Any], str]] = None,
+        respond: Optional[Callable[[str], Iterable[str]]] = None,
+        synthesize: Optional[Callable[[str], Optional[bytes]]] = None,
+        play: Optional[Callable[[bytes], None]] = None,
+        match: Optional[Callable[[str], Optional[Dict[str, str]]]] = None,
+        play_clip: Optional[Callable[[Dict[str, str]], bool]] = None,
+        queue_size: int = 2,
+        on_stage: Optional[Callable[[str], None]] = None,
+        on_transcript: Optional[Callable[[str], None]] = None,
+        on_response: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Initialize the pipeline. Stages default to the application's modules.
+
+        Args:
+            record: Records the user and returns the recording (or an audio file
+                path); None or empty if nothing was recorded
+            transcribe: Converts what record returned to text
+            respond: Yields the response to a user message sentence by sentence
+            synthesize: Converts one sentence to audio bytes
+            play: Plays audio bytes (blocking)
+            match: Finds a pre-recorded response that says a sentence, played
+                instead of synthesizing it (defaults to voice_responses'
+                matcher when synthesize is not given, else no matching)
+            play_clip: Plays a matched response (blocking), returning False if it
+                could not (defaults to audio_utils.play_response)
+            queue_size: Maximum number of items buffered between two stages
+            on_stage: Called with the stage name when an input stage starts
+            on_transcript: Called with the transcribed user text
+            on_response: Called with the full response once generation ends
+        """
+        if record is None:
+            from voice_input import record_audio as record
+        if transcribe is None:
+            from speech_to_text import speech_to_text as transcribe
+        if respond is None:
+            from ai_brain import stream_response as respond
+        if match is None and synthesize is None:
+            from voice_responses import voice_responses
+            match = voice_responses.find_matching_response
+        if match is not None and play_clip is None:
+            from audio_utils import play_response as play_clip
+        if synthesize is None or play is None:
+            from voice_manager import voice_manager
+            synthesize = synthesize or voice_manager.text_to_speech
+            play = play or voice_manager.play_audio
+
+        self.record = record
+        self.transcribe = transcribe
+        self.respond = respond
+        self.synthesize = synthesize
+        self.play = play
+        self.match = match
+        self.play_clip = play_clip
+        self.queue_size = queue_size
+        self.on_stage = on_stage
+        self.on_transcript = on_transcript
+        self.on_response = on_response
+
+    def run(self, stop_event: Optional[threading.Event] = None, pipelined: bool = True) -> TurnResult:
+        """
+        Record the user, transcribe, respond and speak the response.
+
+        Args:
+            stop_event: Optional event that cancels the remaining response
+            pipelined: If False, run every stage strictly in sequence (for comparison)
+
+        Returns:
+            TurnResult: The turn's transcript, response and timings.
+                audio_file or transcript is None if nothing was recorded or recognized.
+        """
+        result = TurnResult()
+        turn_start = time.perf_counter()
+
+        self._notify_stage('record')
+        start = time.perf_counter()
+        result.audio_file = self.record()
+        result.timings['record'] = time.perf_counter() - start
+        if not result.audio_file:
+            return result
+
+        self._notify_stage('transcribe')
+        start = time.perf_counter()
+        result.transcript = self.transcribe(result.audio_file)
+        result.timings['transcribe'] = time.perf_counter() - start
+        if not result.transcript:
+            return result
+
+        if self.on_transcript:
+            self.on_transcript(result.transcript)
+
+        self._speak_response(result, stop_event, pipelined)
+        result.timings['total'] = time.perf_counter() - turn_start
+        return result
+
+    def run_text(self, user_text: str, stop_event: Optional[threading.Event] = None,
+                 pipelined: bool = True) -> TurnResult:
+        """
+        Respond to typed text, skipping the recording and transcription stages.
+
+        Args:
+            user_text: The user's message
+            stop_event: Optional event that cancels the remaining response
+            pipelined: If False, run every stage strictly in sequence (for comparison)
+
+        Returns:
+            TurnResult: The turn's response and timings
+        """
+        result = TurnResult()
+        result.transcript = user_text
+        turn_start = time.perf_counter()
+        self._speak_response(result, stop_event, pipelined)
+        result.timings['total'] = time.perf_counter() - turn_start
+        return result
+
+    def _notify_stage(self, stage: str) -> None:
+        """Report the start of an input stage."""
+        if self.on_stage:
+            self.on_stage(stage)
+
+    def _speak_response(self, result: TurnResult, stop_event: Optional[threading.Event],
+                        pipelined: bool) -> None:
+        """Generate, synthesize and play the response to result.transcript."""
+        self._notify_stage('respond')
+        start = time.perf_counter()
+        if pipelined:
+            self._run_pipelined(result, start, stop_event)
+        else:
+            self._run_serial(result, start, stop_event)
+        result.timings['response'] = time.perf_counter() - start
+
+        logger.info(
+            "Turn timings: %s",
+            ", ".join(f"{name}={value * 1000:.0f}ms" for name, value in result.timings.items())
+        )
+
+    def _run_serial(self, result: TurnResult, start: float,
+                    stop_event: Optional[threading.Event]) -> None:
+        """Generate the whole response, then synthesize it, then play it."""
+        timings = result.timings
+
+        for sentence in self.respond(result.transcript):
+            timings.setdefault('first_sentence', time.perf_counter() - start)
+            result.sentences.append(sentence)
+        timings['generate'] = time.perf_counter() - start
+        if self.on_response:
+            self.on_response(result.response)
+
+        if not result.sentences or (stop_event and stop_event.is_set()):
+            return
+
+        synth_start = time.perf_counter()
+        audio = self._speech_for(result.response)
+        timings['synthesize'] = time.perf_counter() - synth_start
+        timings['first_audio'] = time.perf_counter() - start
+
+        if audio and not (stop_event and stop_event.is_set()):
+            play_start = time.perf_counter()
+            timings['first_playback'] = play_start - start
+            self._play(audio)
+            timings['playback'] = time.perf_counter() - play_start
+
+    def _run_pipelined(self, result: TurnResult, start: float,
+                       stop_event: Optional[threading.Event]) -> None:
+        """Run generation and synthesis in workers and play clips as they arrive."""
+        timings = result.timings
+        cancel = threading.Event()
+        errors: List[Exception] = []
+        sentence_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        audio_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        def cancelled() -> bool:
+            return cancel.is_set() or bool(stop_event and stop_event.is_set())
+
+        def generate() -> None:
+            try:
+                for sentence in self.respond(result.transcript):
+                    timings.setdefault('first_sentence', time.perf_counter() - start)
+                    result.sentences.append(sentence)
+                    if cancelled():
+                        break
+                    sentence_queue.put(sentence)
+                if self.on_response:
+                    self.on_response(result.response)
+            except Exception as e:
+                errors.append(e)
+                cancel.set()
+            finally:
+                timings['generate'] = time.perf_counter() - start
+                sentence_queue.put(_DONE)
+
+        def synthesize() -> None:
+            busy = 0.0
+            try:
+                while True:
+                    sentence = sentence_queue.get()
+                    if sentence is _DONE:
+                        break
+                    if cancelled():
+                        continue  # Keep draining so the generator never blocks
+                    synth_start = time.perf_counter()
+                    audio = self._speech_for(sentence)
+                    busy += time.perf_counter() - synth_start
+                    if audio:
+                        timings.setdefault('first_audio', time.perf_counter() - start)
+                        audio_queue.put(audio)
+            except Exception as e:
+                errors.append(e)
+                cancel.set()
+                _drain(sentence_queue)
+            finally:
+                timings['synthesize'] = busy
+                audio_queue.put(_DONE)
+
+        workers = [
+            threading.Thread(target=generate, name="turn-generate", daemon=True),
+            threading.Thread(target=synthesize, name="turn-synthesize", daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Play clips in the calling thread while the workers keep producing
+        busy = 0.0
+        try:
+            while True:
+                audio = audio_queue.get()
+                if audio is _DONE:
+                    break
+                if cancelled():
+                    continue
+                play_start = time.perf_counter()
+                timings.setdefault('first_playback', play_start - start)
+                self._play(audio)
+                busy += time.perf_counter() - play_start
+        except Exception:
+            cancel.set()
+            _drain(audio_queue)
+            raise
+        finally:
+            timings['playback'] = busy
+            for worker in workers:
+                worker.join()
+
+        if errors:
+            raise errors[0]
+
+    def _speech_for(self, text: str):
+        """The matching pre-recorded clip for text, or else its synthesized audio."""
+        response = self.match(text) if self.match else None
+        if response:
+            return _Clip(response, text)
+        return self.synthesize(text)
+
+    def _play(self, audio) -> None:
+        """Play synthesized audio or a clip, synthesizing the clip's text if it fails to play."""
+        if not isinstance(audio, _Clip):
+            self.play(audio)
+        elif not self.play_clip(audio.response):
+            logger.warning("Could not play %s; synthesizing it instead", audio.response.get('file'))
+            synthesized = self.synthesize(audio.sentence)
+            if synthesized:
+                self.play(synthesized)
+
+def _drain(stage_queue: queue.Queue) -> None:
+    """Discard queued items up to and including the end marker."""
+    while stage_queue.get() is not _DONE:
+        pass
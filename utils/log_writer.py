@@ -0,0 +1,173 @@
+"""Background writer for diagnostic JSON-lines logs."""
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tells the worker to flush and exit
+_STOP = object()
+
+class BackgroundLogWriter:
+    """
+    Appends JSON records to log files from a worker thread.
+
+    Callers never touch the disk: records go into a bounded queue and are
+    written in batches, one open/write per file per batch. When the queue is
+    full new records are dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, max_queue: int = 1000, batch_size: int = 64, flush_interval: float = 0.5):
+        """
+        Initialize the writer. The worker thread starts on the first write.
+
+        Args:
+            max_queue: Maximum number of records waiting to be written
+            batch_size: Maximum number of records written per batch
+            flush_interval: Seconds to wait for more records before writing a batch
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, path: str, record: Dict) -> bool:
+        """
+        Queue a record for appending to path as one JSON line.
+
+        Returns:
+            bool: False if the record was dropped because the queue is full
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((str(path), record))
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued record has been written."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return
+        done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write the remaining records and stop the worker."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Log writer queue full at shutdown; some records were not written")
+            return
+        thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        """Return counters for written, dropped and failed records."""
+        with self._lock:
+            return {
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'batches': self.batches,
+                'queued': self._queue.qsize()
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[Tuple[str, Dict]] = []
+            waiters: List[threading.Event] = []
+            stop = False
+
+            # Collect a batch: whatever arrives within flush_interval, up to batch_size
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if waiters or stop:
+                # Flush everything already queued as well
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        batch.append(item)
+
+            self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[Tuple[str, Dict]]) -> None:
+        if not batch:
+            return
+        by_path: Dict[str, List[str]] = defaultdict(list)
+        for path, record in batch:
+            by_path[path].append(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str))
+
+        for path, lines in by_path.items():
+            try:
+                with open(path, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(lines) + '\n')
+                with self._lock:
+                    self.written += len(lines)
+            except Exception as e:
+                with self._lock:
+                    self.failed += len(lines)
+                logger.error("Failed to write %d records to %s: %s", len(lines), path, e)
+        with self._lock:
+            self.batches += 1
+
+# Shared writer for the application's diagnostic logs
+log_writer = BackgroundLogWriter()
+atexit.register(log_writer.close)
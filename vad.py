@@ -9,9 +9,202 @@ try:
 except ImportError:
     print("Warning: webrtcvad not available. Voice activity detection will be disabled.")
     VAD_AVAILABLE = False
+import math
+
 import numpy as np
 import sounddevice as sd
-from typing import Optional, Callable
+from typing import Optional, Callable, Tuple
+
+# Frames quieter than this RMS (full scale = 1.0, about -50 dBFS) are treated
+# as silence without asking WebRTC VAD
+ENERGY_GATE = 0.003
+
+# Blocks of at most this many frames are measured frame by frame: at the
+# input block size (two frames) that beats numpy's per-call overhead
+SCALAR_MAX_FRAMES = 4
+
+# Speech threshold (RMS) when WebRTC VAD is not available, used until the
+# noise floor has been measured
+FALLBACK_ENERGY_THRESHOLD = 0.01
+
+# The adaptive threshold sits this far above the noise floor (about 10 dB),
+# bounded by ENERGY_GATE below and MAX_ENERGY_THRESHOLD above
+NOISE_FLOOR_MARGIN = 3.0
+MAX_ENERGY_THRESHOLD = 0.05
+
+# The noise floor is the quietest frame in this window: it follows a quieter
+# room at once and a louder one (a fan switching on) after the window, while
+# speech, which always has pauses, barely moves it
+NOISE_FLOOR_WINDOW_SECONDS = 3.0
+
+# Trailing silence that ends an utterance under EndpointPolicy: short after
+# speech that fades out, long after speech that stops at full energy
+ENDPOINT_MIN_SILENCE = 0.5
+ENDPOINT_MAX_SILENCE = 1.2
+# Speech has faded out when its recent energy is below this share of its mean
+ENDPOINT_FALL_RATIO = 0.5
+# Voiced audio needed before an utterance can be judged complete
+ENDPOINT_MIN_SPEECH = 0.5
+# Time constant of the "recent energy" average
+ENDPOINT_TAIL_SECONDS = 0.1
+
+class FrameAnalysis:
+    """Per-frame features and speech decisions for one block of audio."""
+    
+    def __init__(self, speech: np.ndarray, rms: np.ndarray, frames: np.ndarray, webrtc_calls: int):
+        self.speech = speech  # bool per frame
+        self.rms = rms  # RMS energy per frame (full scale = 1.0)
+        self.webrtc_calls = webrtc_calls  # Frames that passed the energy gate
+        self._frames = frames  # (frames, samples_per_frame) float32 view of the block
+        self._zcr: Optional[np.ndarray] = None
+    
+    @property
+    def zcr(self) -> np.ndarray:
+        """Zero-crossing rate per frame (crossings per sample), computed on first use."""
+        if self._zcr is None:
+            signs = np.signbit(self._frames)
+            self._zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self._frames.shape[1]
+        return self._zcr
+    
+    def __len__(self) -> int:
+        return len(self.speech)
+
+class NoiseFloorEstimator:
+    """
+    Tracks the background level as the minimum frame RMS over a sliding window.
+    
+    The window history is preallocated and starts at `initial`, so the
+    threshold begins at FALLBACK_ENERGY_THRESHOLD and can only rise once a
+    full window of louder audio has been seen.
+    """
+    
+    def __init__(
+        self,
+        frame_seconds: float,
+        initial: float = FALLBACK_ENERGY_THRESHOLD / NOISE_FLOOR_MARGIN,
+        window_seconds: float = NOISE_FLOOR_WINDOW_SECONDS
+    ):
+        """
+        Initialize the estimator.
+        
+        Args:
+            frame_seconds: Duration of one analysis frame
+            initial: Starting estimate
+            window_seconds: How long the quietest frame is remembered
+        """
+        self._history = np.full(max(1, int(round(window_seconds / frame_seconds))), initial,
+                                dtype=np.float32)
+        self._position = 0
+        self._min = float(self._history.min())  # As stored (float32)
+        self.level = float(initial)
+    
+    @property
+    def threshold(self) -> float:
+        """RMS above which a frame counts as speech."""
+        return float(min(max(self.level * NOISE_FLOOR_MARGIN, ENERGY_GATE), MAX_ENERGY_THRESHOLD))
+    
+    def update(self, rms: np.ndarray) -> float:
+        """
+        Fold one block's frame energies into the estimate and return it.
+        
+        The window is only scanned again when its quietest frame drops out,
+        so most blocks cost a few comparisons.
+        """
+        rescan = False
+        for value in rms:  # A block holds only a few frames
+            evicted = self._history[self._position]
+            self._history[self._position] = value
+            stored = float(self._history[self._position])
+            self._position = (self._position + 1) % len(self._history)
+            if stored <= self._min:
+                self._min = stored
+            elif evicted <= self._min:
+                rescan = True
+        if rescan:
+            self._min = float(self._history.min())
+        self.level = self._min
+        return self.level
+
+class EndpointPolicy:
+    """
+    Decides how much trailing silence ends an utterance.
+    
+    Once at least min_speech seconds have been voiced, speech whose energy
+    fell off before the pause looks like a finished sentence and ends after
+    min_silence; speech that stopped at full energy looks like a breath or
+    hesitation mid-sentence and gets max_silence. Shorter utterances use
+    the plain silence_duration.
+    """
+    
+    def __init__(
+        self,
+        silence_duration: float = 1.0,
+        min_silence: float = ENDPOINT_MIN_SILENCE,
+        max_silence: float = ENDPOINT_MAX_SILENCE,
+        fall_ratio: float = ENDPOINT_FALL_RATIO,
+        min_speech: float = ENDPOINT_MIN_SPEECH,
+        frame_seconds: float = 0.03
+    ):
+        """
+        Initialize the policy.
+        
+        Args:
+            silence_duration: Trailing silence before the utterance can be judged
+            min_silence: Trailing silence after a finished-sounding sentence
+            max_silence: Trailing silence after speech that stopped abruptly
+            fall_ratio: Recent-to-mean energy ratio below which speech has faded out
+            min_speech: Seconds of voiced audio before the policy takes effect
+            frame_seconds: Duration of one analysis frame
+        """
+        self.silence_duration = silence_duration
+        self.min_silence = min_silence
+        self.max_silence = max_silence
+        self.fall_ratio = fall_ratio
+        self.min_speech = min_speech
+        self.frame_seconds = frame_seconds
+        self._recent_rate = 1 - np.exp(-frame_seconds / ENDPOINT_TAIL_SECONDS)
+        self.reset()
+    
+    def reset(self) -> None:
+        """Forget the current utterance."""
+        self.voiced_frames = 0
+        self.mean_energy = 0.0
+        self.recent_energy = 0.0
+    
+    @property
+    def speech_seconds(self) -> float:
+        """Voiced audio seen in the current utterance."""
+        return self.voiced_frames * self.frame_seconds
+    
+    @property
+    def falling(self) -> bool:
+        """True if the last voiced frames were well below the utterance's mean energy."""
+        return self.recent_energy < self.fall_ratio * self.mean_energy
+    
+    def observe(self, rms: np.ndarray, threshold: float) -> None:
+        """
+        Update the energy statistics with one block.
+        
+        Args:
+            rms: Per-frame RMS energy of the block
+            threshold: Frames above this level count as voiced
+        """
+        for value in rms:  # A block holds only a few frames; no masked copy
+            value = float(value)
+            if value <= threshold:
+                continue
+            self.voiced_frames += 1
+            self.mean_energy += (value - self.mean_energy) / self.voiced_frames
+            if self.voiced_frames == 1:
+                self.recent_energy = value
+            else:
+                self.recent_energy += self._recent_rate * (value - self.recent_energy)
+    
+    def trailing_silence(self) -> float:
+        """Seconds of silence that end the utterance as it stands."""
+        if self.speech_seconds < self.min_speech:
+            return self.silence_duration
+        return self.min_silence if self.falling else self.max_silence
 
 class VoiceActivityDetector:
     """
@@ -19,21 +212,39 @@ class VoiceActivityDetector:
     Detects when someone is speaking based on audio input.
     """
     
-    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 3):
+    def __init__(self, sample_rate: int = 16000, aggressiveness: int = 3, adaptive: bool = True):
         """
         Initialize the VAD.
         
         Args:
             sample_rate: Audio sample rate in Hz (must be 8000, 16000, 32000, or 48000)
             aggressiveness: Aggressiveness mode (0-3, where 3 is the most aggressive)
+            adaptive: Track the noise floor for the energy threshold instead of
+                using FALLBACK_ENERGY_THRESHOLD
         """
         self.sample_rate = sample_rate
         self.is_speaking = False
-        self.speech_buffer = []
+        # Hysteresis state: blocks seen since the last state change (capped)
+        # and the current run of silent blocks
+        self._blocks = 0
+        self._silent_run = 0
+        self.last_analysis: Optional[FrameAnalysis] = None
         
         # WebRTC VAD requires specific frame sizes (10, 20, or 30 ms)
         self.frame_duration = 30  # ms
         self.samples_per_frame = (sample_rate * self.frame_duration) // 1000
+        self.noise_floor = NoiseFloorEstimator(self.frame_duration / 1000) if adaptive else None
+        
+        # Work buffers for classify_frames, sized for one input block and
+        # grown if a longer one arrives, so the audio callback does not
+        # allocate arrays. WebRTC VAD reads the PCM frame straight from the
+        # bytearray behind _pcm.
+        self._pcm_bytes = bytearray(self.samples_per_frame * 2)
+        self._pcm = np.frombuffer(self._pcm_bytes, dtype=np.int16)
+        self._scaled = np.empty(self.samples_per_frame, dtype=np.float32)
+        self._samples = np.empty(0, dtype=np.float32)
+        self._count = -1
+        self._reserve(-(-BLOCK_SIZE // self.samples_per_frame))
         
         # Initialize VAD if available
         self.vad = None
@@ -45,35 +256,68 @@ class VoiceActivityDetector:
                 print(f"Warning: Failed to initialize VAD: {e}")
                 VAD_AVAILABLE = False
     
-    def process_audio(self, audio_data: np.ndarray) -> bool:
+    def classify_frames(self, audio_data: np.ndarray) -> FrameAnalysis:
         """
-        Process an audio frame and update voice activity status.
+        Classify every complete 30 ms frame of a block as speech or silence.
+        
+        The block is copied into a preallocated buffer; frame energies are
+        computed in one vectorized pass over a (frames, samples) view of it,
+        or frame by frame for a block of only a few frames, where numpy's
+        per-call overhead would dominate. WebRTC VAD is only called for frames
+        whose energy passes the gate.
+        
+        Blocks no longer than the largest seen so far allocate no arrays: the
+        buffers, their views and the returned FrameAnalysis are reused. What
+        remains per call is CPython's own small objects (numpy scalars and
+        the slice views of frames handed to WebRTC VAD).
         
         Args:
-            audio_data: Mono audio data as a numpy array (16-bit PCM)
+            audio_data: Mono audio data as a numpy array (float in [-1, 1] or 16-bit PCM)
             
         Returns:
-            bool: True if voice activity is detected, False otherwise
+            FrameAnalysis: Per-frame decisions and features. The same object,
+                arrays included, is overwritten by the next call; copy to keep.
         """
-        # Convert to 16-bit PCM if needed
-        if audio_data.dtype != np.int16:
-            audio_data = (audio_data * 32767).astype(np.int16)
+        size = self.samples_per_frame
+        count = len(audio_data) // size
+        if count != self._count:
+            self._reserve(count)
+            self._set_count(count)
+        analysis = self._analysis
+        samples, frames, rms, speech = self._views
+        
+        block = audio_data if len(audio_data) == len(samples) else audio_data[:len(samples)]
+        if audio_data.dtype == np.int16:
+            np.multiply(block, np.float32(1 / 32768.0), out=samples)
+        else:
+            np.copyto(samples, block, casting='unsafe')
         
-        # Process in chunks that WebRTC VAD can handle
-        is_speech_detected = False
+        if count <= SCALAR_MAX_FRAMES:
+            for i in range(count):
+                frame = frames[i]
+                rms[i] = math.sqrt(float(np.dot(frame, frame)) / size)
+        else:
+            np.einsum('ij,ij->i', frames, frames, out=rms)
+            np.multiply(rms, np.float32(1 / size), out=rms)
+            np.sqrt(rms, out=rms)
         
+        speech.fill(False)
+        webrtc_calls = 0
         if self.vad is not None:
-            for i in range(0, len(audio_data), self.samples_per_frame):
-                frame = audio_data[i:i + self.samples_per_frame]
-                if len(frame) < self.samples_per_frame:
+            pcm = self._pcm
+            for i in range(count):
+                if rms[i] < ENERGY_GATE:
                     continue
-                    
-                # VAD requires 16-bit PCM data
-                frame_bytes = frame.tobytes()
+                webrtc_calls += 1
                 try:
-                    if self.vad.is_speech(frame_bytes, self.sample_rate):
-                        is_speech_detected = True
-                        break  # Early exit if speech is detected
+                    # VAD requires 16-bit PCM data
+                    if audio_data.dtype == np.int16:
+                        np.copyto(pcm, audio_data[i * size:(i + 1) * size])
+                    else:
+                        # Scale, then cast: a casting ufunc would allocate a buffer
+                        np.multiply(frames[i], np.float32(32767), out=self._scaled)
+                        np.copyto(pcm, self._scaled, casting='unsafe')
+                    speech[i] = self.vad.is_speech(self._pcm_bytes, self.sample_rate)
                 except Exception as e:
                     # Handle cases where VAD processing fails
                     print(f"VAD processing error: {e}")
@@ -81,32 +325,279 @@ class VoiceActivityDetector:
                     VAD_AVAILABLE = False
                     self.vad = None
                     break
-        else:
+        
+        if self.vad is None:
             # Fallback: Use simple energy-based VAD if WebRTC VAD is not available
-            energy = np.mean(np.abs(audio_data))
-            is_speech_detected = energy > 0.01  # Simple energy threshold
+            np.greater(rms, self.energy_threshold, out=speech)
+        
+        analysis.webrtc_calls = webrtc_calls
+        analysis._zcr = None
+        return analysis
+    
+    def _reserve(self, count: int) -> None:
+        """Grow the work buffers of classify_frames to hold `count` frames."""
+        if count * self.samples_per_frame <= len(self._samples):
+            return
+        self._samples = np.empty(count * self.samples_per_frame, dtype=np.float32)
+        self._rms = np.empty(count, dtype=np.float32)
+        self._speech = np.empty(count, dtype=bool)
+        self._count = -1
+    
+    def _set_count(self, count: int) -> None:
+        """Cut the views (and FrameAnalysis) classify_frames fills for blocks of `count` frames."""
+        samples = self._samples[:count * self.samples_per_frame]
+        frames = samples.reshape(count, self.samples_per_frame)
+        rms, speech = self._rms[:count], self._speech[:count]
+        self._views = (samples, frames, rms, speech)
+        self._analysis = FrameAnalysis(speech, rms, frames, 0)
+        self._count = count
+    
+    @property
+    def energy_threshold(self) -> float:
+        """RMS above which the energy-based fallback reports speech."""
+        return self.noise_floor.threshold if self.noise_floor is not None else FALLBACK_ENERGY_THRESHOLD
+    
+    def process_audio(self, audio_data: np.ndarray) -> bool:
+        """
+        Process an audio block and update voice activity status.
+        
+        The per-frame decisions are kept in `last_analysis`.
         
-        # Update speech state with some hysteresis
+        Args:
+            audio_data: Mono audio data as a numpy array (float or 16-bit PCM)
+            
+        Returns:
+            bool: True if voice activity is detected, False otherwise
+        """
+        self.last_analysis = self.classify_frames(audio_data)
+        if self.noise_floor is not None:
+            self.noise_floor.update(self.last_analysis.rms)
+        # count_nonzero has no reduction machinery to allocate, unlike any()
+        is_speech_detected = np.count_nonzero(self.last_analysis.speech) > 0
+        
+        # Update speech state with some hysteresis: counters instead of a
+        # history list, so no block allocates
+        self._blocks = min(self._blocks + 1, 6)
         if is_speech_detected:
-            self.speech_buffer.append(True)
-            if len(self.speech_buffer) > 3:  # Require multiple detections
+            self._silent_run = 0
+            if self._blocks > 3:  # Require multiple detections
                 self.is_speaking = True
-                self.speech_buffer = self.speech_buffer[-3:]  # Keep buffer size fixed
+                self._blocks = 3
         else:
-            self.speech_buffer.append(False)
-            if len(self.speech_buffer) > 5:  # Require more silence to stop
-                if not any(self.speech_buffer[-3:]):  # If last 3 frames are silent
-                    self.is_speaking = False
-                    self.speech_buffer = []
+            self._silent_run += 1
+            if self._blocks > 5 and self._silent_run >= 3:  # Require more silence to stop
+                self.is_speaking = False
+                self._blocks = 0
+                self._silent_run = 0
         
         return self.is_speaking
 
+class AudioRingBuffer:
+    """
+    Preallocated sample buffer that overwrites its oldest samples when full.
+    
+    Writing copies into the existing array, so it is safe to call from the
+    audio callback thread without allocating.
+    """
+    
+    def __init__(self, capacity: int, dtype=np.float32):
+        """
+        Initialize the buffer.
+        
+        Args:
+            capacity: Number of samples kept
+            dtype: Sample type
+        """
+        self.capacity = capacity
+        self.total = 0  # Samples written since the last clear()
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._end = 0  # Next write position
+    
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+    
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples, overwriting the oldest ones if the buffer is full."""
+        count = len(samples)
+        if count >= self.capacity:
+            self._data[:] = samples[count - self.capacity:]
+            self._end = 0
+        else:
+            first = min(count, self.capacity - self._end)
+            self._data[self._end:self._end + first] = samples[:first]
+            if first < count:
+                self._data[:count - first] = samples[first:]
+            self._end = (self._end + count) % self.capacity
+        self.total += count
+    
+    def segments(self) -> Tuple[np.ndarray, ...]:
+        """Return the buffered samples, oldest first, as one or two views."""
+        size = len(self)
+        start = (self._end - size) % self.capacity
+        if start + size <= self.capacity:
+            return (self._data[start:start + size],)
+        return (self._data[start:], self._data[:self._end])
+    
+    def view(self) -> np.ndarray:
+        """
+        Return the buffered samples, oldest first.
+        
+        This is a view into the buffer unless it has wrapped around, in which
+        case the two halves are joined into a new array.
+        """
+        parts = self.segments()
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+    
+    def clear(self) -> None:
+        """Forget the buffered samples (the memory is kept)."""
+        self._end = 0
+        self.total = 0
+
+# Samples per block delivered by the input stream
+BLOCK_SIZE = 1024
+
+# Recording length kept when max_duration is unlimited (the most recent audio wins)
+UNLIMITED_BUFFER_SECONDS = 120.0
+
+# Audio kept from before speech is detected, so the onset is not clipped
+PRE_ROLL_MS = 400
+
+class UtteranceRecorder:
+    """
+    Block-by-block recording logic behind record_until_silence.
+    
+    Independent of the audio device, so recordings can be replayed offline.
+    The last pre_roll_ms of audio before speech is detected is kept in a
+    small ring and prepended when the recording starts; it covers both the
+    VAD's detection hysteresis and soft onsets.
+    
+    With an EndpointPolicy the trailing silence that ends the recording
+    depends on how the speech before it ended; otherwise it is the fixed
+    silence_duration.
+    """
+    
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        silence_duration: float = 1.0,
+        vad_aggressiveness: int = 3,
+        max_duration: float = 30.0,
+        pre_roll_ms: float = PRE_ROLL_MS,
+        block_size: int = BLOCK_SIZE,
+        endpointing: Optional[EndpointPolicy] = None,
+        on_audio: Optional[Callable[[np.ndarray], None]] = None
+    ):
+        """
+        Initialize the recorder. All buffers are allocated here.
+        
+        Args:
+            sample_rate: Audio sample rate in Hz
+            silence_duration: Seconds of silence to stop recording
+            vad_aggressiveness: VAD aggressiveness (0-3)
+            max_duration: Maximum recording duration in seconds (0 for unlimited)
+            pre_roll_ms: Audio kept from before speech was detected
+            block_size: Samples per block fed to feed()
+            endpointing: Optional policy choosing the trailing silence per utterance
+            on_audio: Called with every run of samples added to the recording
+                (on the audio thread when recording live)
+        """
+        self.vad = VoiceActivityDetector(sample_rate, vad_aggressiveness)
+        self.endpointing = endpointing
+        self.on_audio = on_audio
+        self.block_seconds = block_size / sample_rate
+        self.silent_frames = 0
+        self.frames_before_silence = int(silence_duration * sample_rate / block_size)
+        self.max_samples = int(max_duration * sample_rate / block_size) * block_size
+        self.samples_seen = 0  # Input samples fed so far
+        self.start_sample: Optional[int] = None  # Input position where the recording begins
+        
+        self.recording = AudioRingBuffer(self.max_samples if self.max_samples > 0
+                                         else int(UNLIMITED_BUFFER_SECONDS * sample_rate))
+        pre_roll_samples = int(pre_roll_ms * sample_rate / 1000)
+        self.pre_roll = AudioRingBuffer(pre_roll_samples) if pre_roll_samples > 0 else None
+    
+    @property
+    def started(self) -> bool:
+        """True once speech has been detected."""
+        return self.start_sample is not None
+    
+    @property
+    def done(self) -> bool:
+        """True after the trailing silence or when the recording is full."""
+        return (self.started and self.silent_frames >= self.silence_blocks_needed) or \
+               (self.max_samples > 0 and self.recording.total >= self.max_samples)
+    
+    @property
+    def silence_blocks_needed(self) -> int:
+        """Silent blocks that end the recording as it stands."""
+        if self.endpointing is None:
+            return self.frames_before_silence
+        return int(self.endpointing.trailing_silence() / self.block_seconds)
+    
+    def feed(self, block: np.ndarray) -> bool:
+        """
+        Process one block of mono float audio.
+        
+        Safe on the audio callback thread: no arrays are allocated once the
+        recorder exists. What remains is CPython's small objects (numpy
+        scalars, slice views) and, while the noise floor rises, numpy's
+        scratch for rescanning the noise window.
+        
+        Returns:
+            bool: True if the VAD reports speech
+        """
+        position = self.samples_seen
+        self.samples_seen += len(block)
+        
+        # Blocks arriving after the limit (before the stream closes) are dropped
+        if self.max_samples > 0 and self.recording.total >= self.max_samples:
+            return False
+        
+        # Check for voice activity
+        is_speech = self.vad.process_audio(block) if len(block) > 0 else False
+        
+        if is_speech:
+            self.silent_frames = 0
+            if not self.started:
+                self._start(position)
+            self._write(block)
+        elif self.started:  # Only count silence after speech has started
+            self.silent_frames += 1
+            self._write(block)
+        elif self.pre_roll is not None:
+            self.pre_roll.write(block)
+        
+        if self.endpointing is not None and self.started and len(block) > 0:
+            self.endpointing.observe(self.vad.last_analysis.rms, self.vad.energy_threshold)
+        return is_speech
+    
+    def audio(self) -> np.ndarray:
+        """The recorded audio (a view into the recording buffer when possible)."""
+        return self.recording.view()
+    
+    def _start(self, position: int) -> None:
+        self.start_sample = position
+        if self.pre_roll is not None:
+            self.start_sample -= len(self.pre_roll)
+            for part in self.pre_roll.segments():
+                self._write(part)
+    
+    def _write(self, samples: np.ndarray) -> None:
+        if self.max_samples > 0:
+            samples = samples[:self.max_samples - self.recording.total]
+        self.recording.write(samples)
+        if self.on_audio is not None and len(samples) > 0:
+            self.on_audio(samples)
+
 def record_until_silence(
     sample_rate: int = 16000, 
     silence_duration: float = 1.0,
     vad_aggressiveness: int = 3,
     max_duration: float = 30.0,
-    callback: Optional[Callable] = None
+    callback: Optional[Callable] = None,
+    pre_roll_ms: float = PRE_ROLL_MS,
+    endpointing: Optional[EndpointPolicy] = None,
+    on_audio: Optional[Callable[[np.ndarray], None]] = None
 ) -> np.ndarray:
     """
     Record audio until silence is detected.
@@ -117,52 +608,43 @@ def record_until_silence(
         vad_aggressiveness: VAD aggressiveness (0-3)
         max_duration: Maximum recording duration in seconds
         callback: Optional callback function that receives the current audio buffer
+        pre_roll_ms: Audio kept from before speech was detected
+        endpointing: Optional policy adapting the trailing silence to the utterance
+        on_audio: Called on the audio thread with every run of recorded samples,
+            e.g. StreamingTranscriber.feed
         
     Returns:
-        np.ndarray: Recorded audio data
+        np.ndarray: Recorded audio data (a view into the recording buffer)
     """
-    vad = VoiceActivityDetector(sample_rate, vad_aggressiveness)
-    audio_buffer = []
-    silent_frames = 0
-    frames_before_silence = int(silence_duration * sample_rate / 1024)
-    max_frames = int(max_duration * sample_rate / 1024)
+    # Allocated once up front: the callback runs on PortAudio's thread and
+    # must not allocate arrays per block (see UtteranceRecorder.feed)
+    recorder = UtteranceRecorder(
+        sample_rate, silence_duration, vad_aggressiveness, max_duration, pre_roll_ms,
+        endpointing=endpointing, on_audio=on_audio
+    )
     
     def audio_callback(indata, frames, time, status):
-        nonlocal silent_frames, audio_buffer
-        
-        # Check for voice activity
-        is_speech = vad.process_audio(indata[:, 0]) if indata.size > 0 else False
-        
-        if is_speech:
-            silent_frames = 0
-            audio_buffer.append(indata.copy())
-        elif len(audio_buffer) > 0:  # Only count silence after speech has started
-            silent_frames += 1
-            audio_buffer.append(indata.copy())
+        is_speech = recorder.feed(indata[:, 0])
         
         # Call the user-provided callback if any
         if callback:
-            callback(indata, is_speech, silent_frames)
+            callback(indata, is_speech, recorder.silent_frames)
     
     # Start recording
     with sd.InputStream(
         samplerate=sample_rate,
         channels=1,
         dtype='float32',
-        blocksize=1024,
+        blocksize=BLOCK_SIZE,
         callback=audio_callback
     ) as stream:
         print("Listening... (speak now)")
         while stream.active:
-            if (silent_frames >= frames_before_silence and len(audio_buffer) > 0) or \
-               (max_frames > 0 and len(audio_buffer) >= max_frames):
+            if recorder.done:
                 break
             sd.sleep(100)
     
-    # Concatenate all audio chunks
-    if len(audio_buffer) > 0:
-        return np.concatenate(audio_buffer, axis=0)
-    return np.array([], dtype=np.float32)
+    return recorder.audio()
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,110 @@
+"""
+On-disk cache of the ElevenLabs voice catalog.
+Start-up is served from the cached catalog; it is refreshed from the API in
+the background once it is older than its TTL, and only rewritten when the
+catalog actually changed.
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class VoiceCatalogCache:
+    """Persists the voice catalog (name -> voice_id and settings) with a TTL."""
+
+    def __init__(self, path: Union[str, Path], ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            path: JSON file holding the catalog
+            ttl: Seconds after which the cached catalog should be refreshed
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.voices: Dict[str, Dict] = {}
+        self.fetched_at = 0.0
+
+    def load(self) -> Optional[Dict[str, Dict]]:
+        """
+        Load the cached catalog.
+
+        Returns:
+            dict: {name: {'voice_id': ..., 'settings': ..., ...}} or None if there is no usable cache
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.voices = json.load(f)['voices']
+            # The file's modification time records the last successful fetch
+            self.fetched_at = self.path.stat().st_mtime
+            return self.voices
+        except Exception as e:
+            logger.warning("Ignoring unreadable voice catalog %s: %s", self.path, e)
+            return None
+
+    def is_stale(self) -> bool:
+        """Return True if the catalog is missing or older than the TTL."""
+        return not self.voices or time.time() - self.fetched_at > self.ttl
+
+    def update(self, voices: Dict[str, Dict]) -> bool:
+        """
+        Record a freshly fetched catalog.
+
+        Args:
+            voices: {name: voice entry} as returned by the API
+
+        Returns:
+            bool: True if the catalog changed since the cached version
+        """
+        changed = voices != self.voices
+        if changed:
+            added = voices.keys() - self.voices.keys()
+            removed = self.voices.keys() - voices.keys()
+            logger.info(
+                "Voice catalog changed: %d added, %d removed, %d updated",
+                len(added), len(removed),
+                sum(1 for name in voices.keys() & self.voices.keys() if voices[name] != self.voices[name])
+            )
+            self.voices = voices
+            self._save()
+        else:
+            self._touch()
+        self.fetched_at = time.time()
+        return changed
+
+    def add(self, name: str, entry: Dict) -> None:
+        """Add or replace a single voice (e.g. a new clone) without a full refresh."""
+        self.voices = dict(self.voices, **{name: entry})
+        self._save()
+        if self.fetched_at:
+            # Keep the last full fetch time so the TTL still applies
+            try:
+                os.utime(self.path, (self.fetched_at, self.fetched_at))
+            except OSError:
+                pass
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'voices': self.voices}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not save voice catalog: %s", e)
+
+    def _touch(self) -> None:
+        """Mark the unchanged catalog as freshly fetched."""
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            self._save()
+        except OSError as e:
+            logger.warning("Could not update voice catalog timestamp: %s", e)
@@ -1,32 +1,97 @@
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
 import sounddevice as sd
 import numpy as np
 from scipy.io.wavfile import write
-from vad import record_until_silence
+from vad import PRE_ROLL_MS, EndpointPolicy, record_until_silence
+
+_archive_lock = threading.Lock()
+_archiver: Optional[ThreadPoolExecutor] = None
 
 def ensure_dir(directory):
     """Create directory if it doesn't exist."""
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-def record_voice(filename="audio/voice.wav", duration=5, use_vad=True, stop_event=None):
+class Recording:
+    """
+    A recorded utterance kept in memory.
+    
+    speech_to_text accepts it directly, so a turn never has to write the
+    audio to disk and read it back before uploading it.
+    """
+    
+    def __init__(self, samples: np.ndarray, sample_rate: int = 16000):
+        """
+        Initialize the recording.
+        
+        Args:
+            samples: Mono audio, float in [-1, 1] or 16-bit PCM
+            sample_rate: Sample rate in Hz
+        """
+        self.samples = samples
+        self.sample_rate = sample_rate
+        self.archive_path: Optional[str] = None  # Set once archiving is scheduled
+    
+    def __len__(self) -> int:
+        return len(self.samples)
+    
+    @property
+    def duration(self) -> float:
+        """Length in seconds."""
+        return len(self.samples) / self.sample_rate
+    
+    def save(self, filename: str) -> str:
+        """Write the recording as a 16-bit PCM WAV file and return its path."""
+        output_dir = os.path.dirname(filename)
+        if output_dir:
+            ensure_dir(output_dir)
+        
+        audio = self.samples
+        if audio.dtype != np.int16:
+            # Convert to 16-bit PCM for better compatibility
+            audio = (audio * 32767).astype(np.int16)
+        write(filename, self.sample_rate, audio)
+        return filename
+
+def archive_recording(recording: Recording, directory: str = "audio") -> Future:
     """
-    Record voice with optional Voice Activity Detection (VAD).
+    Save a recording in the background under a unique, timestamped name.
+    
+    Args:
+        recording: The recording to keep
+        directory: Where archived recordings are written
+        
+    Returns:
+        Future: Resolves to the file path once written
+    """
+    global _archiver
+    with _archive_lock:
+        if _archiver is None:
+            _archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recording-archive")
+    recording.archive_path = os.path.join(directory, datetime.now().strftime("voice_%Y%m%d_%H%M%S_%f.wav"))
+    return _archiver.submit(recording.save, recording.archive_path)
+
+def record_audio(duration=5, use_vad=True, stop_event=None, pre_roll_ms=PRE_ROLL_MS,
+                 adaptive_endpointing=True, archive_dir=None) -> Optional[Recording]:
+    """
+    Record voice into memory with optional Voice Activity Detection (VAD).
     
     Args:
-        filename: Output filename for the recording
         duration: Maximum recording duration in seconds (used if VAD is disabled)
         use_vad: Whether to use Voice Activity Detection
         stop_event: Optional threading.Event to stop recording early
+        pre_roll_ms: Audio kept from before speech was detected (VAD only)
+        adaptive_endpointing: Stop sooner after finished-sounding sentences and
+            wait longer after mid-sentence pauses (VAD only)
+        archive_dir: If set, the recording is also saved there in the background
         
     Returns:
-        str: Path to the recorded audio file
+        Recording: The recorded audio, or None if no speech was detected
     """
-    # Ensure output directory exists
-    output_dir = os.path.dirname(filename)
-    if output_dir:
-        ensure_dir(output_dir)
-    
     sample_rate = 16000  # Standard sample rate for speech recognition
     
     if use_vad:
@@ -34,16 +99,12 @@ def record_voice(filename="audio/voice.wav", duration=5, use_vad=True, stop_even
         audio = record_until_silence(
             sample_rate=sample_rate,
             silence_duration=1.0,  # Stop after 1 second of silence
-            max_duration=duration  # Maximum recording duration
+            max_duration=duration,  # Maximum recording duration
+            pre_roll_ms=pre_roll_ms,
+            endpointing=EndpointPolicy(silence_duration=1.0) if adaptive_endpointing else None
         )
         
-        if len(audio) > 0:
-            # Convert to 16-bit PCM for better compatibility
-            audio_int16 = (audio * 32767).astype(np.int16)
-            write(filename, sample_rate, audio_int16)
-            print(f"Recording complete. Saved to {filename}")
-            return filename
-        else:
+        if len(audio) == 0:
             print("No speech detected.")
             return None
     else:
@@ -54,12 +115,39 @@ def record_voice(filename="audio/voice.wav", duration=5, use_vad=True, stop_even
                       channels=1,
                       dtype='float32')
         sd.wait()
+        audio = audio[:, 0]
+    
+    recording = Recording(audio, sample_rate)
+    print(f"Recording complete ({recording.duration:.1f}s)")
+    if archive_dir:
+        archive_recording(recording, archive_dir)
+    return recording
+
+def record_voice(filename="audio/voice.wav", duration=5, use_vad=True, stop_event=None,
+                 pre_roll_ms=PRE_ROLL_MS, adaptive_endpointing=True):
+    """
+    Record voice with optional Voice Activity Detection (VAD) and save it.
+    
+    record_audio avoids the file when the audio only needs to be transcribed.
+    
+    Args:
+        filename: Output filename for the recording
+        duration: Maximum recording duration in seconds (used if VAD is disabled)
+        use_vad: Whether to use Voice Activity Detection
+        stop_event: Optional threading.Event to stop recording early
+        pre_roll_ms: Audio kept from before speech was detected (VAD only)
+        adaptive_endpointing: Stop sooner after finished-sounding sentences and
+            wait longer after mid-sentence pauses (VAD only)
         
-        # Convert to 16-bit PCM for better compatibility
-        audio_int16 = (audio * 32767).astype(np.int16)
-        write(filename, sample_rate, audio_int16)
-        print(f"Recording complete. Saved to {filename}")
-        return filename
+    Returns:
+        str: Path to the recorded audio file, or None if no speech was detected
+    """
+    recording = record_audio(duration, use_vad, stop_event, pre_roll_ms, adaptive_endpointing)
+    if recording is None:
+        return None
+    recording.save(filename)
+    print(f"Saved to {filename}")
+    return filename
 
 if __name__ == "__main__":
     # Test the recording
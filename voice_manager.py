@@ -1,18 +1,33 @@
 import os
 import json
 import requests
+import threading
 import time
 from pathlib import Path
 from typing import Optional, Dict, List, Union
 from elevenlabs import Voice, VoiceSettings, play, voices
 from elevenlabs.client import ElevenLabs
-from config import ELEVENLABS_API_KEY, AUDIO_DIR, VOICE_SETTINGS, VOICE_NAME
+from config import (
+    ELEVENLABS_API_KEY, AUDIO_DIR, VOICE_SETTINGS, VOICE_NAME,
+    TTS_CACHE_DIR, TTS_CACHE_MAX_MB, TTS_CACHE_MEMORY_ITEMS, VOICE_LOAD_TIMEOUT,
+    VOICE_CATALOG_FILE, VOICE_CATALOG_TTL, TTS_STREAM_FORMAT, TTS_JITTER_BUFFER_MS
+)
+from tts_cache import TTSCache
+from voice_catalog import VoiceCatalogCache
+from tts_stream import StreamingPlayer
 
 class VoiceManager:
     """Manages voice synthesis including custom voice cloning."""
     
-    def __init__(self):
-        """Initialize the voice manager with API key and settings."""
+    TTS_MODEL = "eleven_monolingual_v2"
+    
+    def __init__(self, warm_up: bool = True):
+        """
+        Initialize the voice manager with API key and settings.
+        
+        Args:
+            warm_up: If True, start loading voices in the background right away
+        """
         self.voices = {}
         self.voice_settings = VoiceSettings(
             stability=0.7,
@@ -34,15 +49,73 @@ class VoiceManager:
         # Create audio directory if it doesn't exist
         os.makedirs(AUDIO_DIR, exist_ok=True)
         
-        # Load available voices
-        self.load_voices()
+        # Cache of synthesized speech shared by ElevenLabs and the fallback TTS
+        self.tts_cache = TTSCache(
+            TTS_CACHE_DIR,
+            max_bytes=TTS_CACHE_MAX_MB * 1024 * 1024,
+            memory_items=TTS_CACHE_MEMORY_ITEMS
+        )
+        
+        # Voice catalog persisted between runs so start-up needs no API call
+        self.voice_catalog = VoiceCatalogCache(VOICE_CATALOG_FILE, ttl=VOICE_CATALOG_TTL)
+        
+        # Voices are loaded in the background so importing this module never
+        # waits on the network; synthesis waits for them only when first needed
+        self._ready = threading.Event()
+        self._warm_up_thread = None
+        if warm_up:
+            self.start_warm_up()
+    
+    def start_warm_up(self) -> None:
+        """Load available voices in a background thread (no-op if already started)."""
+        if self._warm_up_thread is not None:
+            return
+        self._warm_up_thread = threading.Thread(
+            target=self._warm_up, name="voice-warm-up", daemon=True
+        )
+        self._warm_up_thread.start()
+    
+    def _warm_up(self) -> None:
+        try:
+            # Serve the cached catalog immediately, then refresh it if stale
+            cached = self.voice_catalog.load() if self.client else None
+            if cached:
+                self.voices = self._voices_from_catalog(cached)
+                print(f"Loaded {len(self.voices)} voices from cache")
+                self._ready.set()
+                if not self.voice_catalog.is_stale():
+                    return
+            
+            self.load_voices()
+            
+            # If no voices loaded, add fallback voices
+            if not self.voices:
+                self.add_fallback_voices()
+        finally:
+            self._ready.set()
+    
+    def wait_until_ready(self, timeout: Optional[float] = VOICE_LOAD_TIMEOUT) -> bool:
+        """
+        Wait for the background voice loading to finish.
+        
+        If it does not finish in time, fallback voices are used until it does.
+        
+        Returns:
+            bool: True if the voices finished loading
+        """
+        if self._ready.is_set():
+            return True
+        self.start_warm_up()
+        if self._ready.wait(timeout):
+            return True
         
-        # If no voices loaded, add fallback voices
+        print("Voice loading is taking too long - using fallback voices for now")
         if not self.voices:
             self.add_fallback_voices()
+        return False
         
     def load_voices(self) -> None:
-        """Load available voices from ElevenLabs API."""
+        """Load available voices from ElevenLabs API and update the cached catalog."""
         if not self.client:
             print("ElevenLabs client not initialized - skipping voice loading")
             self.voices = {}
@@ -51,11 +124,52 @@ class VoiceManager:
         try:
             # Get voices using the client
             voices_list = self.client.voices.get_all()
-            self.voices = {voice.name: voice for voice in voices_list.voices}
-            print(f"Loaded {len(self.voices)} voices from ElevenLabs")
+            voices = {voice.name: voice for voice in voices_list.voices}
+            print(f"Loaded {len(voices)} voices from ElevenLabs")
         except Exception as e:
+            # Keep serving cached voices (if any) when the refresh fails
             print(f"Error loading voices: {e}")
-            self.voices = {}
+            return
+        
+        # Unchanged catalog: keep the current voices unless they are only stand-ins
+        # installed while the load was slow (see wait_until_ready)
+        if self.voice_catalog.update({name: self._catalog_entry(voice) for name, voice in voices.items()}) \
+                or not self.voices or self._using_fallback_voices():
+            self.voices = voices
+    
+    def _using_fallback_voices(self) -> bool:
+        """True if the current voices are the offline fallbacks."""
+        return any(str(getattr(voice, 'voice_id', '')).startswith('fallback-') for voice in self.voices.values())
+    
+    def refresh_voices_async(self) -> None:
+        """Refresh the voice catalog from ElevenLabs in a background thread."""
+        threading.Thread(target=self.load_voices, name="voice-refresh", daemon=True).start()
+    
+    @staticmethod
+    def _catalog_entry(voice) -> Dict:
+        """Describe a voice for the on-disk catalog."""
+        settings = getattr(voice, 'settings', None)
+        if settings is not None:
+            settings = settings.model_dump() if hasattr(settings, 'model_dump') else settings.dict()
+        return {
+            'voice_id': voice.voice_id,
+            'category': getattr(voice, 'category', None),
+            'settings': settings
+        }
+    
+    @staticmethod
+    def _voices_from_catalog(catalog: Dict[str, Dict]) -> Dict[str, Voice]:
+        """Rebuild voice objects from the on-disk catalog."""
+        voices = {}
+        for name, entry in catalog.items():
+            settings = entry.get('settings')
+            voices[name] = Voice(
+                voice_id=entry['voice_id'],
+                name=name,
+                category=entry.get('category'),
+                settings=VoiceSettings(**settings) if settings else None
+            )
+        return voices
     
     def add_fallback_voices(self) -> None:
         """Add fallback voices when ElevenLabs is not available."""
@@ -79,6 +193,7 @@ class VoiceManager:
     
     def list_available_voices(self) -> List[str]:
         """Get a list of available voice names."""
+        self.wait_until_ready()
         return list(self.voices.keys())
     
     def set_voice_settings(self, **kwargs) -> None:
@@ -107,44 +222,38 @@ class VoiceManager:
         if not text.strip():
             return None
 
-        voice_name = voice_name or self.current_voice
-        if voice_name not in self.voices:
-            print(f"Voice '{voice_name}' not found. Using default voice.")
-            voice_name = next(iter(self.voices.keys()), None)
-            if not voice_name:
-                print("No voices available.")
-                return None
-
-        # Get the voice object by name
-        voice = self.voices.get(voice_name)
+        voice = self._resolve_voice(voice_name)
         if not voice:
-            print(f"Voice '{voice_name}' not found")
             return None
         
         # Check if this is a fallback voice
-        if hasattr(voice, 'voice_id') and voice.voice_id.startswith('fallback-'):
-            print(f"Using fallback voice '{voice_name}' - ElevenLabs TTS not available")
-            print("Note: To enable actual voice synthesis, please add a valid ElevenLabs API key")
+        if not self._can_synthesize(voice):
             # Try to use system TTS as fallback
             return self.fallback_tts(text, save_path)
-
-        # Try to generate speech using ElevenLabs
-        if not self.client:
-            print("ElevenLabs client not available - trying fallback TTS")
-            return self.fallback_tts(text, save_path)
+        
+        cache_key = self.tts_cache.make_key(
+            text, voice.voice_id, self.TTS_MODEL, self._voice_settings_dict()
+        )
+        audio = self.tts_cache.get(cache_key)
+        if audio is not None:
+            self._save_audio(audio, save_path)
+            return audio
             
         try:
             # Generate speech using the client
             audio = self.client.generate(
                 text=text,
                 voice=voice,
-                model="eleven_monolingual_v2",
+                model=self.TTS_MODEL,
                 voice_settings=self.voice_settings
             )
             
-            if save_path:
-                with open(save_path, "wb") as f:
-                    f.write(audio)
+            # Newer clients return the audio as an iterator of chunks
+            if not isinstance(audio, bytes):
+                audio = b"".join(audio)
+            
+            self.tts_cache.put(cache_key, audio)
+            self._save_audio(audio, save_path)
             
             return audio
             
@@ -152,6 +261,113 @@ class VoiceManager:
             print(f"Error generating speech: {e}")
             return None
     
+    def stream_speech(
+        self,
+        text: str,
+        voice_name: str = None,
+        jitter_ms: Optional[int] = None
+    ) -> bool:
+        """
+        Synthesize and play text, starting playback while audio is still arriving.
+        
+        ElevenLabs audio is requested as raw PCM and played chunk by chunk through
+        a jitter buffer. Fallback voices are synthesized and played whole.
+        
+        This is opt-in, for speaking one long text in a single call. The turn
+        pipeline does not use it: it already synthesizes the next sentence
+        while the current one plays, and needs synthesis and playback as
+        separate stages to do so.
+        
+        Args:
+            text: Text to speak
+            voice_name: Optional voice name (uses current voice if None)
+            jitter_ms: Audio to buffer before playback starts (default: TTS_JITTER_BUFFER_MS)
+            
+        Returns:
+            bool: True if the text was spoken
+        """
+        if not text.strip():
+            return False
+        
+        voice = self._resolve_voice(voice_name)
+        if not voice:
+            return False
+        
+        if not self._can_synthesize(voice):
+            audio = self.fallback_tts(text)
+            if audio is None:
+                return False
+            self.play_audio(audio)
+            return True
+        
+        player = StreamingPlayer(
+            sample_rate=int(TTS_STREAM_FORMAT.rsplit('_', 1)[1]),
+            jitter_ms=TTS_JITTER_BUFFER_MS if jitter_ms is None else jitter_ms
+        )
+        cache_key = self.tts_cache.make_key(
+            text, voice.voice_id, f"{self.TTS_MODEL}/{TTS_STREAM_FORMAT}", self._voice_settings_dict()
+        )
+        audio = self.tts_cache.get(cache_key)
+        if audio is not None:
+            player.play([audio])
+            return True
+        
+        received = []
+        
+        def chunks():
+            stream = self.client.generate(
+                text=text,
+                voice=voice,
+                model=self.TTS_MODEL,
+                voice_settings=self.voice_settings,
+                stream=True,
+                output_format=TTS_STREAM_FORMAT
+            )
+            for chunk in stream:
+                received.append(chunk)
+                yield chunk
+        
+        try:
+            stats = player.play(chunks())
+        except Exception as e:
+            print(f"Error streaming speech: {e}")
+            return False
+        
+        self.tts_cache.put(cache_key, b"".join(received))
+        print(f"First sound after {stats['first_sound'] * 1000:.0f}ms "
+              f"({stats['duration']:.1f}s of audio, {stats['underruns']} underruns)")
+        return True
+    
+    def _resolve_voice(self, voice_name: Optional[str]):
+        """Return the voice to synthesize with, falling back to the first available one."""
+        self.wait_until_ready()
+        voice_name = voice_name or self.current_voice
+        if voice_name not in self.voices:
+            print(f"Voice '{voice_name}' not found. Using default voice.")
+            voice_name = next(iter(self.voices.keys()), None)
+            if not voice_name:
+                print("No voices available.")
+                return None
+
+        # Get the voice object by name
+        voice = self.voices.get(voice_name)
+        if not voice:
+            print(f"Voice '{voice_name}' not found")
+        return voice
+    
+    def _can_synthesize(self, voice) -> bool:
+        """Return True if voice can be synthesized with ElevenLabs."""
+        if hasattr(voice, 'voice_id') and voice.voice_id.startswith('fallback-'):
+            print(f"Using fallback voice '{voice.name}' - ElevenLabs TTS not available")
+            print("Note: To enable actual voice synthesis, please add a valid ElevenLabs API key")
+            return False
+
+        # Try to generate speech using ElevenLabs
+        if not self.client:
+            print("ElevenLabs client not available - trying fallback TTS")
+            return False
+        return True
+    
     def fallback_tts(self, text: str, save_path: Optional[str] = None) -> Optional[bytes]:
         """
         Fallback TTS using system speech synthesis when ElevenLabs is not available.
@@ -163,15 +379,21 @@ class VoiceManager:
         Returns:
             bytes: Audio data if successful, None otherwise
         """
+        cache_key = self.tts_cache.make_key(text, "system", "pyttsx3")
+        audio_data = self.tts_cache.get(cache_key)
+        if audio_data is not None:
+            self._save_audio(audio_data, save_path)
+            return audio_data
+        
         try:
             import pyttsx3
             engine = pyttsx3.init()
             
-            # Convert speech to bytes using a temporary file
+            # pyttsx3 can only render to a file; use a RAM-backed directory
+            # when the system has one so the round trip never touches disk
             import tempfile
-            import os
             
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False, dir=_memory_temp_dir()) as tmp_file:
                 temp_path = tmp_file.name
             
             try:
@@ -183,10 +405,10 @@ class VoiceManager:
                 with open(temp_path, 'rb') as f:
                     audio_data = f.read()
                 
+                self.tts_cache.put(cache_key, audio_data)
+                
                 # Save to requested path if specified
-                if save_path:
-                    with open(save_path, 'wb') as f:
-                        f.write(audio_data)
+                self._save_audio(audio_data, save_path)
                 
                 print("✓ Generated speech using system TTS")
                 return audio_data
@@ -204,46 +426,33 @@ class VoiceManager:
             print(f"Fallback TTS failed: {e}")
             return None
     
+    def _voice_settings_dict(self) -> Dict:
+        """Return the current voice settings as a plain dictionary."""
+        if hasattr(self.voice_settings, 'model_dump'):
+            return self.voice_settings.model_dump()
+        if hasattr(self.voice_settings, 'dict'):
+            return self.voice_settings.dict()
+        return dict(vars(self.voice_settings))
+    
+    @staticmethod
+    def _save_audio(audio_data: bytes, save_path: Optional[str]) -> None:
+        """Write audio data to save_path if one was given."""
+        if save_path:
+            with open(save_path, 'wb') as f:
+                f.write(audio_data)
+    
     def play_audio(self, audio_data: bytes) -> None:
         """Play audio data."""
         try:
             if audio_data:
-                # Try ElevenLabs play function first
-                try:
+                from audio_utils import audio_player, is_wav
+                
+                # WAV (system TTS) is decoded in memory and played with pyaudio;
+                # compressed audio is piped to ElevenLabs' player
+                if is_wav(audio_data):
+                    audio_player.play_wav_bytes(audio_data)
+                else:
                     play(audio_data)
-                except:
-                    # Fallback to playing with pyaudio
-                    import pyaudio
-                    import wave
-                    import tempfile
-                    import os
-                    
-                    # Save to temporary file and play with pyaudio
-                    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                        tmp_file.write(audio_data)
-                        temp_path = tmp_file.name
-                    
-                    try:
-                        # Play using wave and pyaudio
-                        with wave.open(temp_path, 'rb') as wf:
-                            p = pyaudio.PyAudio()
-                            stream = p.open(format=p.get_format_from_width(wf.getsampwidth()),
-                                         channels=wf.getnchannels(),
-                                         rate=wf.getframerate(),
-                                         output=True)
-                            
-                            data = wf.readframes(1024)
-                            while data:
-                                stream.write(data)
-                                data = wf.readframes(1024)
-                            
-                            stream.stop_stream()
-                            stream.close()
-                            p.terminate()
-                    finally:
-                        # Clean up temporary file
-                        if os.path.exists(temp_path):
-                            os.unlink(temp_path)
                             
         except Exception as e:
             print(f"Error playing audio: {e}")
@@ -272,14 +481,23 @@ class VoiceManager:
                 files=audio_files
             )
             
-            # Update the voices list
-            self.load_voices()
+            # Add the new voice right away and pick up the rest in the background
+            if getattr(voice, 'voice_id', None):
+                self.voices[name] = voice
+                self.voice_catalog.add(name, self._catalog_entry(voice))
+            self.refresh_voices_async()
             return True
             
         except Exception as e:
             print(f"Error cloning voice: {e}")
             return False
 
+def _memory_temp_dir() -> Optional[str]:
+    """Return a RAM-backed temp directory if one is available, else None (system default)."""
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None
+
 # Initialize voice manager
 voice_manager = VoiceManager()
 
@@ -293,3 +511,14 @@ def speak(text: str, voice_name: str = None, save_path: str = None) -> Optional[
         save_path: Optional path to save the audio file
     """
     return voice_manager.text_to_speech(text, voice_name, save_path)
+
+def stream_speak(text: str, voice_name: str = None) -> bool:
+    """
+    Speak text with streaming playback: the first words play while the rest
+    is still being synthesized. Opt-in; see VoiceManager.stream_speech.
+    
+    Args:
+        text: Text to speak
+        voice_name: Optional voice name (default: from config)
+    """
+    return voice_manager.stream_speech(text, voice_name)
@@ -1,16 +1,72 @@
 """
 Voice response management for Edward Voice AI.
 Contains categorized voice responses with file paths.
+
+The catalog is read from a JSON manifest when one exists (see
+RESPONSE_MANIFEST_FILE) and reloaded whenever the file changes; otherwise
+the built-in responses below are used. Manifest format:
+
+    {"clips": [
+        {"file": "wav/anglo_greeting_001.wav", "text": "Hello.", "category": "greetings"},
+        {"file": "wav/anglo_emotion_calm_001.wav", "text": "...", "category": "emotions",
+         "emotion": "calm"}
+    ]}
 """
+import json
+import logging
+import os
 import random
-from typing import Dict, List, Optional, Union
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from config import RESPONSE_MATCH_MIN_CONFIDENCE, RESPONSE_MANIFEST_FILE, RESPONSE_MANIFEST_POLL_SECONDS
+from response_index import ResponseIndex
+
+# Configure logging
+logger = logging.getLogger(__name__)
 
 class VoiceResponses:
     """Manages voice response audio files and their corresponding text."""
     
-    def __init__(self):
-        # Initialize response categories
-        self.categories = {
+    def __init__(
+        self,
+        manifest_path: Optional[Union[str, Path]] = RESPONSE_MANIFEST_FILE,
+        watch: bool = True,
+        poll_interval: float = RESPONSE_MANIFEST_POLL_SECONDS
+    ):
+        """
+        Initialize the response catalog.
+        
+        Args:
+            manifest_path: JSON manifest describing the clips (None for built-in responses only)
+            watch: If True, reload the catalog when the manifest changes
+            poll_interval: Seconds between checks of the manifest's modification time
+        """
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.poll_interval = poll_interval
+        self.categories = {}
+        self.reloads = 0
+        
+        # Index every transcript once so lookups don't scan all categories;
+        # positions are kept per (file, text) so reloads only touch changes
+        self.index = ResponseIndex()
+        self._positions: Dict[Tuple[str, str], int] = {}
+        self._manifest_mtime = None
+        self._lock = threading.Lock()
+        self._stop_watching = threading.Event()
+        
+        if not self.reload():
+            self._apply(self._builtin_categories())
+        
+        self._watch_thread = None
+        if watch and self.manifest_path:
+            self._watch_thread = threading.Thread(target=self._watch, name="response-manifest", daemon=True)
+            self._watch_thread.start()
+    
+    def _builtin_categories(self) -> Dict:
+        """The responses shipped with the code, used when there is no manifest."""
+        return {
             'introductions': self._get_introductions(),
             'greetings': self._get_greetings(),
             'confirmations': self._get_confirmations(),
@@ -23,6 +79,110 @@ class VoiceResponses:
             'outros': self._get_outros()
         }
     
+    def _iter_responses(self, categories: Optional[Dict] = None):
+        """Yield every response in every category and emotion sub-category."""
+        for category in (self.categories if categories is None else categories).values():
+            if isinstance(category, dict):  # Handle emotion categories
+                for sublist in category.values():
+                    yield from sublist
+            else:  # Regular categories
+                yield from category
+    
+    def reload(self) -> bool:
+        """
+        Reload the catalog from the manifest if it changed since the last load.
+        
+        An unreadable manifest is logged and the current catalog is kept.
+        
+        Returns:
+            bool: True if the catalog was loaded from the manifest
+        """
+        if not self.manifest_path:
+            return False
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._manifest_mtime:
+            return False
+        
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                categories = self._parse_manifest(json.load(f))
+        except Exception as e:
+            logger.error("Could not load response manifest %s: %s", self.manifest_path, e)
+            self._manifest_mtime = mtime  # Don't retry until it changes again
+            return False
+        
+        self._manifest_mtime = mtime
+        added, removed = self._apply(categories)
+        self.reloads += 1
+        logger.info("Loaded %d responses from %s (%d added, %d removed)",
+                    len(self.index), self.manifest_path, added, removed)
+        return True
+    
+    def save_manifest(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Write the current catalog as a manifest (e.g. to start from the built-in responses)."""
+        path = Path(path or self.manifest_path)
+        clips = []
+        for name, category in self.categories.items():
+            if isinstance(category, dict):
+                for emotion, sublist in category.items():
+                    clips.extend(dict(response, category=name, emotion=emotion) for response in sublist)
+            else:
+                clips.extend(dict(response, category=name) for response in category)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'clips': clips}, f, indent=2, ensure_ascii=False)
+    
+    def stop_watching(self) -> None:
+        """Stop checking the manifest for changes."""
+        self._stop_watching.set()
+    
+    def _watch(self) -> None:
+        while not self._stop_watching.wait(self.poll_interval):
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error("Response manifest reload failed: %s", e)
+    
+    @staticmethod
+    def _parse_manifest(manifest: Dict) -> Dict:
+        """Group manifest clips into categories (emotions by sub-category)."""
+        categories: Dict = {}
+        for entry in manifest.get('clips', []):
+            if not all(entry.get(key) for key in ('file', 'text', 'category')):
+                logger.warning("Skipping manifest entry without file, text and category: %s", entry)
+                continue
+            response = {'file': entry['file'], 'text': entry['text']}
+            if entry.get('emotion'):
+                categories.setdefault(entry['category'], {}).setdefault(entry['emotion'], []).append(response)
+            else:
+                categories.setdefault(entry['category'], []).append(response)
+        return categories
+    
+    def _apply(self, categories: Dict) -> Tuple[int, int]:
+        """
+        Switch to a new catalog, updating the index only for changed clips.
+        
+        Returns:
+            tuple: (number of clips added, number of clips removed)
+        """
+        with self._lock:
+            wanted = {}
+            for response in self._iter_responses(categories):
+                wanted.setdefault((response['file'], response['text']), response)
+            
+            removed = [key for key in self._positions if key not in wanted]
+            for key in removed:
+                self.index.remove(self._positions.pop(key))
+            added = [key for key in wanted if key not in self._positions]
+            for key in added:
+                self._positions[key] = self.index.add(wanted[key])
+            
+            self.categories = categories
+        return len(added), len(removed)
+    
     def get_random_response(self, category: str) -> Optional[Dict[str, str]]:
         """
         Get a random response from the specified category.
@@ -33,11 +193,12 @@ class VoiceResponses:
         Returns:
             dict: {'file': 'path/to/file.wav', 'text': 'Response text'} or None if category not found
         """
-        if category in self.categories:
-            if category == 'emotions':
+        responses = self.categories.get(category)  # The catalog may be swapped by a reload
+        if responses:
+            if isinstance(responses, dict):
                 # For emotions, we need to select a sub-category first
                 return None
-            return random.choice(self.categories[category])
+            return random.choice(responses)
         return None
     
     def get_emotion_response(self, emotion_type: str) -> Optional[Dict[str, str]]:
@@ -55,28 +216,32 @@ class VoiceResponses:
             return random.choice(emotions[emotion_type])
         return None
 
-    def find_matching_response(self, text: str) -> Optional[Dict[str, str]]:
+    def find_matching_response(
+        self,
+        text: str,
+        min_confidence: float = RESPONSE_MATCH_MIN_CONFIDENCE
+    ) -> Optional[Dict[str, str]]:
         """
-        Find a response where the text contains the given string.
+        Find the pre-recorded response that says the given text.
         
         Args:
-            text: Text to search for in responses
+            text: Text to be spoken
+            min_confidence: Lowest acceptable match confidence (0.0 to 1.0)
             
         Returns:
-            dict: Matching response or None if not found
+            dict: Best matching response or None if none is close enough
         """
-        text = text.lower()
-        for category in self.categories.values():
-            if isinstance(category, dict):  # Handle emotion categories
-                for sublist in category.values():
-                    for response in sublist:
-                        if text in response['text'].lower():
-                            return response
-            else:  # Regular categories
-                for response in category:
-                    if text in response['text'].lower():
-                        return response
-        return None
+        match = self.index.match(text, min_confidence)
+        return match[0] if match else None
+    
+    def best_match(self, text: str) -> Optional[Tuple[Dict[str, str], float]]:
+        """
+        Find the closest pre-recorded response regardless of confidence.
+        
+        Returns:
+            tuple: (response, confidence) or None if no transcript shares any text
+        """
+        return self.index.match(text)
 
     def _get_introductions(self) -> List[Dict[str, str]]:
         """Get introduction responses."""